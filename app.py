@@ -2,170 +2,60 @@ import streamlit as st
 import io
 import os
 import time
-import traceback
-import builtins
-import sys
 from datetime import datetime
-from contextlib import contextmanager
 
 import pandas as pd
 
 # Scraper'ları import et
-from scrapers.company1 import run as run_company1
-from scrapers.company2 import run as run_company2
-from scrapers.company3 import run as run_company3
-from scrapers.company4 import run as run_company4
-from scrapers.company5 import run as run_company5
-from scrapers.company6 import run as run_company6
-from scrapers.company7 import run as run_company7
+from scrapers import COMPANIES, load_runner
+from scrapers.jobs import CANCELLED, DONE, FAILED, QUEUED, RUNNING, get_jobs
+from scrapers.consolidate import run as run_consolidate
+from scrapers.columnar import parquet_for, read_columns, read_csv_tolerant, read_parquet_file, read_table
+from scrapers.store import get_store, run as run_store
 
 st.set_page_config(page_title="Yönetici Scraper Panel", layout="wide")
 
 OUTPUT_BASE = os.path.join(os.path.dirname(__file__), "outputs")
 os.makedirs(OUTPUT_BASE, exist_ok=True)
 
-COMPANIES = [
-    ("Coldwell Banker", run_company1),
-    ("Remax", run_company2),
-    ("Century21", run_company3),
-    ("ERA", run_company4),
-    ("Dialog", run_company5),
-    ("Turyap", run_company6),
-    ("Rozky", run_company7),
-]
+# Listelemesi Selenium ile yapılan scraper'lar; sıcak tarayıcı bunların ilk işinde açılır.
+# company6 varsayılan olarak HTTP kullanır; tarayıcıya düşerse ödünç alırken açılır.
+BROWSER_MODULES = {"company5"}
 
 
-def log(msg: str):
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    log_entry = f"[{timestamp}] {msg}"
-    st.session_state.logs.append(log_entry)
+@st.cache_resource
+def job_manager():
+    """Scraper'ları script thread'inden bağımsız çalıştıran iş yöneticisi (süreç başına bir tane)."""
+    return get_jobs()
 
 
-class TeeOutput:
-    """Hem terminale hem de log'a yazan output wrapper"""
+jobs = job_manager()
 
-    def __init__(self, original_stream):
-        self.original_stream = original_stream
-        self.buffer = ""
-        self.log_container = None
+# Log paneli: gösterilen son satır sayısı ve yeniden çizim aralığı
+LOG_TAIL = 300
+LOG_REFRESH_SECS = 0.5
 
-    def set_log_container(self, container):
-        """Log container'ı set et (gerçek zamanlı güncelleme için)"""
-        self.log_container = container
+STATUS_LABELS = {
+    QUEUED: "⏳ sırada",
+    RUNNING: "🔄 çalışıyor",
+    DONE: "✅ bitti",
+    FAILED: "❌ hata",
+    CANCELLED: "⏹ iptal",
+}
 
-    def write(self, text):
-        if not text:
-            return
 
-        self.buffer += text
-
-        if "\n" in self.buffer:
-            lines = self.buffer.split("\n")
-            for line in lines[:-1]:
-                if line.strip():
-                    log(line)
-            self.buffer = lines[-1]
-        elif len(self.buffer) > 500:
-            log(self.buffer.rstrip())
-            self.buffer = ""
-
-        try:
-            self.original_stream.write(text)
-            self.original_stream.flush()
-        except Exception:
-            pass
-
-    def flush(self):
-        if self.buffer.strip():
-            log(self.buffer.strip())
-            self.buffer = ""
-        try:
-            self.original_stream.flush()
-        except Exception:
-            pass
-
-    def __getattr__(self, name):
-        return getattr(self.original_stream, name)
-
-
-@contextmanager
-def capture_output(log_container=None):
-    """Tüm stdout ve stderr çıktısını yakalayan context manager"""
-    original_stdout = sys.stdout
-    original_stderr = sys.stderr
-    original_print = builtins.print
-
-    def _print(*args, **kwargs):
-        msg = " ".join(str(a) for a in args)
-        if msg.strip():
-            log(msg)
-        original_print(*args, **kwargs)
-
-    try:
-        tee_stdout = TeeOutput(original_stdout)
-        tee_stderr = TeeOutput(original_stderr)
-        if log_container is not None:
-            tee_stdout.set_log_container(log_container)
-            tee_stderr.set_log_container(log_container)
-        sys.stdout = tee_stdout
-        sys.stderr = tee_stderr
-        builtins.print = _print
-        yield
-    finally:
-        sys.stdout = original_stdout
-        sys.stderr = original_stderr
-        builtins.print = original_print
-
-
-def run_one(name, fn, out_dir, log_container=None):
-    start = time.time()
-    log(f"🚀 {name} çalışmaya başladı...")
-
-    if log_container is not None:
-        log_text = "\n".join(st.session_state.logs[-500:]) if len(st.session_state.logs) > 500 else "\n".join(st.session_state.logs)
-        log_container.code(log_text, language="", line_numbers=False)
-
-    log("⏳ Lütfen bekleyin, veri çekiliyor...")
-    if log_container is not None:
-        log_text = "\n".join(st.session_state.logs[-500:]) if len(st.session_state.logs) > 500 else "\n".join(st.session_state.logs)
-        log_container.code(log_text, language="", line_numbers=False)
-
-    with capture_output(log_container):
-        try:
-            result = fn(out_dir)
-            elapsed = time.time() - start
-
-            if elapsed > 10:
-                log("⏳ Bitmeye yakın, veriler işleniyor...")
-                if log_container is not None:
-                    log_text = "\n".join(st.session_state.logs[-500:]) if len(st.session_state.logs) > 500 else "\n".join(st.session_state.logs)
-                    log_container.code(log_text, language="", line_numbers=False)
-
-            log("✅ Veriler alındı, dosyalanıyor...")
-            if log_container is not None:
-                log_text = "\n".join(st.session_state.logs[-500:]) if len(st.session_state.logs) > 500 else "\n".join(st.session_state.logs)
-                log_container.code(log_text, language="", line_numbers=False)
-
-            log(f"✓ {name} tamamlandı ({elapsed:.1f}s). {result}")
-
-            if log_container is not None:
-                log_text = "\n".join(st.session_state.logs[-500:]) if len(st.session_state.logs) > 500 else "\n".join(st.session_state.logs)
-                log_container.code(log_text, language="", line_numbers=False)
-
-            return True
-        except Exception:
-            elapsed = time.time() - start
-            log(f"❌ {name} hata oluştu ({elapsed:.1f}s):\n{traceback.format_exc()}")
-
-            if log_container is not None:
-                log_text = "\n".join(st.session_state.logs[-500:]) if len(st.session_state.logs) > 500 else "\n".join(st.session_state.logs)
-                log_container.code(log_text, language="", line_numbers=False)
-
-            return False
-
-
-if "logs" not in st.session_state:
-    st.session_state.logs = []
+def scrape_and_store(module, out_dir):
+    """Scraper'ı çalıştırır, ardından çıktıyı geçmiş deposuna ekler."""
+    fn = load_runner(module)
+    if module in BROWSER_MODULES:
+        # Arka planda açılır; scraper ödünç alırken hazır olmasını bekler
+        from scrapers.drivers import get_manager
+
+        get_manager().warm_up()
+    result = fn(out_dir)
+    print(run_store(out_dir))
+    return result
+
 
 # Tab başlıklarını büyüt + Remax/Turyap/Dialog butonlarını gri yap (sağlam yöntem: JS class ekleme)
 st.markdown(
@@ -248,8 +138,8 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-tab_scraper, tab_diff, tab_view = st.tabs(
-    ["Scraper Paneli", "CSV/Excel Karşılaştırma", "Çıktıları Görüntüle"]
+tab_scraper, tab_diff, tab_view, tab_history = st.tabs(
+    ["Scraper Paneli", "CSV/Excel Karşılaştırma", "Çıktıları Görüntüle", "Geçmiş"]
 )
 
 with tab_scraper:
@@ -263,21 +153,22 @@ with tab_scraper:
     with left:
         st.subheader("Sistemi Çalıştır")
 
-        for name, fn in COMPANIES:
+        for name, _, module in COMPANIES:
             # Remax, Dialog ve Turyap butonlarını disabled yap
             is_disabled = name in ["Remax", "Dialog", "Turyap"]
             
-            if st.button(f"▶️ {name}", key=f"btn_{name}", disabled=is_disabled):
-                st.session_state.logs = []
+            # Aynı firmanın işi sürerken ikinci kez başlatılamaz
+            is_running = bool(jobs.active(name))
 
-                with right:
-                    st.subheader("Log")
-                    log_container = st.empty()
-                    log_text = "\n".join(st.session_state.logs[-500:]) if len(st.session_state.logs) > 500 else "\n".join(st.session_state.logs) if st.session_state.logs else ""
-                    log_container.code(log_text, language="", line_numbers=False)
+            if st.button(f"▶️ {name}", key=f"btn_{name}", disabled=is_disabled or is_running):
+                jobs.submit(name, scrape_and_store, module, out_dir)
+                st.toast(f"{name} arka planda başlatıldı")
+
+        # Günün klasöründeki tüm firma çıktılarını tek şemada birleştirir (tekrarlar ayıklanır)
+        if st.button("🔗 Birleştir", key="btn_consolidate", disabled=bool(jobs.active("Birleştirme"))):
+            jobs.submit("Birleştirme", run_consolidate, out_dir)
+            st.toast("Birleştirme arka planda başlatıldı")
 
-                run_one(name, fn, out_dir, log_container)
-            
         # Remax, Dialog ve Turyap butonlarını gri yap ve tıklanamaz göster
         st.markdown("""
         <style>
@@ -301,18 +192,59 @@ with tab_scraper:
         </style>
         """, unsafe_allow_html=True)
 
-    with right:
+    # İş durumu birkaç saniyede bir yalnızca bu bölüm yeniden çizilerek yoklanır;
+    # diğer sekmeler iş sürerken kullanılabilir.
+    @st.fragment(run_every=2)
+    def job_panel():
+        st.subheader("İşler")
+        all_jobs = jobs.jobs()
+        if not all_jobs:
+            st.info("Henüz iş yok.")
+            return
+
+        for job in all_jobs[:10]:
+            c1, c2, c3, c4, c5 = st.columns([3, 2, 2, 2, 1])
+            c1.write(f"**{job.name}** #{job.id}")
+            c2.write(STATUS_LABELS[job.status])
+            c3.write(f"{job.rows} satır")
+            c4.write(f"{job.elapsed:.0f}s")
+            if job.active:
+                c5.button("⏹", key=f"cancel_{job.id}", on_click=job.cancel, help="İptal et")
+
+    # Log ayrı ve daha sık çizilir; metin yalnızca yeni satır geldiğinde yeniden oluşturulur.
+    # İş thread'i satırları halka tampona ekler, çizim hızı taramayı yavaşlatmaz.
+    @st.fragment(run_every=LOG_REFRESH_SECS)
+    def log_panel():
+        all_jobs = jobs.jobs()
+        if not all_jobs:
+            return
+
         st.subheader("Log")
-        log_container = st.empty()
-        log_text = "\n".join(st.session_state.logs[-500:]) if len(st.session_state.logs) > 500 else "\n".join(st.session_state.logs) if st.session_state.logs else ""
-        log_container.code(log_text, language="", line_numbers=False)
+        options = {f"{j.name} #{j.id}": j for j in all_jobs}
+        choice = st.selectbox("İş seç", list(options), key="log_job", label_visibility="collapsed")
+        buf = options[choice].lines
+
+        version = (options[choice].id, buf.total)
+        rendered = st.session_state.get("log_render")
+        if rendered is None or rendered[0] != version:
+            rendered = (version, "\n".join(buf.tail(LOG_TAIL)))
+            st.session_state.log_render = rendered
+
+        st.caption(f"Toplam: {buf.total} satır | Gösterilen: son {min(len(buf), LOG_TAIL)} | Düşen: {buf.dropped}")
+        st.code(rendered[1], language="", line_numbers=False)
+
+    with right:
+        job_panel()
+        log_panel()
 
     st.divider()
 
     st.subheader("Üretilen Dosyalar")
 
     files = []
-    for root, _, filenames in os.walk(out_dir):
+    for root, dirs, filenames in os.walk(out_dir):
+        # .state gibi iç klasörler (run günlükleri) listelenmez
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
         for f in filenames:
             files.append(os.path.join(root, f))
 
@@ -335,8 +267,8 @@ with tab_diff:
         unsafe_allow_html=True,
     )
 
-    file_a = st.file_uploader("Dosya A yükle (.csv / .xlsx)", type=["csv", "xlsx"], key="a")
-    file_b = st.file_uploader("Dosya B yükle (.csv / .xlsx)", type=["csv", "xlsx"], key="b")
+    file_a = st.file_uploader("Dosya A yükle (.csv / .xlsx / .parquet)", type=["csv", "xlsx", "parquet"], key="a")
+    file_b = st.file_uploader("Dosya B yükle (.csv / .xlsx / .parquet)", type=["csv", "xlsx", "parquet"], key="b")
 
     mode = st.radio(
         "Karşılaştırma modu",
@@ -371,6 +303,8 @@ with tab_diff:
             return read_csv_smart(uploaded)
         if name.endswith(".xlsx"):
             return read_excel(uploaded)
+        if name.endswith(".parquet"):
+            return read_parquet_file(uploaded)
         raise ValueError("Desteklenmeyen dosya tipi")
 
     def norm_series(s: pd.Series) -> pd.Series:
@@ -483,7 +417,7 @@ with tab_diff:
                     mime="text/csv",
                 )
     else:
-        st.info("Başlamak için iki dosyayı yükle (CSV veya Excel).")
+        st.info("Başlamak için iki dosyayı yükle (CSV, Excel veya Parquet).")
 
 with tab_view:
     st.markdown("<h1 style='font-size: 32px; font-weight: bold;'>Çıktı Dosyalarını Görüntüle</h1>", unsafe_allow_html=True)
@@ -498,17 +432,34 @@ with tab_view:
 
         run_path = os.path.join(OUTPUT_BASE, selected_run)
 
+        def show_table(df_view, selected_cols):
+            column_config = {}
+            for col in selected_cols:
+                column_config[col] = st.column_config.TextColumn(col, width="medium", help=f"{col} kolonu")
+
+            st.dataframe(
+                df_view[selected_cols],
+                use_container_width=True,
+                column_config=column_config,
+                hide_index=False,
+            )
+
         data_files = []
-        for root, _, filenames in os.walk(run_path):
+        for root, dirs, filenames in os.walk(run_path):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            names = set(filenames)
             for f in filenames:
                 lower = f.lower()
-                if lower.endswith(".csv") or lower.endswith(".xlsx"):
+                # CSV'nin yanındaki .parquet ayrıca listelenmez; CSV seçilince o okunur
+                if lower.endswith(".parquet") and os.path.splitext(f)[0] + ".csv" in names:
+                    continue
+                if lower.endswith((".csv", ".xlsx", ".parquet")):
                     full_path = os.path.join(root, f)
                     rel = os.path.relpath(full_path, run_path)
                     data_files.append((rel, full_path))
 
         if not data_files:
-            st.warning("Bu run klasöründe CSV veya Excel dosyası bulunamadı.")
+            st.warning("Bu run klasöründe CSV, Parquet veya Excel dosyası bulunamadı.")
         else:
             labels = [x[0] for x in data_files]
             choice = st.selectbox("Dosya seç", labels)
@@ -516,76 +467,137 @@ with tab_view:
             chosen_path = dict(data_files)[choice]
             st.caption(f"Seçilen dosya: `{chosen_path}`")
 
-            try:
-                if chosen_path.lower().endswith(".csv"):
-                    encodings = ["utf-8-sig", "utf-8", "latin-1", "cp1254", "iso-8859-9"]
-                    txt = None
-                    used_encoding = None
-
-                    for enc in encodings:
-                        try:
-                            with open(chosen_path, "r", encoding=enc, errors="replace") as f:
-                                txt = f.read()
-                            used_encoding = enc
-                            break
-                        except Exception:
-                            continue
+            # Scraper çıktıları: önce kolonlar (şema/başlık), sonra sadece seçilen kolonlar okunur
+            fast_cols = None
+            if chosen_path.lower().endswith((".csv", ".parquet")):
+                try:
+                    fast_cols = read_columns(chosen_path)
+                except Exception:
+                    fast_cols = None
+                if fast_cols is not None and len(fast_cols) < 2 and chosen_path.lower().endswith(".csv"):
+                    fast_cols = None
 
-                    if txt is None:
-                        st.error("Dosya okunamadı. Encoding sorunu olabilir.")
-                        st.stop()
-
-                    df_view = None
-                    for sep in [";", ",", "\t", "|"]:
+            try:
+                if fast_cols:
+                    selected_cols = st.multiselect("Gösterilecek kolonlar", fast_cols, default=fast_cols)
+                    if selected_cols:
+                        t0 = time.perf_counter()
+                        source = "parquet" if parquet_for(chosen_path) else "csv"
                         try:
-                            test_df = pd.read_csv(
-                                io.StringIO(txt),
-                                sep=sep,
-                                dtype=str,
-                                engine="python",
-                                quotechar='"',
-                                skipinitialspace=True,
-                            )
-                            if test_df.shape[1] >= 2 or (test_df.shape[1] == 1 and len(test_df) > 0):
-                                df_view = test_df
-                                break
+                            df_view = read_table(chosen_path, selected_cols)
                         except Exception:
-                            continue
-
-                    if df_view is None:
-                        df_view = pd.read_csv(io.StringIO(txt), dtype=str, engine="python", quotechar='"')
-                else:
-                    df_view = pd.read_excel(chosen_path, dtype=str)
-
-                df_view = df_view.dropna(how="all")
-
-                if df_view.shape[1] == 1:
-                    first_col = df_view.columns[0]
-                    sample_vals = df_view[first_col].dropna().astype(str).head(10)
-                    if any("," in v for v in sample_vals):
-                        expanded = df_view[first_col].astype(str).str.split(",", expand=True)
-                        expanded.columns = [f"kolon_{i+1}" for i in range(expanded.shape[1])]
-                        df_view = expanded
-
-                st.caption(f"Satır: {len(df_view)} | Kolon: {len(df_view.columns)}")
-                if chosen_path.lower().endswith(".csv") and used_encoding:
-                    st.caption(f"Encoding: {used_encoding}")
-
-                all_cols = df_view.columns.tolist()
-                selected_cols = st.multiselect("Gösterilecek kolonlar", all_cols, default=all_cols)
-
-                if selected_cols:
-                    column_config = {}
-                    for col in selected_cols:
-                        column_config[col] = st.column_config.TextColumn(col, width="medium", help=f"{col} kolonu")
-
-                    st.dataframe(
-                        df_view[selected_cols],
-                        use_container_width=True,
-                        column_config=column_config,
-                        hide_index=False,
-                    )
+                            if source != "csv":
+                                raise
+                            # Yarım yazılmış/bozuk satırlı CSV: hızlı okuma başarısızsa toleranslı okuma
+                            df_view = read_csv_tolerant(chosen_path, selected_cols)
+                            source = "csv (bozuk satırlar atlandı)"
+                        st.caption(
+                            f"Satır: {len(df_view)} | Kolon: {len(fast_cols)} | "
+                            f"Kaynak: {source} | Okuma: {time.perf_counter() - t0:.2f}s"
+                        )
+                        show_table(df_view, selected_cols)
+                    else:
+                        st.info("En az bir kolon seçmelisin.")
                 else:
-                    st.info("En az bir kolon seçmelisin.")
+                    # Diğer dosyalar: encoding/ayraç tahminiyle tam okuma
+                    if chosen_path.lower().endswith(".csv"):
+                        encodings = ["utf-8-sig", "utf-8", "latin-1", "cp1254", "iso-8859-9"]
+                        txt = None
+                        used_encoding = None
+
+                        for enc in encodings:
+                            try:
+                                with open(chosen_path, "r", encoding=enc, errors="replace") as f:
+                                    txt = f.read()
+                                used_encoding = enc
+                                break
+                            except Exception:
+                                continue
+
+                        if txt is None:
+                            st.error("Dosya okunamadı. Encoding sorunu olabilir.")
+                            st.stop()
+
+                        df_view = None
+                        for sep in [";", ",", "\t", "|"]:
+                            try:
+                                test_df = pd.read_csv(
+                                    io.StringIO(txt),
+                                    sep=sep,
+                                    dtype=str,
+                                    engine="python",
+                                    quotechar='"',
+                                    skipinitialspace=True,
+                                )
+                                if test_df.shape[1] >= 2 or (test_df.shape[1] == 1 and len(test_df) > 0):
+                                    df_view = test_df
+                                    break
+                            except Exception:
+                                continue
+
+                        if df_view is None:
+                            df_view = pd.read_csv(
+                                io.StringIO(txt), dtype=str, engine="python", quotechar='"', on_bad_lines="skip"
+                            )
+                    else:
+                        df_view = pd.read_excel(chosen_path, dtype=str)
+
+                    df_view = df_view.dropna(how="all")
+
+                    if df_view.shape[1] == 1:
+                        first_col = df_view.columns[0]
+                        sample_vals = df_view[first_col].dropna().astype(str).head(10)
+                        if any("," in v for v in sample_vals):
+                            expanded = df_view[first_col].astype(str).str.split(",", expand=True)
+                            expanded.columns = [f"kolon_{i+1}" for i in range(expanded.shape[1])]
+                            df_view = expanded
+
+                    st.caption(f"Satır: {len(df_view)} | Kolon: {len(df_view.columns)}")
+                    if chosen_path.lower().endswith(".csv") and used_encoding:
+                        st.caption(f"Encoding: {used_encoding}")
+
+                    all_cols = df_view.columns.tolist()
+                    selected_cols = st.multiselect("Gösterilecek kolonlar", all_cols, default=all_cols)
+
+                    if selected_cols:
+                        show_table(df_view, selected_cols)
+                    else:
+                        st.info("En az bir kolon seçmelisin.")
             except Exception as e:
                 st.error(f"Dosya okunurken hata oluştu: {e}")
+
+with tab_history:
+    st.markdown("<h1 style='font-size: 32px; font-weight: bold;'>Run Geçmişi</h1>", unsafe_allow_html=True)
+
+    store = get_store()
+
+    if st.button("📥 Tüm run klasörlerini içe aktar", key="btn_store_backfill"):
+        # Değişmemiş dosyalar (aynı mtime) atlanır; tekrar basmak güvenli
+        with st.spinner("İçe aktarılıyor..."):
+            for d in sorted(os.listdir(OUTPUT_BASE)):
+                if os.path.isdir(os.path.join(OUTPUT_BASE, d)) and not d.startswith("."):
+                    store.ingest_run(os.path.join(OUTPUT_BASE, d))
+        st.success(store.summary())
+
+    st.subheader("Danışman ara")
+    c1, c2, c3, c4 = st.columns([2, 2, 1, 2])
+    q_email = c1.text_input("E-posta", key="q_email")
+    q_phone = c2.text_input("Telefon", key="q_phone")
+    q_company = c3.selectbox("Firma", store.companies(), key="q_company")
+    q_url = c4.text_input("Profil linki", key="q_url", disabled=q_company is None)
+
+    if q_email or q_phone or (q_url and q_company):
+        t0 = time.perf_counter()
+        found = store.lookup(email=q_email, phone=q_phone, profile_url=q_url, company=q_company)
+        st.caption(f"{len(found)} kayıt | {(time.perf_counter() - t0) * 1000:.0f} ms")
+        if found.empty:
+            st.info("Kayıt bulunamadı.")
+        else:
+            st.dataframe(found, use_container_width=True, hide_index=True)
+
+    st.subheader("Run'lar")
+    runs_df = store.runs()
+    if runs_df.empty:
+        st.info("Henüz içe aktarılmış run yok.")
+    else:
+        st.dataframe(runs_df, use_container_width=True, hide_index=True)
@@ -1,7 +1,27 @@
+import importlib
 
+# Firma kaydı: (panel adı, CLI anahtarı, modül). Panel (app.py) ve komut satırı
+# (python -m scrapers) aynı listeyi kullanır. Modüller ilk kullanımda import
+# edilir; paketi import etmek selenium vb. ağır bağımlılıkları yüklemez.
+COMPANIES = [
+    ("Coldwell Banker", "coldwell_banker", "company1"),
+    ("Remax", "remax", "company2"),
+    ("Century21", "century21", "company3"),
+    ("ERA", "era", "company4"),
+    ("Dialog", "dialog", "company5"),
+    ("Turyap", "turyap", "company6"),
+    ("Rozky", "rookz", "company7"),
+]
 
 
+def load_runner(module: str):
+    return importlib.import_module(f"{__name__}.{module}").run
 
 
-
-
+def find_company(name: str):
+    """Anahtar ya da panel adına (büyük/küçük harf duyarsız) göre kayıt; yoksa None."""
+    name = name.strip().lower()
+    for entry in COMPANIES:
+        if name in (entry[0].lower(), entry[1]):
+            return entry
+    return None
@@ -0,0 +1,92 @@
+import re
+from urllib.parse import urljoin
+
+from .extract import parse_response
+
+# ASP.NET WebForms postback'lerini tarayıcısız tekrar oynatmak için yardımcılar.
+# Sayfadaki form alanları (__VIEWSTATE, __EVENTVALIDATION, ...) aynen geri
+# gönderilir; __EVENTTARGET/__EVENTARGUMENT tıklanan kontrolü belirtir.
+# Aynı form durumundan birden çok postback bağımsız atılabilir; sayfa numarası
+# linkleri görünüyorsa sayfalar paralel çekilebilir.
+
+DOPOSTBACK_RE = re.compile(r"__doPostBack\(\s*'([^']*)'\s*,\s*'([^']*)'\s*\)")
+POSTBACK_OPTIONS_RE = re.compile(r'WebForm_PostBackOptions\(\s*"([^"]*)"\s*,\s*"([^"]*)"')
+
+_SKIP_INPUTS = {"submit", "button", "image", "reset", "file"}
+
+
+class PostbackForm:
+    """Bir sayfanın form durumu: postback adresi ve geri gönderilecek alanlar."""
+
+    def __init__(self, action: str, fields: dict):
+        self.action = action
+        self.fields = fields
+
+    @classmethod
+    def from_tree(cls, tree, url: str):
+        forms = tree.forms
+        if not forms:
+            raise ValueError(f"postback formu bulunamadı: {url}")
+        form = forms[0]
+        fields = {}
+        for el in form.iter("input", "select", "textarea"):
+            name = el.get("name")
+            if not name:
+                continue
+            if el.tag == "input":
+                kind = (el.get("type") or "text").lower()
+                if kind in _SKIP_INPUTS:
+                    continue
+                if kind in ("checkbox", "radio") and el.get("checked") is None:
+                    continue
+                fields[name] = el.get("value") or ""
+            elif el.tag == "select":
+                selected = el.xpath(".//option[@selected]") or el.xpath(".//option[1]")
+                if selected:
+                    fields[name] = selected[0].get("value", selected[0].text or "")
+            else:
+                fields[name] = el.text or ""
+        return cls(urljoin(url, form.get("action") or url), fields)
+
+    @property
+    def has_viewstate(self) -> bool:
+        return "__VIEWSTATE" in self.fields
+
+    def post(self, client, action, **kwargs):
+        """action: postback_action() sonucu. Sunucunun döndürdüğü sayfayı parse eder."""
+        target, argument, extra = action
+        data = {**self.fields, "__EVENTTARGET": target, "__EVENTARGUMENT": argument, **extra}
+        r = client.post(self.action, data=data, **kwargs)
+        r.raise_for_status()
+        return parse_response(r)
+
+
+def postback_action(el):
+    """
+    Tıklanabilir elemanın postback'i: (target, argument, ek alanlar) ya da None.
+    javascript:__doPostBack(...) href/onclick'leri ve isimli submit butonları desteklenir.
+    """
+    if el is None:
+        return None
+    for attr in ("href", "onclick"):
+        value = el.get(attr) or ""
+        m = DOPOSTBACK_RE.search(value) or POSTBACK_OPTIONS_RE.search(value)
+        if m:
+            return m.group(1), m.group(2), {}
+    name = el.get("name")
+    if name and el.tag in ("button", "input"):
+        return "", "", {name: el.get("value") or ""}
+    return None
+
+
+def page_number_actions(nodes) -> dict:
+    """Metni sayı olan pager linkleri: {sayfa no: postback}."""
+    out = {}
+    for el in nodes:
+        label = (el.text_content() or "").strip()
+        if not label.isdigit():
+            continue
+        action = postback_action(el)
+        if action is not None:
+            out[int(label)] = action
+    return out
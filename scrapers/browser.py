@@ -0,0 +1,198 @@
+import threading
+import time
+
+# Selenium yardımcıları.
+# - Toplu okuma: her find_element / get_attribute / .text ayrı bir WebDriver HTTP
+#   isteğidir; bir sayfanın ihtiyaç duyduğu her şey tek execute_script ile toplanır.
+# - Kaynak engelleme: analitik, reklam, harita, video ve medya istekleri CDP
+#   (Network.setBlockedURLs) ile tarayıcı seviyesinde kesilir; site başına izin listesi.
+# - Sabit sleep yerine DOM değişimine bağlı bekleme ve sayfa başı süre ölçümü.
+
+# Varsayılan engellenen URL kalıpları (CDP joker sözdizimi)
+BLOCKED_URLS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googleadservices.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*connect.facebook.net*",
+    "*facebook.com/tr*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*mc.yandex.ru*",
+    "*tiktok.com*",
+    "*linkedin.com/px*",
+    "*maps.googleapis.com*",
+    "*maps.gstatic.com*",
+    "*google.com/maps*",
+    "*youtube.com*",
+    "*ytimg.com*",
+    "*vimeo.com*",
+    "*.mp4*",
+    "*.webm*",
+    "*.woff*",
+    "*.ttf*",
+    "*.jpg*",
+    "*.jpeg*",
+    "*.png*",
+    "*.gif*",
+    "*.webp*",
+    "*.svg*",
+)
+
+EMAIL_JS_RE = r"[\w.-]+@[\w.-]+\.\w+"
+
+# arguments[0]: img CSS seçicisi. Her görsel için en yakın <a> ile kart kaydı.
+CARD_RECORDS_JS = """
+const out = [];
+for (const img of document.querySelectorAll(arguments[0])) {
+  const a = img.closest('a');
+  if (!a) continue;
+  out.push({alt: (img.getAttribute('alt') || '').trim(), src: img.src || '', href: a.href || ''});
+}
+return out;
+"""
+
+# arguments[0]: XPath. Eşleşen elemanların (mutlak) href'leri.
+XPATH_HREFS_JS = """
+const snap = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const out = [];
+for (let i = 0; i < snap.snapshotLength; i++) {
+  const href = snap.snapshotItem(i).href;
+  if (href) out.push(href);
+}
+return out;
+"""
+
+# arguments[0]: {alan: XPath}, arguments[1]: e-posta regex'i.
+# Alan bulunamazsa null döner (bekleme koşulu için), bulunursa innerText.
+FIELDS_JS = """
+const texts = {};
+for (const [key, xp] of Object.entries(arguments[0])) {
+  const el = document.evaluate(xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  texts[key] = el ? (el.innerText || el.textContent || '').trim() : null;
+}
+const mail = document.querySelector('a[href^="mailto:"]');
+const m = document.documentElement.outerHTML.match(new RegExp(arguments[1]));
+return {texts: texts, mailto: mail ? mail.getAttribute('href') : null, email_match: m ? m[0] : null};
+"""
+
+
+def card_records(driver, img_selector: str):
+    """[{alt, src, href}, ...] — görsel başına dört WebDriver çağrısı yerine bir tane."""
+    return driver.execute_script(CARD_RECORDS_JS, img_selector) or []
+
+
+def xpath_hrefs(driver, xpath: str):
+    return driver.execute_script(XPATH_HREFS_JS, xpath) or []
+
+
+def read_fields(driver, xpaths: dict, timeout: float = 4.0, poll: float = 0.1):
+    """
+    Tüm alanları tek script ile okur; alanların hepsi DOM'da görünene ya da
+    timeout dolana kadar aynı script'i yoklar. Dönüş: ({alan: metin}, e-posta).
+    E-posta önce ilk mailto: linkinden, geçersizse sayfa HTML'inde regex ile aranır.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        res = driver.execute_script(FIELDS_JS, xpaths, EMAIL_JS_RE)
+        if all(v is not None for v in res["texts"].values()) or time.monotonic() >= deadline:
+            break
+        time.sleep(poll)
+
+    texts = {k: v or "" for k, v in res["texts"].items()}
+
+    email = None
+    if res.get("mailto"):
+        v = res["mailto"].replace("mailto:", "").strip()
+        if "@" in v and not v.startswith("?"):
+            email = v
+    return texts, email or res.get("email_match")
+
+
+def blocked_urls(allow=()):
+    """BLOCKED_URLS'ten izin listesindeki (alt dize) kalıpları çıkarır."""
+    return [u for u in BLOCKED_URLS if not any(a in u for a in allow)]
+
+
+def apply_fast_options(options):
+    """DOMContentLoaded'da döner; alt kaynakların (img/iframe) bitmesi beklenmez."""
+    options.page_load_strategy = "eager"
+    return options
+
+
+def block_resources(driver, allow=()):
+    """CDP ile URL engelleme; Chrome dışı sürücülerde sessizce atlanır."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls(allow)})
+    except Exception as exc:
+        print(f"[browser] URL engelleme uygulanamadı: {exc}")
+    return driver
+
+
+def healthy(driver) -> bool:
+    """Tarayıcı cevap veriyor mu (sıcak tarayıcı ve havuz aynı kontrolü kullanır)."""
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+def wait_for_change(fn, before, timeout: float = 8.0, poll: float = 0.05):
+    """
+    fn() sonucu before'dan farklı ve boş olmayana kadar yoklar; yeni değeri döner.
+    Zaman aşımında son değer döner (sayfa değişmemiş olabilir, çağıran karar verir).
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        value = fn()
+        if (value and value != before) or time.monotonic() >= deadline:
+            return value
+        time.sleep(poll)
+
+
+class PageTimer:
+    """Sayfa başı süreleri etiket bazında toplar (thread-safe)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def record(self, label: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(label, []).append(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def measure(self, label: str):
+        return _Timed(self, label)
+
+    def summary(self) -> str:
+        parts = []
+        with self._lock:
+            for label, xs in self._samples.items():
+                xs = sorted(xs)
+                p50 = xs[len(xs) // 2]
+                p95 = xs[min(len(xs) - 1, int(len(xs) * 0.95))]
+                parts.append(
+                    f"{label}: n={len(xs)} ort={sum(xs) / len(xs):.2f}s p50={p50:.2f}s p95={p95:.2f}s"
+                )
+        return f"[timing:{self.name}] " + (" | ".join(parts) or "ölçüm yok")
+
+
+class _Timed:
+    def __init__(self, timer: PageTimer, label: str):
+        self.timer = timer
+        self.label = label
+
+    def __enter__(self):
+        self.t0 = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.label, time.monotonic() - self.t0)
@@ -0,0 +1,73 @@
+import functools
+import threading
+
+# Run iptali ve ilerleme için bağımsız bağlam.
+# Bir RunContext thread'e bind() ile bağlanır (ör. panelin iş yöneticisi, bkz.
+# jobs); scraper kodu yalnızca checkpoint() ve track_sink() çağırır. Bağlam
+# yoksa (CLI, doğrudan çağrı) ikisi de etkisizdir.
+# Bağlam thread'e özeldir; havuz/worker thread'lerine verilen fonksiyonlar
+# propagate() ile sarılır, böylece oradaki checkpoint ve print'ler de run'a gider.
+
+_local = threading.local()
+
+
+class Cancelled(Exception):
+    pass
+
+
+class RunContext:
+    """İptal bayrağı ve run'ın açtığı RowSink'ler (satır sayısı ilerleme olarak okunur)."""
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.cancel_requested = threading.Event()
+        self.sinks = []
+
+    @property
+    def rows(self) -> int:
+        return sum(len(s) for s in self.sinks)
+
+    def cancel(self):
+        self.cancel_requested.set()
+
+
+def current():
+    """Çağıran thread'e bağlı RunContext ya da None."""
+    return getattr(_local, "ctx", None)
+
+
+def bind(ctx):
+    """ctx'i çağıran thread'e bağlar (None: bağı kaldırır); önceki bağlamı döner."""
+    prev = current()
+    _local.ctx = ctx
+    return prev
+
+
+def checkpoint():
+    """Bağlı run için iptal istenmişse Cancelled atar."""
+    ctx = current()
+    if ctx is not None and ctx.cancel_requested.is_set():
+        raise Cancelled(f"{ctx.name or 'run'} iptal edildi")
+
+
+def propagate(fn):
+    """fn'i çağıran thread'in bağlamına bağlar; başka thread'de çağrıldığında o bağlamla çalışır."""
+    ctx = current()
+    if ctx is None:
+        return fn
+
+    @functools.wraps(fn)
+    def bound(*args, **kwargs):
+        prev = bind(ctx)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            bind(prev)
+
+    return bound
+
+
+def track_sink(sink):
+    ctx = current()
+    if ctx is not None:
+        ctx.sinks.append(sink)
@@ -0,0 +1,203 @@
+import argparse
+import inspect
+import json
+import os
+import sys
+import time
+import traceback
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from . import COMPANIES, find_company, load_runner
+from .journal import STATE_DIR
+from .schedule import CronSpec, LockHeld, RunLock, sleep_until
+
+# Streamlit'siz çalıştırma: python -m scrapers run|schedule|list
+# Scraper çıktıları (print) stderr'e yönlenir; stdout'a yalnızca run başına tek
+# satır JSON özet yazılır. Özet ayrıca outputs/<tarih>/.state/cli_<saat>.json
+# dosyasına kaydedilir. Aynı çıktı klasörü için tek run çalışır (kilit dosyası).
+
+EXIT_OK = 0
+EXIT_FAILED = 1  # en az bir firma hata verdi
+EXIT_USAGE = 2
+EXIT_LOCKED = 3
+EXIT_INTERRUPTED = 130
+
+LOCK_FILE = ".run.lock"
+
+
+def _err(msg: str):
+    print(msg, file=sys.stderr, flush=True)
+
+
+def _call_runner(fn, out_dir: str, incremental: bool):
+    kwargs = {}
+    if incremental and "incremental" in inspect.signature(fn).parameters:
+        kwargs["incremental"] = True
+    return fn(out_dir, **kwargs)
+
+
+def run_batch(entries, out_base: str, incremental: bool = False, consolidate: bool = True,
+              store: bool = True) -> dict:
+    """Seçilen firmaları sırayla çalıştırır; JSON'a çevrilebilir özet döner."""
+    started = datetime.now()
+    out_dir = os.path.join(out_base, started.strftime("%Y-%m-%d"))
+    os.makedirs(out_dir, exist_ok=True)
+    results = []
+
+    for label, key, module in entries:
+        t0 = time.monotonic()
+        entry = {"company": label, "key": key, "ok": False}
+        _err(f"[cli] {label} başladı")
+        try:
+            with redirect_stdout(sys.stderr):
+                entry["result"] = _call_runner(load_runner(module), out_dir, incremental)
+            entry["ok"] = True
+        except Exception as exc:
+            traceback.print_exc(file=sys.stderr)
+            entry["error"] = f"{type(exc).__name__}: {exc}"
+        entry["seconds"] = round(time.monotonic() - t0, 1)
+        _err(f"[cli] {label} {'tamamlandı' if entry['ok'] else 'hata'} ({entry['seconds']}s)")
+        results.append(entry)
+
+    summary = {
+        "started_at": started.isoformat(timespec="seconds"),
+        "out_dir": os.path.abspath(out_dir),
+        "companies": results,
+    }
+    # Birleştirme ve geçmiş kaydı firma run'larından bağımsız; hataları özete yazılır
+    if any(r["ok"] for r in results):
+        if consolidate:
+            summary["consolidated"] = _step("consolidate", out_dir)
+        if store:
+            summary["store"] = _step("store", out_dir)
+    summary["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    summary["ok"] = all(r["ok"] for r in results) and all(
+        summary.get(k, {}).get("ok", True) for k in ("consolidated", "store")
+    )
+    _save_summary(out_dir, summary, started)
+    return summary
+
+
+def _step(name: str, out_dir: str) -> dict:
+    from importlib import import_module
+
+    try:
+        with redirect_stdout(sys.stderr):
+            result = import_module(f"{__package__}.{name}").run(out_dir)
+        return {"ok": True, "result": result}
+    except Exception as exc:
+        traceback.print_exc(file=sys.stderr)
+        return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def _save_summary(out_dir: str, summary: dict, started: datetime):
+    state = os.path.join(out_dir, STATE_DIR)
+    os.makedirs(state, exist_ok=True)
+    path = os.path.join(state, f"cli_{started.strftime('%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+def _emit(summary: dict):
+    print(json.dumps(summary, ensure_ascii=False), flush=True)
+
+
+def _selected(args):
+    if args.all:
+        return list(COMPANIES)
+    entries = []
+    for name in args.company or []:
+        entry = find_company(name)
+        if entry is None:
+            keys = ", ".join(c[1] for c in COMPANIES)
+            raise SystemExit(_usage_error(f"bilinmeyen firma: {name} (seçenekler: {keys})"))
+        if entry not in entries:
+            entries.append(entry)
+    if not entries:
+        raise SystemExit(_usage_error("--company ya da --all verilmeli"))
+    return entries
+
+
+def _usage_error(msg: str) -> int:
+    _err(f"hata: {msg}")
+    return EXIT_USAGE
+
+
+def _locked_run(args, entries) -> int:
+    lock = RunLock(os.path.join(args.out, LOCK_FILE))
+    try:
+        with lock:
+            summary = run_batch(
+                entries, args.out, incremental=args.incremental,
+                consolidate=not args.no_consolidate, store=not args.no_store,
+            )
+    except LockHeld as exc:
+        _emit({"ok": False, "skipped": True, "error": str(exc),
+               "at": datetime.now().isoformat(timespec="seconds")})
+        return EXIT_LOCKED
+    _emit(summary)
+    return EXIT_OK if summary["ok"] else EXIT_FAILED
+
+
+def cmd_run(args) -> int:
+    return _locked_run(args, _selected(args))
+
+
+def cmd_schedule(args) -> int:
+    entries = _selected(args)
+    try:
+        spec = CronSpec(args.cron)
+    except ValueError as exc:
+        return _usage_error(str(exc))
+
+    if args.run_now:
+        _locked_run(args, entries)
+    while True:
+        when = spec.next_after(datetime.now())
+        _err(f"[cli] sonraki run: {when:%Y-%m-%d %H:%M}")
+        sleep_until(when)
+        # Çakışan run (önceki hâlâ sürüyor) atlanır; zamanlayıcı bir sonrakini bekler
+        _locked_run(args, entries)
+
+
+def cmd_list(args) -> int:
+    for label, key, _ in COMPANIES:
+        print(f"{key}\t{label}")
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m scrapers", description="Scraper'ları panel olmadan çalıştırır.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_args(p):
+        p.add_argument("--company", "-c", action="append", help="firma anahtarı ya da adı (tekrarlanabilir)")
+        p.add_argument("--all", action="store_true", help="tüm firmalar")
+        p.add_argument("--out", default="outputs", help="çıktı kökü; run'lar <out>/<tarih>/ altına yazılır")
+        p.add_argument("--incremental", action="store_true", help="destekleyen scraper'larda artımlı mod")
+        p.add_argument("--no-consolidate", action="store_true", help="birleşik dosyayı üretme")
+        p.add_argument("--no-store", action="store_true", help="SQLite geçmişine ekleme")
+
+    p_run = sub.add_parser("run", help="seçilen firmaları bir kez çalıştırır")
+    add_run_args(p_run)
+    p_run.set_defaults(func=cmd_run)
+
+    p_sched = sub.add_parser("schedule", help="cron ifadesine göre sürekli çalıştırır")
+    add_run_args(p_sched)
+    p_sched.add_argument("--cron", required=True, help='5 alanlı cron ifadesi, ör. "0 3 * * *" ya da @daily')
+    p_sched.add_argument("--run-now", action="store_true", help="beklemeden önce bir kez çalıştır")
+    p_sched.set_defaults(func=cmd_schedule)
+
+    p_list = sub.add_parser("list", help="kayıtlı firmaları listeler")
+    p_list.set_defaults(func=cmd_list)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        _err("[cli] durduruldu")
+        return EXIT_INTERRUPTED
@@ -0,0 +1,105 @@
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow kurulu değilse yalnızca CSV yazılır/okunur
+    pa = pq = None
+
+# Kolonlu (Parquet) çıktı ve kolon seçerek okuma.
+# Her CSV'nin yanına aynı adla .parquet yazılır (zstd sıkıştırmalı, açık şema:
+# bilinen sayısal kolonlar int32, geri kalan her şey string). Görüntüleyici ve
+# karşılaştırma sekmesi önce Parquet'i dener ve sadece seçilen kolonları okur;
+# Parquet yoksa CSV C motoruyla (usecols) okunur.
+
+HAVE_PARQUET = pq is not None
+PARQUET_EXT = ".parquet"
+COMPRESSION = "zstd"
+
+# Sayısal tutulan kolonlar; şemada olmayan her kolon string
+INT_COLUMNS = ("page", "sources")
+
+
+def parquet_path(path: str) -> str:
+    return os.path.splitext(path)[0] + PARQUET_EXT
+
+
+def schema_for(columns):
+    return pa.schema([
+        pa.field(c, pa.int32() if c in INT_COLUMNS else pa.string(), nullable=True)
+        for c in columns
+    ])
+
+
+def arrow_table(df: pd.DataFrame):
+    """df'i açık şemalı Arrow tablosuna çevirir (bkz. schema_for)."""
+    df = df.copy()
+    for c in INT_COLUMNS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype("Int32")
+    return pa.Table.from_pandas(df, schema=schema_for(df.columns), preserve_index=False)
+
+
+def parquet_writer(path: str, columns):
+    """Parça parça yazmak için ParquetWriter (write_table ile eklenir, close ile biter)."""
+    return pq.ParquetWriter(path, schema_for(columns), compression=COMPRESSION)
+
+
+def write_parquet(df: pd.DataFrame, path: str):
+    """df'i path'e (atomik) yazar; pyarrow yoksa None döner."""
+    if not HAVE_PARQUET:
+        return None
+    tmp = path + ".tmp"
+    pq.write_table(arrow_table(df), tmp, compression=COMPRESSION)
+    os.replace(tmp, path)
+    return path
+
+
+def parquet_for(path: str):
+    """path'in okunabilir Parquet karşılığı (kendisi ya da yanındaki dosya) veya None."""
+    if not HAVE_PARQUET:
+        return None
+    if path.lower().endswith(PARQUET_EXT):
+        return path
+    pq_path = parquet_path(path)
+    if os.path.exists(pq_path) and os.path.getmtime(pq_path) >= os.path.getmtime(path):
+        return pq_path
+    return None
+
+
+def read_columns(path: str) -> list:
+    """Veriyi okumadan kolon adları (Parquet şeması ya da CSV başlığı)."""
+    pq_path = parquet_for(path)
+    if pq_path is not None:
+        return list(pq.read_schema(pq_path).names)
+    return pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns.tolist()
+
+
+def read_table(path: str, columns=None) -> pd.DataFrame:
+    """Sadece columns'u okur (None ise hepsi); değerler string, eksikler ""."""
+    pq_path = parquet_for(path)
+    if pq_path is not None:
+        return read_parquet_file(pq_path, columns)
+    # utf-8-sig BOM'lu ve BOM'suz çıktıları birlikte okur
+    df = pd.read_csv(path, usecols=columns, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    return df[list(columns)] if columns else df
+
+
+def read_csv_tolerant(path: str, columns=None) -> pd.DataFrame:
+    """read_table'ın CSV yedeği: python motoru, bozuk satırlar (ör. yazılırken kesilmiş .partial.csv) atlanır."""
+    df = pd.read_csv(
+        path, usecols=columns, dtype=str, keep_default_na=False, encoding="utf-8-sig",
+        engine="python", on_bad_lines="skip",
+    )
+    return df[list(columns)] if columns else df
+
+
+def read_parquet_file(source, columns=None) -> pd.DataFrame:
+    """Yol ya da dosya nesnesinden (ör. yüklenen dosya) Parquet; değerler string."""
+    if not HAVE_PARQUET:
+        raise RuntimeError("Parquet okumak için pyarrow kurulu olmalı")
+    # integer_object_nulls: boşluklu int kolonlar float'a dönüp "1.0" olmasın
+    df = pq.read_table(source, columns=columns).to_pandas(integer_object_nulls=True)
+    return df.astype("string").fillna("").astype(str)
@@ -1,90 +1,26 @@
-import os
-import time
-import random
-from urllib.parse import urljoin
-from datetime import datetime
-
-import pandas as pd
-import requests
-from lxml import html
-
-BASE = "https://www.cb.com.tr"
-LIST_URL = BASE + "/danismanlar?pager_p={page}"
-
-session = requests.Session()
-session.headers.update(
-    {
-        "User-Agent": "Mozilla/5.0",
-    }
+from . import engine
+from .engine import SiteConfig, mailto, tel, text
+from .incremental import DEFAULT_MAX_AGE_DAYS
+
+SITE = SiteConfig(
+    name="coldwell_banker",
+    base="https://www.cb.com.tr",
+    list_url="https://www.cb.com.tr/danismanlar?pager_p={page}",
+    cards='//a[starts-with(@href,"/danismanlar/") and .//h2]',
+    card_fields={"name": text(".//h2")},
+    profile_fields={"email": mailto(), "phone": tel()},
+    headers={"User-Agent": "Mozilla/5.0"},
+    timeout=20,
+    rate_limit={"rate": 4.0, "max_rate": 20.0},
+    concurrency=8,
+    max_pages=327,
 )
 
 
-def pick_real_email(tree):
-    hrefs = tree.xpath('//a[starts-with(@href,"mailto:")]/@href')
-    for h in hrefs:
-        v = h.replace("mailto:", "").strip()
-        if "@" in v and not v.startswith("?"):
-            return v
-    return None
-
-
-def pick_phone(tree):
-    hrefs = tree.xpath('//a[starts-with(@href,"tel:")]/@href')
-    for h in hrefs:
-        v = h.replace("tel:", "").strip()
-        if v:
-            return v
-    return None
-
-
-def run(output_dir: str) -> str:
+def run(output_dir: str, detail_concurrency: int = None, incremental: bool = False,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS) -> str:
     """
-    Scraper çalışır, output_dir içine csv/json kaydeder.
-    Geriye özet bir mesaj döndürür.
+    Scraper çalışır, output_dir içine csv kaydeder.
+    Geriye özet bir mesaj döndürür. Ayrıntılar: engine.run.
     """
-    rows = []
-
-    for page in range(1, 328):
-        r = session.get(LIST_URL.format(page=page), timeout=20)
-        r.raise_for_status()
-        tree = html.fromstring(r.text)
-
-        cards = tree.xpath('//a[starts-with(@href,"/danismanlar/") and .//h2]')
-        if not cards:
-            break
-
-        for c in cards:
-            href = c.get("href")
-            name = c.xpath("string(.//h2)").strip()
-            profile_url = urljoin(BASE, href)
-
-            pr = session.get(profile_url, timeout=20)
-            pr.raise_for_status()
-            p_tree = html.fromstring(pr.text)
-
-            email = pick_real_email(p_tree)
-            phone = pick_phone(p_tree)
-
-            rows.append(
-                {
-                    "page": page,
-                    "name": name,
-                    "email": email,
-                    "phone": phone,
-                    "profile_url": profile_url,
-                }
-            )
-
-        # Çok agresif olmamak için ufak bekleme
-        time.sleep(random.uniform(0.5, 1.5))
-
-    df = pd.DataFrame(rows).drop_duplicates(subset=["profile_url"])
-
-    os.makedirs(output_dir, exist_ok=True)
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    out_path = os.path.join(output_dir, f"coldwell_banker_{date_str}.csv")
-    df.to_csv(out_path, index=False, encoding="utf-8")
-
-    return f"TOTAL: {len(df)} satır, dosya: {os.path.basename(out_path)}"
-
-
+    return engine.run(SITE, output_dir, detail_concurrency, incremental, max_age_days)
@@ -1,18 +1,45 @@
 import os
 import re
 import time
-import shutil
 from datetime import datetime
+from functools import partial
 
-import pandas as pd
-from selenium import webdriver
+from lxml import etree
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from .browser import PageTimer, card_records, read_fields, wait_for_change
+from .cancel import checkpoint
+from .driver_pool import DEFAULT_RECYCLE_AFTER, DriverPool
+from .drivers import get_manager, new_driver
+from .extract import EMAIL_RE, PARSER_VERSION, first_mailto, parse_response, search_subtree, text_xpath, xtext
+from .http_cache import ResponseCache
+from .http_client import get_client
+from .incremental import DEFAULT_MAX_AGE_DAYS, SCRAPED_AT, Snapshot, today
+from .normalize import is_landline_tr, is_mobile_tr, normalize_frame, normalize_tr_phone
+from .pipeline import run_pipeline
+from .ratelimit import get_limiter
+from .sink import RowSink
+
 URL = "https://www.dialogturkiye.com/danismanlarimiz"
+HOST = "www.dialogturkiye.com"
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Profil istekleri için hedef hız (sayfa/sn). HTTP modu ve tarayıcı aynı host
+# bütçesini paylaşır; tek tarayıcı zaten sıralı gider, eşzamanlılık HTTP içindir.
+RATE_LIMIT = {"rate": 4.0, "max_rate": 10.0, "max_concurrency": 8}
+
+# "http": profiller HTTP ile çekilip lxml ile parse edilir, sunucu HTML'inde veri
+# yoksa o profil tarayıcıyla açılır. "browser": her profil tarayıcıda açılır.
+PROFILE_MODE = "http"
+HTTP_WORKERS = 8
+
+# Tarayıcıyla açılacak profiller için paralel Chrome sayısı (makinenin CPU/RAM'ine
+# göre ayarlanır; env: DIALOG_DRIVER_POOL) ve tarayıcı başına sayfa sınırı
+DRIVER_POOL_SIZE = int(os.environ.get("DIALOG_DRIVER_POOL", "3"))
+DRIVER_RECYCLE_AFTER = DEFAULT_RECYCLE_AFTER
 
 # Profile page XPaths
 XPATH_TOP = '//*[@id="app"]/div[3]/div[1]/div[1]/div[2]'
@@ -20,48 +47,44 @@ XPATH_A1 = '//*[@id="app"]/div[3]/div[1]/div[2]/div/a[1]/div'
 XPATH_A2 = '//*[@id="app"]/div[3]/div[1]/div[2]/div/a[2]/div'
 XPATH_A3 = '//*[@id="app"]/div[3]/div[1]/div[2]/div/a[3]/div'
 
+PROFILE_XPATHS = {"top": XPATH_TOP, "a1": XPATH_A1, "a2": XPATH_A2, "a3": XPATH_A3}
 
-def setup_driver(headless: bool = True):
-    options = Options()
-    if headless:
-        options.add_argument("--headless=new")
-
-    # GitHub Actions / Linux için kritik flag'ler
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1400,900")
-    options.add_argument("--remote-debugging-port=9222")
-
-    prefs = {
-        "profile.managed_default_content_settings.images": 2,
-        "profile.managed_default_content_settings.stylesheets": 2,
-        "profile.managed_default_content_settings.fonts": 2,
-    }
-    options.add_experimental_option("prefs", prefs)
+# Serbest metinden telefon adayları (modül yüklenirken bir kez derlenir)
+PHONE_CANDIDATE_RE = re.compile(
+    r"(\+?90\s*)?\(?0?\d{3}\)?[\s\-]?\d{3}[\s\-]?\d{2}[\s\-]?\d{2}|\b0\d{10}\b|\b5\d{9}\b"
+)
+DIGIT_RUN_RE = re.compile(r"\d{10,13}")
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Listeleme kartlarındaki danışman görselleri
+CARD_IMG = 'img[src*="/data/user/"]'
 
-    # 1) Workflow'dan gelen env'leri öncele
-    chrome_bin = os.environ.get("CHROME_BIN")
-    driver_bin = os.environ.get("CHROMEDRIVER_PATH")
+# Tarayıcıda engellenmeyecek kalıplar (browser.BLOCKED_URLS içinden); site
+# kendi görsellerini/haritasını gerektirirse buraya eklenir
+BROWSER_ALLOW = ()
 
-    # 2) Yoksa sistemde bul
-    if not chrome_bin:
-        chrome_bin = shutil.which("chromium-browser") or shutil.which("chromium") or shutil.which("google-chrome")
-    if not driver_bin:
-        driver_bin = shutil.which("chromedriver")
+# Listeleme sayfa geçişi ve profil açılışı süreleri
+TIMER = PageTimer("dialog")
 
-    if chrome_bin:
-        options.binary_location = chrome_bin
+X_TOP = text_xpath(XPATH_TOP)
+X_A1 = text_xpath(XPATH_A1)
+X_A2 = text_xpath(XPATH_A2)
+X_A3 = text_xpath(XPATH_A3)
+X_BODY = etree.XPath("//body")
 
-    if not driver_bin:
-        raise RuntimeError("chromedriver bulunamadı. GitHub Actions'ta apt install adımı eksik olabilir.")
+# HTTP modunda profil sayfaları koşullu GET ile önbellekten doğrulanır;
+# parse_profile_response değişince sürümün son hanesi artırılır
+PROFILE_CACHE = ResponseCache("dialog", version=f"{PARSER_VERSION}.1")
 
-    return webdriver.Chrome(service=Service(driver_bin), options=options)
+
+def setup_driver(headless: bool = True):
+    # chromedriver yolu süreç başına bir kez çözülür, port her tarayıcıya ayrı (bkz. drivers.py)
+    return new_driver(headless, BROWSER_ALLOW)
 
 
 def wait_cards_loaded(driver, timeout=12):
     WebDriverWait(driver, timeout).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, 'img[src*="/data/user/"]'))
+        EC.presence_of_element_located((By.CSS_SELECTOR, CARD_IMG))
     )
 
 
@@ -78,56 +101,6 @@ def click_page_number(driver, n, timeout=7):
         return False
 
 
-def safe_text(driver, xpath, timeout=4):
-    try:
-        el = WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.XPATH, xpath))
-        )
-        return (el.text or "").strip()
-    except Exception:
-        return ""
-
-
-def pick_email(driver):
-    # 1) try mailto:
-    try:
-        a = driver.find_element(By.CSS_SELECTOR, 'a[href^="mailto:"]')
-        v = (a.get_attribute("href") or "").replace("mailto:", "").strip()
-        if "@" in v and not v.startswith("?"):
-            return v
-    except Exception:
-        pass
-
-    # 2) fallback: find any email-like text on page
-    text = driver.page_source
-    m = re.search(r"[\w\.-]+@[\w\.-]+\.\w+", text)
-    return m.group(0) if m else None
-
-
-def normalize_tr_phone(raw: str) -> str:
-    if not raw:
-        return ""
-    digits = re.sub(r"\D+", "", raw.strip())
-
-    # drop country code 90...
-    if digits.startswith("90") and len(digits) >= 12:
-        digits = digits[2:]  # remove '90'
-
-    # 5xxxxxxxxx -> 05xxxxxxxxx
-    if len(digits) == 10 and digits.startswith("5"):
-        digits = "0" + digits
-
-    return digits
-
-
-def is_mobile_tr(d: str) -> bool:
-    return len(d) == 11 and d.startswith("05")
-
-
-def is_landline_tr(d: str) -> bool:
-    return len(d) == 11 and d.startswith("0") and not d.startswith("05")
-
-
 def extract_phones_from_text(text: str):
     """
     Extracts possible phone numbers from plain text.
@@ -136,24 +109,14 @@ def extract_phones_from_text(text: str):
     if not text:
         return []
 
-    candidates = re.findall(
-        r'(\+?90\s*)?\(?0?\d{3}\)?[\s\-]?\d{3}[\s\-]?\d{2}[\s\-]?\d{2}|\b0\d{10}\b|\b5\d{9}\b',
-        text,
-    )
-
-    flat = []
-    for c in candidates:
-        if isinstance(c, tuple):
-            c = "".join(c)
-        flat.append(c)
-
-    digit_runs = re.findall(r"\d{10,13}", re.sub(r"\s+", "", text))
-    flat.extend(digit_runs)
+    # findall tek gruplu desende sadece grubu (+90) döndürüyordu; tam eşleşme alınır
+    flat = [m.group(0) for m in PHONE_CANDIDATE_RE.finditer(text)]
+    flat.extend(DIGIT_RUN_RE.findall(WHITESPACE_RE.sub("", text)))
 
     phones = []
     for c in flat:
         d = normalize_tr_phone(c)
-        if len(d) == 11 and d.startswith("0"):
+        if is_mobile_tr(d) or is_landline_tr(d):
             phones.append(d)
 
     seen = set()
@@ -196,102 +159,207 @@ def pick_best_phone_from_texts(*texts):
     return None, landlines[0]
 
 
+def card_hrefs(driver):
+    return tuple(c["href"] for c in card_records(driver, CARD_IMG))
+
+
 def collect_profile_links(driver):
-    driver.get(URL)
-    wait_cards_loaded(driver)
+    with TIMER.measure("liste"):
+        driver.get(URL)
+        wait_cards_loaded(driver)
 
     profiles = []
     seen = set()
     page = 1
 
     while True:
-        wait_cards_loaded(driver)
-        imgs = driver.find_elements(By.CSS_SELECTOR, 'img[src*="/data/user/"]')
+        checkpoint()
+        cards = card_records(driver, CARD_IMG)
 
         new_count = 0
-        for img in imgs:
-            try:
-                name = (img.get_attribute("alt") or "").strip()
-                img_src = (img.get_attribute("src") or "").strip()
-
-                a = img.find_element(By.XPATH, "./ancestor::a[1]")
-                href = (a.get_attribute("href") or "").strip()
-
-                if href and href not in seen:
-                    seen.add(href)
-                    profiles.append(
-                        {
-                            "page": page,
-                            "name_alt": name,
-                            "img_src": img_src,
-                            "profile_url": href,
-                        }
-                    )
-                    new_count += 1
-            except Exception:
-                continue
-
-        print(f"[PAGE {page}] found {len(imgs)} | new {new_count} | total {len(profiles)}")
-
-        if click_page_number(driver, page + 1):
-            page += 1
-            time.sleep(0.8)  # sayfa geçişinde yüklenme için
-            continue
-        break
+        for card in cards:
+            href = card["href"].strip()
+            if href and href not in seen:
+                seen.add(href)
+                profiles.append(
+                    {
+                        "page": page,
+                        "name_alt": card["alt"],
+                        "img_src": card["src"].strip(),
+                        "profile_url": href,
+                    }
+                )
+                new_count += 1
+
+        print(f"[PAGE {page}] found {len(cards)} | new {new_count} | total {len(profiles)}")
+
+        before = tuple(c["href"] for c in cards)
+        t0 = time.monotonic()
+        if not click_page_number(driver, page + 1):
+            break
+        # Sabit bekleme yerine kart listesinin gerçekten değişmesi beklenir
+        if wait_for_change(lambda: card_hrefs(driver), before, timeout=8) == before:
+            print(f"[PAGE {page + 1}] kartlar değişmedi, durduruluyor")
+            break
+        TIMER.record("liste", time.monotonic() - t0)
+        page += 1
 
     return profiles
 
 
-def scrape_profiles(driver, profiles):
-    rows = []
-    for p in profiles:
-        driver.get(p["profile_url"])
-
-        v_top = safe_text(driver, XPATH_TOP)
-        v_a1 = safe_text(driver, XPATH_A1)
-        v_a2 = safe_text(driver, XPATH_A2)
-        v_a3 = safe_text(driver, XPATH_A3)
-
-        email = pick_email(driver)
-
-        personal_phone, work_phone = pick_best_phone_from_texts(v_top, v_a1, v_a2, v_a3)
-
-        row = {
-            **p,
-            "xpath_top": v_top,
-            "xpath_a1": v_a1,
-            "xpath_a2": v_a2,
-            "xpath_a3": v_a3,
-            "email": email,
-            "personal_phone": personal_phone,
-            "work_phone": work_phone,
-        }
-        rows.append(row)
-
-        print(
-            f'[{p["page"]}] {p["name_alt"]} | {email or "-"} | personal={personal_phone or "-"} | work={work_phone or "-"}'
-        )
+COLUMNS = [
+    "page", "name_alt", "img_src", "profile_url",
+    "xpath_top", "xpath_a1", "xpath_a2", "xpath_a3",
+    "email", "personal_phone", "work_phone", SCRAPED_AT,
+]
+
+
+def profile_fields(v_top, v_a1, v_a2, v_a3, email):
+    personal_phone, work_phone = pick_best_phone_from_texts(v_top, v_a1, v_a2, v_a3)
+    return {
+        "xpath_top": v_top,
+        "xpath_a1": v_a1,
+        "xpath_a2": v_a2,
+        "xpath_a3": v_a3,
+        "email": email,
+        "personal_phone": personal_phone,
+        "work_phone": work_phone,
+    }
+
+
+def parse_profile_response(r):
+    """Sunucunun döndürdüğü HTML'den (JS çalıştırmadan) profil alanları."""
+    tree = parse_response(r)
+    email = first_mailto(tree) or search_subtree(X_BODY(tree), EMAIL_RE)
+    return profile_fields(
+        xtext(tree, X_TOP), xtext(tree, X_A1), xtext(tree, X_A2), xtext(tree, X_A3), email
+    )
+
+
+def has_profile_data(fields) -> bool:
+    """Sayfa istemci tarafında render ediliyorsa HTML'de bu alanlar boş gelir."""
+    return bool(fields["email"] or fields["personal_phone"] or fields["work_phone"])
+
 
-        time.sleep(0.25)
+def fetch_profile_http(client, profile_url: str):
+    return PROFILE_CACHE.fetch(client, profile_url, parse_profile_response, timeout=20)
 
-    return pd.DataFrame(rows).drop_duplicates(subset=["profile_url"])
 
+def fetch_profile_browser(driver, limiter, profile_url: str):
+    limiter.acquire()
+    t0 = time.monotonic()
+    driver.get(profile_url)
+    limiter.feedback(200, time.monotonic() - t0)
 
-def run(output_dir: str) -> str:
+    # Dört ayrı bekleme + page_source yerine tek script (bkz. browser.read_fields)
+    texts, email = read_fields(driver, PROFILE_XPATHS)
+    TIMER.record("profil", time.monotonic() - t0)
+    return profile_fields(texts["top"], texts["a1"], texts["a2"], texts["a3"], email)
+
+
+def write_profile(sink, p, fields):
+    sink.write({**p, **fields, SCRAPED_AT: today()})
+    print(
+        f'[{p["page"]}] {p["name_alt"]} | {fields["email"] or "-"} | '
+        f'personal={fields["personal_phone"] or "-"} | work={fields["work_phone"] or "-"}'
+    )
+
+
+def scrape_profiles(profiles, sink, snapshot=None, mode: str = None, workers: int = HTTP_WORKERS,
+                    pool_size: int = None):
+    """
+    Satırlar profil işlendikçe sink'e (RowSink) yazılır; yazılan satır sayısı döner.
+    mode="http" (varsayılan PROFILE_MODE): profiller paralel HTTP ile çekilir, sadece
+    HTML'inde veri olmayanlar (ve HTTP hatası verenler) tarayıcıya düşer.
+    Tarayıcı işleri pool_size (varsayılan DRIVER_POOL_SIZE) Chrome'a dağıtılır.
+    """
+    mode = mode or PROFILE_MODE
+    limiter = get_limiter(HOST, **RATE_LIMIT)
+
+    todo = []
+    for p in profiles:
+        prev = snapshot.fresh(p["profile_url"]) if snapshot is not None else None
+        if prev is not None:
+            sink.write({**prev, **p})
+        else:
+            todo.append(p)
+
+    browser_todo = todo
+    if mode == "http":
+        client = get_client("dialog", headers=HEADERS, pool_size=workers, rate_limit=RATE_LIMIT)
+        # İstemci ve önbellek süreç içinde paylaşılır; özetler bu run'ı göstersin
+        client.reset_stats()
+        PROFILE_CACHE.reset_stats()
+        browser_todo = []
+
+        def on_result(p, fields):
+            if has_profile_data(fields):
+                write_profile(sink, p, fields)
+            else:
+                browser_todo.append(p)
+
+        def on_error(p, exc):
+            print(f"[http] {p['profile_url']}: {exc}")
+            browser_todo.append(p)
+
+        run_pipeline(
+            todo,
+            lambda p: fetch_profile_http(client, p["profile_url"]),
+            on_result,
+            on_error,
+            workers=workers,
+        )
+        PROFILE_CACHE.close()
+        print(client.summary())
+        print(PROFILE_CACHE.summary())
+        print(f"[dialog] HTTP ile={len(todo) - len(browser_todo)} | tarayıcıya düşen={len(browser_todo)}")
+
+    if browser_todo:
+        def on_browser_error(p, exc):
+            print(f"[browser] {p['profile_url']}: {exc}")
+
+        with DriverPool(
+            setup_driver, size=pool_size or DRIVER_POOL_SIZE, recycle_after=DRIVER_RECYCLE_AFTER
+        ) as pool:
+            pool.map(
+                lambda driver, p: fetch_profile_browser(driver, limiter, p["profile_url"]),
+                browser_todo,
+                partial(write_profile, sink),
+                on_browser_error,
+            )
+        print(pool.summary())
+
+    if snapshot is not None:
+        print(snapshot.summary())
+    print(sink.summary())
+    return len(sink)
+
+
+def run(output_dir: str, incremental: bool = False, max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+        mode: str = None, pool_size: int = None) -> str:
     """
     Scraper çalışır, output_dir içine csv kaydeder.
     Geriye özet bir mesaj döndürür.
+    incremental=True: önceki çıktıda olan ve max_age_days'ten yeni profiller yeniden ziyaret edilmez.
+    mode: "http" (varsayılan) veya "browser"; bkz. PROFILE_MODE.
+    pool_size: tarayıcıyla açılan profiller için paralel Chrome sayısı.
     """
     os.makedirs(output_dir, exist_ok=True)
-    driver = setup_driver(headless=True)
-    try:
-        profiles = collect_profile_links(driver)
-        df = scrape_profiles(driver, profiles)
-    finally:
-        driver.quit()
+    snapshot = Snapshot.load(output_dir, "dialog_latest", max_age_days) if incremental else None
 
     # Streamlit'in kolay okuması için "latest" dosyası öneririm
     out_path = os.path.join(output_dir, "dialog_latest.csv")
-    df.to_csv(out_path, index=False, encoding="utf-8-sig")
+    sink = RowSink(out_path, columns=COLUMNS, encoding="utf-8-sig", postprocess=normalize_frame)
+
+    TIMER.reset()
+    try:
+        # Listeleme için süreçteki sıcak tarayıcı ödünç alınır (ilk kullanımda açılır)
+        with get_manager().borrow(BROWSER_ALLOW) as driver:
+            profiles = collect_profile_links(driver)
+        total = scrape_profiles(profiles, sink, snapshot, mode, pool_size=pool_size)
+        print(TIMER.summary())
+        sink.close()
+    finally:
+        sink.abort()
 
-    return f"TOTAL: {len(df)} satır, dosya: {os.path.basename(out_path)}"
\ No newline at end of file
+    return f"TOTAL: {total} satır, dosya: {os.path.basename(out_path)}"
\ No newline at end of file
@@ -1,44 +1,68 @@
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from urllib.parse import urljoin
+from functools import partial
+from urllib.parse import urljoin, urlsplit
 from datetime import datetime
 
-import pandas as pd
-import requests
-from lxml import html
-from selenium import webdriver
+from lxml import etree
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+
+from .aspnet import PostbackForm, page_number_actions, postback_action
+from .browser import PageTimer, xpath_hrefs
+from .discovery import iter_pages
+from .drivers import get_manager
+from .extract import EMAIL_RE, PARSER_VERSION, href_or_text, parse_response, search_subtree, text_xpath, xtext
+from .http_cache import ResponseCache
+from .http_client import get_client
+from .incremental import DEFAULT_MAX_AGE_DAYS, SCRAPED_AT, Snapshot, today
+from .normalize import normalize_frame, normalize_tr_phone
+from .pipeline import run_pipeline
+from .retry import DeadLetter
+from .sink import RowSink
 
 BASE = "https://www.turyap.com.tr"
 LIST_URL = BASE + "/Danismanlar.aspx"
 
-X_NAME = "/html/body/form/section/div/div/div/section[2]/div/div[2]/div[1]/div/aside/div[1]/h3"
-X_PHONE = "/html/body/form/section/div/div/div/section[2]/div/div[2]/div[1]/div/aside/div[1]/ul/li[2]/a/span"
-X_MAIL = "/html/body/form/section/div/div/div/section[2]/div/div[2]/div[1]/div/aside/div[1]/ul/li[3]/a"
+X_NAME = text_xpath("/html/body/form/section/div/div/div/section[2]/div/div[2]/div[1]/div/aside/div[1]/h3")
+X_PHONE = text_xpath("/html/body/form/section/div/div/div/section[2]/div/div[2]/div[1]/div/aside/div[1]/ul/li[2]/a/span")
+X_MAIL = etree.XPath("/html/body/form/section/div/div/div/section[2]/div/div[2]/div[1]/div/aside/div[1]/ul/li[3]/a")
+
+# Mutlak yollar tutmazsa kullanılan yedekler
+X_NAME_FALLBACK = text_xpath("//aside//h3[1]")
+X_PHONE_TEL = text_xpath("//aside//a[starts-with(@href,'tel:')][1]//span")
+X_PHONE_SPAN = text_xpath("//aside//ul//li//span[contains(.,'0')][1]")
+X_ASIDE = etree.XPath("//aside")
+
+# Regex yedekleri tüm sayfa yerine sadece profil kartında (aside) aranır
+PHONE_RE = re.compile(r"(?:\+?90\s*)?0?\s*5\d{2}\s*\d{3}\s*\d{2}\s*\d{2}|\b0\d{10}\b")
+
+# Listeleme sayfası (lxml ile, tarayıcısız)
+LIST_LINKS_XPATH = '//a[.//img[contains(@class,"img-fluidDanismanListe")]]'
+LIST_FALLBACK_XPATH = '//div[contains(@class,"Danisman") or contains(@class,"danisman")]/descendant::a[1]'
+X_LIST_LINKS = etree.XPath(LIST_LINKS_XPATH + "/@href")
+X_LIST_FALLBACK = etree.XPath(LIST_FALLBACK_XPATH + "/@href")
+X_NEXT = etree.XPath('(//i[contains(@class,"icon-arrow-right-1")]/ancestor::*[self::a or self::button][1])[1]')
+X_PAGER_LINKS = etree.XPath('//a[contains(@href,"PostBack") or contains(@onclick,"PostBack")]')
 
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 
+# "http": liste sayfaları ASP.NET postback'leri tekrar oynatılarak çekilir;
+# başarısız olursa kalan sayfalar için tarayıcıya (Selenium) dönülür.
+LISTING_MODE = "http"
+LISTING_WORKERS = 4
 
-def setup_driver(headless: bool = True):
-    options = Options()
-    if headless:
-        options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--window-size=1400,900")
-    prefs = {
-        "profile.managed_default_content_settings.images": 2,
-        "profile.managed_default_content_settings.stylesheets": 2,
-        "profile.managed_default_content_settings.fonts": 2,
-    }
-    options.add_experimental_option("prefs", prefs)
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+# Tarayıcıda engellenmeyecek kalıplar (browser.BLOCKED_URLS içinden)
+BROWSER_ALLOW = ()
+
+RATE_LIMIT = {"rate": 5.0, "max_rate": 25.0, "max_concurrency": 8}
+
+COLUMNS = ["page", "name", "phone", "email", "profile_url", SCRAPED_AT]
+
+# Profil sayfaları koşullu GET ile önbellekten doğrulanır;
+# parse_detail_response değişince sürümün son hanesi artırılır
+PROFILE_CACHE = ResponseCache("turyap", version=f"{PARSER_VERSION}.1")
 
 
 def wait_listing_loaded(driver, timeout=12):
@@ -48,31 +72,12 @@ def wait_listing_loaded(driver, timeout=12):
 
 
 def get_listing_profile_links(driver):
-    links = []
-
-    # 1) img içeren tüm <a>lar
-    anchors = driver.find_elements(
-        By.XPATH, '//a[.//img[contains(@class,"img-fluidDanismanListe")]]'
-    )
-    for a in anchors:
-        href = (a.get_attribute("href") or "").strip()
-        if href:
-            links.append(href)
-
-    # 2) Fallback
-    if not links:
-        anchors = driver.find_elements(
-            By.XPATH,
-            '//div[contains(@class,"Danisman") or contains(@class,"danisman")]/descendant::a[1]',
-        )
-        for a in anchors:
-            href = (a.get_attribute("href") or "").strip()
-            if href:
-                links.append(href)
+    # Anchor başına get_attribute yerine tek execute_script (bkz. browser.py)
+    links = xpath_hrefs(driver, LIST_LINKS_XPATH) or xpath_hrefs(driver, LIST_FALLBACK_XPATH)
 
     out, seen = [], set()
     for h in links:
-        full = urljoin(BASE, h)
+        full = urljoin(BASE, h.strip())
         if full not in seen:
             seen.add(full)
             out.append(full)
@@ -106,134 +111,231 @@ def click_next_page(driver, timeout=8):
         return False
 
 
-def collect_all_profile_urls(max_pages=10_000):
-    driver = setup_driver(headless=True)
-    try:
-        driver.get(LIST_URL)
-        wait_listing_loaded(driver)
+def iter_all_profile_urls(max_pages=10_000):
+    """Selenium ile sayfaları gezer; yeni profil URL'lerini bulundukça (page, url) olarak üretir (yedek yol)."""
+    timer = PageTimer("turyap")
+    with get_manager().borrow(BROWSER_ALLOW) as driver:
+        with timer.measure("liste"):
+            driver.get(LIST_URL)
+            wait_listing_loaded(driver)
 
-        all_urls = []
         seen = set()
         page = 1
 
         while page <= max_pages:
             urls = get_listing_profile_links(driver)
-            new_count = 0
-
-            for u in urls:
-                if u not in seen:
-                    seen.add(u)
-                    all_urls.append((page, u))
-                    new_count += 1
+            new = [u for u in urls if u not in seen]
+            seen.update(new)
 
             print(
-                f"[PAGE {page}] found {len(urls)} urls | collected {new_count} new (total {len(all_urls)})"
+                f"[PAGE {page}] found {len(urls)} urls | collected {len(new)} new (total {len(seen)})"
             )
+            for u in new:
+                yield page, u
 
-            if not click_next_page(driver):
-                break
+            # Tıklama sonrası eski kartın DOM'dan düşmesi ve yenisinin gelmesi beklenir
+            with timer.measure("liste"):
+                if not click_next_page(driver):
+                    break
             page += 1
+    print(timer.summary())
 
-        return all_urls
-    finally:
-        driver.quit()
 
+def listing_links(tree):
+    hrefs = X_LIST_LINKS(tree) or X_LIST_FALLBACK(tree)
+    out, seen = [], set()
+    for h in hrefs:
+        h = (h or "").strip()
+        if not h:
+            continue
+        full = urljoin(BASE, h)
+        if full not in seen:
+            seen.add(full)
+            out.append(full)
+    return out
 
-def parse_detail(page_num: int, url: str):
-    r = requests.get(url, headers=HEADERS, timeout=25)
-    r.raise_for_status()
-    tree = html.fromstring(r.text)
 
-    def xtext(xp: str) -> str:
-        return (tree.xpath(f"string({xp})") or "").strip()
+def post_page(client, form, actions, n):
+    """Aynı form durumundan n. sayfanın postback'ini gönderir (actions: page_number_actions)."""
+    return form.post(client, actions[n], timeout=25)
 
-    name = xtext(X_NAME)
-    if not name:
-        name = (tree.xpath("string(//aside//h3[1])") or "").strip()
 
-    phone = xtext(X_PHONE)
-    if not phone:
-        phone = (
-            tree.xpath(
-                "string(//aside//a[starts-with(@href,'tel:')][1]//span)"
-            )
-            or ""
-        ).strip()
-    if not phone:
-        phone = (
-            tree.xpath(
-                "string(//aside//ul//li//span[contains(.,'0')][1])"
-            )
-            or ""
-        ).strip()
+def iter_profile_urls_http(max_pages=10_000, workers=LISTING_WORKERS):
+    """
+    Danismanlar.aspx'i tarayıcısız gezer: her sayfanın form durumu
+    (__VIEWSTATE/__EVENTVALIDATION) ile "sonraki" postback'i gönderilir.
+    Pager'da görünen ileri sayfa numaraları aynı durumdan paralel çekilir.
+    """
+    client = get_client("turyap", headers=HEADERS, rate_limit=RATE_LIMIT)
+    r = client.get(LIST_URL, timeout=25)
+    r.raise_for_status()
 
-    if not phone:
-        m = re.search(
-            r"(?:\\+?90\\s*)?0?\\s*5\\d{2}\\s*\\d{3}\\s*\\d{2}\\s*\\d{2}|\\b0\\d{10}\\b",
-            r.text.replace("&nbsp;", " "),
-        )
-        if m:
-            phone = (
-                re.sub(r"\\s+", "", m.group(0))
-                .replace("+90", "0")
-                .replace("90", "0", 1)
-            )
+    pages = {1: parse_response(r)}  # çekilmiş, henüz işlenmemiş sayfalar
+    seen = set()
+    page = 1
+    while page in pages and page <= max_pages:
+        tree = pages.pop(page)
+        urls = listing_links(tree)
+        new = [u for u in urls if u not in seen]
+        seen.update(new)
+        print(f"[PAGE {page}] found {len(urls)} urls | collected {len(new)} new (total {len(seen)})")
+        if not new:
+            # Son sayfada "sonraki" aynı sayfayı döndürebilir
+            break
+        for u in new:
+            yield page, u
+
+        form = PostbackForm.from_tree(tree, LIST_URL)
+        jumps = {
+            n: action
+            for n, action in page_number_actions(X_PAGER_LINKS(tree)).items()
+            if page < n <= max_pages and n not in pages
+        }
+        fetch = partial(post_page, client, form, jumps)
+        for n, result, exc in iter_pages(fetch, sorted(jumps), workers=workers):
+            if exc is None:
+                pages[n] = result
+            else:
+                print(f"[PAGE {n}] postback hatası: {exc}")
+
+        if page + 1 not in pages:
+            action = postback_action(next(iter(X_NEXT(tree)), None))
+            if action is None:
+                break
+            pages[page + 1] = form.post(client, action, timeout=25)
+        page += 1
 
-    email = ""
-    nodes = tree.xpath(X_MAIL)
-    if nodes:
-        href = (nodes[0].get("href") or "").strip()
-        txt = (nodes[0].text_content() or "").strip()
-        if href.lower().startswith("mailto:"):
-            email = href.replace("mailto:", "").strip()
+
+def iter_profile_urls(max_pages=10_000, mode: str = None):
+    """
+    mode="http" (varsayılan LISTING_MODE): postback sayfalayıcı; hata verirse ya da
+    hiç link bulamazsa tarayıcıyla devam edilir ve daha önce üretilen URL'ler atlanır.
+    """
+    mode = mode or LISTING_MODE
+    seen = set()
+    if mode == "http":
+        try:
+            for page, u in iter_profile_urls_http(max_pages):
+                seen.add(u)
+                yield page, u
+        except Exception as exc:
+            print(f"[turyap] HTTP sayfalama başarısız, tarayıcıya geçiliyor: {exc}")
         else:
-            email = txt
+            if seen:
+                return
 
-    if not email:
-        m = re.search(r"[\\w\\.-]+@[\\w\\.-]+\\.\\w+", r.text)
-        if m:
-            email = m.group(0)
+    for page, u in iter_all_profile_urls(max_pages):
+        if u not in seen:
+            yield page, u
 
+
+def parse_detail(client, page_num: int, url: str):
+    fields = PROFILE_CACHE.fetch(client, url, parse_detail_response, timeout=25)
     return {
         "page": page_num,
-        "name": name,
-        "phone": phone,
-        "email": email,
+        "name": fields["name"],
+        "phone": fields["phone"],
+        "email": fields["email"],
         "profile_url": url,
+        SCRAPED_AT: today(),
     }
 
 
-def scrape_details_fast(profile_list, workers=20):
-    rows = []
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        futs = [ex.submit(parse_detail, p, u) for (p, u) in profile_list]
-        for f in as_completed(futs):
-            row = f.result()
-            rows.append(row)
-            print(
-                f'[{row["page"]}] {row["name"] or "-"} | {row["phone"] or "-"} | {row["email"] or "-"} | {row["profile_url"]}'
-            )
-    return pd.DataFrame(rows)
+def parse_detail_response(r):
+    tree = parse_response(r)
+
+    name = xtext(tree, X_NAME) or xtext(tree, X_NAME_FALLBACK)
+
+    phone = xtext(tree, X_PHONE) or xtext(tree, X_PHONE_TEL) or xtext(tree, X_PHONE_SPAN)
+    if not phone:
+        found = search_subtree(X_ASIDE(tree), PHONE_RE)
+        if found:
+            phone = normalize_tr_phone(found)
 
+    email = ""
+    nodes = X_MAIL(tree)
+    if nodes:
+        email = href_or_text(nodes[0], "mailto:")
+
+    if not email:
+        email = search_subtree(X_ASIDE(tree), EMAIL_RE) or ""
 
-def run(output_dir: str) -> str:
+    return {"name": name, "phone": phone, "email": email}
+
+
+def scrape_details_fast(profile_list, sink, workers=20, snapshot=None):
     """
-    Scraper çalışır, output_dir içine csv/json kaydeder.
-    Geriye özet bir mesaj döndürür.
+    Satırlar geldikçe sink'e (RowSink) yazılır; yazılan satır sayısı döner.
+    profile_list bir generator olabilir: detay worker'ları Selenium sayfalamayı
+    beklemeden, sınırlı bir kuyruktan gelen URL'leri işler.
     """
-    profiles = collect_all_profile_urls()
-    print("TOTAL PROFILES:", len(profiles))
+    dead = DeadLetter("turyap", hosts=[urlsplit(BASE).netloc])
+    client = get_client("turyap", headers=HEADERS, pool_size=workers, rate_limit=RATE_LIMIT)
+
+    def pending():
+        for p, u in profile_list:
+            # Önceki run'da güncel olan profiller yeniden çekilmez, satırları taşınır
+            prev = snapshot.fresh(u) if snapshot is not None else None
+            if prev is None:
+                yield p, u
+            else:
+                sink.write({**prev, "page": p})
+
+    def on_result(item, row):
+        sink.write(row)
+        print(
+            f'[{row["page"]}] {row["name"] or "-"} | {row["phone"] or "-"} | {row["email"] or "-"} | {row["profile_url"]}'
+        )
 
-    df = scrape_details_fast(profiles, workers=20)
-    df = df.drop_duplicates(subset=["profile_url"]).sort_values(
-        ["page", "name"], na_position="last"
+    def on_error(item, exc):
+        p, u = item
+        dead.add(u, parse_detail, client, p, u, error=exc)
+
+    run_pipeline(
+        pending(),
+        lambda item: parse_detail(client, *item),
+        on_result,
+        on_error,
+        workers=workers,
+        queue_size=workers * 4,
     )
 
-    os.makedirs(output_dir, exist_ok=True)
+    # Hata verenler için run sonunda tek bir tur daha
+    for row in dead.retry():
+        sink.write(row)
+
+    PROFILE_CACHE.close()
+    print(client.summary())
+    print(PROFILE_CACHE.summary())
+    print(dead.summary())
+    if snapshot is not None:
+        print(snapshot.summary())
+    print(sink.summary())
+    return len(sink)
+
+
+def run(output_dir: str, incremental: bool = False, max_age_days: float = DEFAULT_MAX_AGE_DAYS) -> str:
+    """
+    Scraper çalışır, output_dir içine csv/json kaydeder.
+    Geriye özet bir mesaj döndürür.
+    incremental=True: önceki çıktıda olan ve max_age_days'ten yeni profiller yeniden çekilmez.
+    """
+    snapshot = Snapshot.load(output_dir, "turyap_", max_age_days) if incremental else None
+    # İstemci ve önbellek süreç içinde paylaşılır; özetler bu run'ı göstersin
+    get_client("turyap", headers=HEADERS, rate_limit=RATE_LIMIT).reset_stats()
+    PROFILE_CACHE.reset_stats()
+
     date_str = datetime.now().strftime("%Y-%m-%d")
     out_path = os.path.join(output_dir, f"turyap_{date_str}.csv")
-    df.to_csv(out_path, index=False, encoding="utf-8-sig")
-
-    return f"TOTAL: {len(df)} satır, dosya: {os.path.basename(out_path)}"
+    sink = RowSink(out_path, columns=COLUMNS, encoding="utf-8-sig", postprocess=normalize_frame,
+                   sort_by=("page", "name"))
 
+    try:
+        # Sayfalama ve HTTP detay çekimi aynı anda ilerler (pipeline)
+        total = scrape_details_fast(iter_profile_urls(), sink, workers=20, snapshot=snapshot)
+        print("TOTAL PROFILES:", total)
+        sink.close()
+    finally:
+        sink.abort()
 
+    return f"TOTAL: {total} satır, dosya: {os.path.basename(out_path)}"
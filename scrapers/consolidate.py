@@ -0,0 +1,158 @@
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .columnar import parquet_path, read_table, write_parquet
+from .incremental import SCRAPED_AT
+from .normalize import PHONE_TYPE, normalize_frame
+
+# Bir run klasöründeki (outputs/<tarih>/) tüm firma çıktılarını tek şemada
+# birleştirir ve birden çok franchise'ta görünen danışmanları tekilleştirir.
+# Eşleştirme anahtarları: normalize e-posta ve normalize cep telefonu. Sabit hat
+# ofis numarası olabileceği için (aynı ofisteki herkes) anahtar sayılmaz.
+# Anahtar başına hash index (pd.factorize) kurulur; aynı anahtarı paylaşan satırlar
+# bağlı bileşen etiketinin yayılmasıyla tek kümede toplanır (A~B e-posta, B~C telefon
+# ise A, B, C aynı kişi).
+
+CONSOLIDATED_PREFIX = "consolidated_"
+
+# Dosya öneki -> firma adı
+SOURCES = {
+    "coldwell_banker_": "Coldwell Banker",
+    "remax_": "Remax",
+    "century21_": "Century21",
+    "era_": "ERA",
+    "dialog_latest": "Dialog",
+    "turyap_": "Turyap",
+    "rookz_": "Rozky",
+}
+
+CANONICAL_COLUMNS = [
+    "company", "name", "role", "email", "phone", PHONE_TYPE,
+    "work_phone", "profile_url", SCRAPED_AT, "source_file",
+]
+
+# Firma çıktısındaki kolon -> kanonik kolon
+RENAMES = {"name_alt": "name", "personal_phone": "phone"}
+
+RUN_FOLDER_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def source_of(filename: str):
+    if filename.startswith(CONSOLIDATED_PREFIX) or ".partial." in filename:
+        return None
+    for prefix, company in SOURCES.items():
+        if filename.startswith(prefix):
+            return company
+    return None
+
+
+def to_canonical(df: pd.DataFrame, company: str, source_file: str) -> pd.DataFrame:
+    df = df.rename(columns=RENAMES)
+    if "phone" in df.columns and "work_phone" in df.columns:
+        # Dialog: cep yoksa iş telefonu ana telefon olur
+        df["phone"] = df["phone"].where(df["phone"] != "", df["work_phone"])
+    df = normalize_frame(df)
+    out = pd.DataFrame(index=df.index)
+    for col in CANONICAL_COLUMNS:
+        out[col] = df[col] if col in df.columns else ""
+    out["company"] = company
+    out["source_file"] = source_file
+    return out.fillna("")
+
+
+def load_run_files(run_dir: str):
+    """[(yol, firma), ...] — run_dir'deki tamamlanmış firma çıktıları."""
+    out = []
+    for f in sorted(os.listdir(run_dir)):
+        if not f.lower().endswith(".csv"):
+            continue
+        company = source_of(f)
+        if company is not None:
+            out.append((os.path.join(run_dir, f), company))
+    return out
+
+
+def load_run(run_dir: str) -> pd.DataFrame:
+    frames = []
+    for path, company in load_run_files(run_dir):
+        f = os.path.basename(path)
+        try:
+            df = read_table(path)
+        except (OSError, ValueError, pd.errors.EmptyDataError) as exc:
+            print(f"[consolidate] okunamadı {f}: {exc}")
+            continue
+        frames.append(to_canonical(df, company, f))
+        print(f"[consolidate] {company}: {len(df)} satır ({f})")
+    if not frames:
+        return pd.DataFrame(columns=CANONICAL_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def cluster_ids(df: pd.DataFrame) -> np.ndarray:
+    """Aynı e-posta ya da cep telefonunu paylaşan satırlara aynı küme no'su."""
+    n = len(df)
+    email = df["email"].where(df["email"].str.contains("@", regex=False), "")
+    mobile = df["phone"].where(df[PHONE_TYPE] == "mobile", "")
+
+    keys = []
+    for s in (email, mobile):
+        codes, _ = pd.factorize(s.where(s != ""), use_na_sentinel=True)
+        mask = codes >= 0
+        if mask.any():
+            keys.append((mask, codes[mask]))
+
+    labels = np.arange(n)
+    while True:
+        new = labels.copy()
+        for mask, codes in keys:
+            group_min = pd.Series(new[mask]).groupby(codes).transform("min").to_numpy()
+            new[mask] = np.minimum(new[mask], group_min)
+        # Etiketler küme içindeki en küçük satır no'suna inene kadar yayılır
+        new = new[new]
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def dedupe(df: pd.DataFrame) -> pd.DataFrame:
+    """Kümeyi tek satıra indirir: alanlarda ilk dolu değer, firmalar ve kaynaklar birleştirilir."""
+    if df.empty:
+        return df.assign(companies="", sources=0)
+    df = df.assign(_cluster=cluster_ids(df))
+    g = df.replace("", np.nan).groupby("_cluster", sort=True)
+    merged = g[[c for c in CANONICAL_COLUMNS if c not in ("company", "source_file")]].first()
+    pairs = df[["_cluster", "company"]].drop_duplicates()
+    merged["companies"] = pairs.groupby("_cluster", sort=True)["company"].agg("; ".join)
+    merged["sources"] = g.size()
+    merged.insert(0, "company", g["company"].first())
+    return merged.reset_index(drop=True).fillna("")
+
+
+def consolidate(run_dir: str) -> str:
+    """run_dir'deki firma çıktılarını birleştirip consolidated_<tarih>.csv yazar; yolu döner."""
+    df = load_run(run_dir)
+    merged = dedupe(df)
+
+    date_str = os.path.basename(os.path.normpath(run_dir))
+    if not RUN_FOLDER_RE.fullmatch(date_str):
+        date_str = datetime.now().strftime("%Y-%m-%d")
+    out_path = os.path.join(run_dir, f"{CONSOLIDATED_PREFIX}{date_str}.csv")
+    tmp = out_path + ".tmp"
+    merged.to_csv(tmp, index=False, encoding="utf-8-sig")
+    os.replace(tmp, out_path)
+    write_parquet(merged, parquet_path(out_path))
+
+    print(
+        f"[consolidate] {len(df)} satır -> {len(merged)} danışman "
+        f"({len(df) - len(merged)} tekrar birleştirildi)"
+    )
+    return out_path
+
+
+def run(output_dir: str) -> str:
+    out_path = consolidate(output_dir)
+    return f"birleşik dosya: {os.path.basename(out_path)}"
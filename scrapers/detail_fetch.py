@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from .cancel import propagate
+
+# Host başına aynı anda açık detay isteği sayısı (site modülleri override edebilir)
+DEFAULT_PER_HOST = 8
+
+
+class DetailFetcher:
+    """
+    Bir listeleme sayfasındaki tüm profil URL'lerini paralel çeker.
+    Host başına eşzamanlılık semaphore ile sınırlandırılır; sonuçlar
+    girdi sırasıyla döner, böylece CSV satır sırası değişmez.
+    fn, map()'i çağıranın run bağlamıyla (iptal, log) çalışır.
+    """
+
+    def __init__(self, max_per_host: int = DEFAULT_PER_HOST, max_workers: int = None):
+        self.max_per_host = max(1, int(max_per_host))
+        self.max_workers = max_workers or self.max_per_host
+        self._sems = {}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def __enter__(self):
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _sem_for(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.max_per_host)
+                self._sems[host] = sem
+            return sem
+
+    def _call(self, fn, url):
+        with self._sem_for(url):
+            return fn(url)
+
+    def map(self, fn, urls, return_exceptions: bool = False):
+        """
+        fn(url) her URL için paralel çağrılır. Sonuç listesi urls ile aynı sıradadır.
+        fn içindeki hata, ilgili sonuca sıra geldiğinde yeniden fırlatılır;
+        return_exceptions=True ise hata nesnesi sonuç olarak döner.
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        if self._pool is None:
+            with self:
+                return self.map(fn, urls, return_exceptions=return_exceptions)
+        call = propagate(self._call)
+        futs = [self._pool.submit(call, fn, u) for u in urls]
+        if not return_exceptions:
+            return [f.result() for f in futs]
+        return [f.exception() or f.result() for f in futs]
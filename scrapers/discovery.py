@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .cancel import propagate
+
+# URL ile adreslenebilen sayfalayıcılar için son sayfa keşfi.
+# Önce üstel (1, 2, 4, 8, ...) sonra ikili arama ile ilk boş sayfa bulunur;
+# ardından tüm listeleme sayfaları rate limiter altında paralel çekilir.
+# Sondaki boş sayfadan önceki sayfaların dolu olduğu varsayılır.
+
+
+def find_last_page(fetch, max_page: int, start: int = 1):
+    """
+    fetch(page) -> o sayfanın kayıt listesi (boşsa sayfa yok demektir).
+    Dönüş: (son dolu sayfa, {sayfa: sonuç}) — prob edilen sayfalar tekrar çekilmesin diye.
+    Hiç dolu sayfa yoksa son sayfa start - 1 olur.
+    """
+    probed = {}
+
+    def has_items(page):
+        if page not in probed:
+            probed[page] = fetch(page)
+        return bool(probed[page])
+
+    if not has_items(start):
+        return start - 1, probed
+
+    lo, step = start, 1
+    hi = None
+    while hi is None:
+        nxt = min(start + step, max_page)
+        if has_items(nxt):
+            lo = nxt
+            if nxt == max_page:
+                return max_page, probed
+            step *= 2
+        else:
+            hi = nxt
+
+    # lo dolu, hi boş: aradaki sınır ikili arama ile bulunur
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if has_items(mid):
+            lo = mid
+        else:
+            hi = mid
+
+    print(f"[discovery] son sayfa: {lo} ({len(probed)} prob)")
+    return lo, probed
+
+
+def iter_pages(fetch, pages, workers: int = 8, known: dict = None):
+    """
+    Sayfaları paralel çeker, tamamlandıkça (sayfa, sonuç, hata) üretir.
+    known içindeki (prob sırasında çekilmiş) sayfalar tekrar istenmez.
+    fetch havuz thread'lerinde çağıranın run bağlamıyla çalışır.
+    """
+    known = known or {}
+    pages = list(pages)
+    for page in pages:
+        if page in known:
+            yield page, known[page], None
+
+    todo = [p for p in pages if p not in known]
+    if not todo:
+        return
+    ex = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        fetch = propagate(fetch)
+        futs = {ex.submit(fetch, p): p for p in todo}
+        for f in as_completed(futs):
+            exc = f.exception()
+            yield futs[f], (None if exc else f.result()), exc
+    finally:
+        # Tüketici erken bırakırsa (iptal/hata) henüz başlamamış sayfalar istenmez
+        ex.shutdown(wait=True, cancel_futures=True)
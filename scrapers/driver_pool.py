@@ -0,0 +1,106 @@
+import threading
+from functools import partial
+
+from .browser import healthy
+from .pipeline import run_pipeline
+
+# Selenium sayfaları için sınırlı WebDriver havuzu.
+# Her worker thread'i kendi tarayıcısını tutar (WebDriver thread-safe değildir);
+# iş listesi run_pipeline üzerinden N tarayıcıya dağıtılır, sonuç callback'leri
+# çağıran thread'de çalışır. Tarayıcı K sayfada bir kapatılıp yeniden açılır
+# (Chrome'un bellek büyümesi sınırlanır); çöken tarayıcı yeniden açılır ve
+# o iş bir kez daha denenir.
+
+DEFAULT_POOL_SIZE = 3
+DEFAULT_RECYCLE_AFTER = 50
+
+
+class DriverPool:
+    """
+    factory() -> yeni WebDriver. size: eşzamanlı tarayıcı sayısı (CPU/RAM'e göre).
+    recycle_after: bir tarayıcının kapatılmadan önce açacağı en fazla sayfa.
+    """
+
+    def __init__(self, factory, size: int = DEFAULT_POOL_SIZE, recycle_after: int = DEFAULT_RECYCLE_AFTER):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.recycle_after = recycle_after
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._drivers = set()
+        self.started = 0
+        self.recycled = 0
+        self.restarted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start(self):
+        driver = self.factory()
+        with self._lock:
+            self._drivers.add(driver)
+            self.started += 1
+        self._local.driver = driver
+        self._local.pages = 0
+        return driver
+
+    def _stop(self):
+        driver = getattr(self._local, "driver", None)
+        self._local.driver = None
+        if driver is None:
+            return
+        with self._lock:
+            self._drivers.discard(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def driver(self):
+        """Çağıran thread'in tarayıcısı; yoksa ya da süresi dolduysa yenisi açılır."""
+        driver = getattr(self._local, "driver", None)
+        if driver is not None and self.recycle_after and self._local.pages >= self.recycle_after:
+            self._stop()
+            with self._lock:
+                self.recycled += 1
+            driver = None
+        return driver or self._start()
+
+    def call(self, fn, item):
+        """fn(driver, item); tarayıcı çökmüşse yeniden açıp bir kez daha dener."""
+        driver = self.driver()
+        try:
+            result = fn(driver, item)
+        except Exception:
+            if healthy(driver):
+                raise
+            self._stop()
+            with self._lock:
+                self.restarted += 1
+            driver = self._start()
+            result = fn(driver, item)
+        self._local.pages += 1
+        return result
+
+    def map(self, fn, items, on_result, on_error=None):
+        """items'ı tarayıcılara dağıtır; on_result(item, sonuç) çağıran thread'de çalışır."""
+        run_pipeline(items, partial(self.call, fn), on_result, on_error, workers=self.size)
+
+    def close(self):
+        with self._lock:
+            drivers = list(self._drivers)
+            self._drivers.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def summary(self) -> str:
+        return (
+            f"[driver-pool] boyut={self.size} | açılan={self.started} | "
+            f"yenilenen={self.recycled} | çöküp yeniden açılan={self.restarted}"
+        )
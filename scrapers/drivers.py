@@ -0,0 +1,239 @@
+import atexit
+import os
+import shutil
+import socket
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from .browser import apply_fast_options, block_resources, healthy
+
+# Süreç içinde paylaşılan Chrome/chromedriver yönetimi.
+# - chromedriver yolu süreç başına bir kez çözülür (env > PATH > webdriver-manager);
+#   webdriver-manager'ın her run'daki sürüm kontrolü/indirmesi tekrarlanmaz.
+# - Her tarayıcı boş bir remote-debugging portu alır; eşzamanlı run'lar çakışmaz.
+# - Bir "sıcak" headless tarayıcı açık tutulur ve ödünç verilir; ödünç alınırken
+#   sağlık kontrolü yapılır, cevap vermiyorsa yenisi açılır. Sıcak tarayıcı
+#   kullanımdaysa ödünç alan geçici yeni bir tarayıcı alır.
+# - Süreç kapanırken (atexit) sıcak tarayıcı kapatılır.
+
+_resolve_lock = threading.Lock()
+_chromedriver_path = None
+
+# free_port() ile Chrome'un portu bağlaması arasında port başka bir süreçe
+# geçebilir; açılış bu kadar kez yeni portla denenir
+LAUNCH_ATTEMPTS = 3
+
+
+def resolve_chromedriver() -> str:
+    global _chromedriver_path
+    with _resolve_lock:
+        if _chromedriver_path is None:
+            path = os.environ.get("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
+            if not path:
+                try:
+                    from webdriver_manager.chrome import ChromeDriverManager
+                except ImportError:
+                    raise RuntimeError(
+                        "chromedriver bulunamadı. CHROMEDRIVER_PATH verin ya da webdriver-manager kurun."
+                    )
+                path = ChromeDriverManager().install()
+            _chromedriver_path = path
+        return _chromedriver_path
+
+
+def resolve_chrome_binary():
+    return (
+        os.environ.get("CHROME_BIN")
+        or shutil.which("chromium-browser")
+        or shutil.which("chromium")
+        or shutil.which("google-chrome")
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def chrome_options(headless: bool = True) -> Options:
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+
+    # GitHub Actions / Linux için kritik flag'ler
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1400,900")
+    options.add_argument(f"--remote-debugging-port={free_port()}")
+
+    prefs = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+    }
+    options.add_experimental_option("prefs", prefs)
+    apply_fast_options(options)
+
+    chrome_bin = resolve_chrome_binary()
+    if chrome_bin:
+        options.binary_location = chrome_bin
+    return options
+
+
+def new_driver(headless: bool = True, allow=()):
+    """Yeni Chrome; URL engelleme allow izin listesiyle uygulanır. Açılamazsa yeni portla tekrar denenir."""
+    for attempt in range(1, LAUNCH_ATTEMPTS + 1):
+        try:
+            driver = webdriver.Chrome(service=Service(resolve_chromedriver()), options=chrome_options(headless))
+            break
+        except WebDriverException as exc:
+            if attempt == LAUNCH_ATTEMPTS:
+                raise
+            print(f"[drivers] tarayıcı açılamadı ({attempt}/{LAUNCH_ATTEMPTS}), yeni portla deneniyor: {exc.msg}")
+    return block_resources(driver, allow)
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class DriverManager:
+    """Sıcak tarayıcıyı tutar ve ödünç verir; bkz. modül açıklaması."""
+
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self._lock = threading.Lock()
+        self._warm = None
+        self._lent = False
+        self._warming = None
+        self._closed = False
+        self.lent = 0
+        self.fresh = 0
+        self.replaced = 0
+
+    def warm_up(self, background: bool = True):
+        """Sıcak tarayıcıyı (yoksa) açar; background=True ise beklemeden döner."""
+        if background:
+            with self._lock:
+                if self._warming is not None and self._warming.is_alive():
+                    return
+                self._warming = threading.Thread(target=self._ensure_warm, name="driver-warmup", daemon=True)
+                self._warming.start()
+            return
+        self._ensure_warm()
+
+    def _ensure_warm(self):
+        with self._lock:
+            if self._warm is not None or self._lent or self._closed:
+                return
+        try:
+            driver = new_driver(self.headless)
+        except Exception as exc:
+            print(f"[drivers] sıcak tarayıcı açılamadı: {exc}")
+            return
+        with self._lock:
+            if self._warm is None and not self._lent and not self._closed:
+                self._warm = driver
+                return
+        _quit(driver)
+
+    def _take_warm(self):
+        if self._warming is not None:
+            self._warming.join()
+        with self._lock:
+            if self._lent:
+                return None
+            driver = self._warm
+            self._lent = True
+        if driver is not None and not healthy(driver):
+            _quit(driver)
+            with self._lock:
+                self.replaced += 1
+            driver = None
+        if driver is None:
+            try:
+                driver = new_driver(self.headless)
+            except Exception:
+                with self._lock:
+                    self._lent = False
+                raise
+        with self._lock:
+            self._warm = driver
+        return driver
+
+    def _give_back(self, driver):
+        ok = False
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            ok = True
+        except Exception:
+            pass
+        with self._lock:
+            self._lent = False
+            if not ok:
+                self.replaced += 1
+                if self._warm is driver:
+                    self._warm = None
+        if not ok:
+            _quit(driver)
+
+    @contextmanager
+    def borrow(self, allow=()):
+        """
+        Sıcak tarayıcıyı ödünç verir (site izin listesi uygulanmış olarak).
+        Sıcak tarayıcı meşgulse geçici bir tarayıcı açılır ve sonunda kapatılır.
+        """
+        driver = self._take_warm()
+        if driver is not None:
+            with self._lock:
+                self.lent += 1
+            block_resources(driver, allow)
+            try:
+                yield driver
+            finally:
+                self._give_back(driver)
+            return
+
+        with self._lock:
+            self.fresh += 1
+        driver = new_driver(self.headless, allow)
+        try:
+            yield driver
+        finally:
+            _quit(driver)
+
+    def close(self):
+        """Sıcak tarayıcıyı kapatır; sonradan biten ısınma tarayıcıyı tutmaz."""
+        with self._lock:
+            self._closed = True
+            driver, self._warm = self._warm, None
+        if driver is not None:
+            _quit(driver)
+
+    def summary(self) -> str:
+        return f"[drivers] ödünç={self.lent} | geçici={self.fresh} | yenilenen={self.replaced}"
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager() -> DriverManager:
+    """Süreç içinde tekil DriverManager."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = DriverManager()
+            atexit.register(_manager.close)
+        return _manager
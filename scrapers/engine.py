@@ -0,0 +1,364 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+from lxml import etree
+
+from .detail_fetch import DetailFetcher
+from .discovery import find_last_page, iter_pages
+from .extract import (
+    PARSER_VERSION,
+    first_mailto,
+    first_tel,
+    href_or_text,
+    parse_response,
+    search_subtree,
+    text_xpath,
+    xtext,
+)
+from .http_cache import ResponseCache
+from .http_client import get_client
+from .incremental import DEFAULT_MAX_AGE_DAYS, SCRAPED_AT, Snapshot, today
+from .cancel import checkpoint
+from .journal import RunJournal
+from .normalize import normalize_frame
+from .retry import DeadLetter
+from .sink import RowSink
+
+# Sayfalı (URL ile adreslenen) danışman listeleri için ortak tarama motoru.
+# Site modülleri sadece bir SiteConfig tanımlar; keşif, paralel listeleme,
+# detay çekimi, önbellek, günlük, artımlı mod ve akış çıktısı burada tek yerde.
+#
+# Alan çıkarıcılar node -> str fonksiyonlarıdır: card_fields kart elemanına,
+# profile_fields profil sayfasının ağacına uygulanır. profile_fields boşsa
+# detay sayfasına hiç gidilmez (Remax gibi bilgisi kartta olan siteler).
+# Çıkarıcılar tanımlarını signature olarak taşır; profil önbelleğinin sürümü
+# bunlardan türetilir, site tanımı değişince eski önbellek kayıtları kullanılmaz.
+
+Extractor = Callable[[etree._Element], Optional[str]]
+
+
+# ---------------------------------------------------------------------------
+# Alan çıkarıcılar
+# ---------------------------------------------------------------------------
+
+def _signed(fn, sig: str) -> Extractor:
+    fn.signature = sig
+    return fn
+
+
+def signature(fn: Extractor) -> str:
+    """Çıkarıcının tanımı (fabrika ve argümanları); fabrikasız fonksiyonlarda adı."""
+    return getattr(fn, "signature", None) or f"{fn.__module__}.{fn.__qualname__}"
+
+
+def text(expr: str) -> Extractor:
+    """string(expr) metni."""
+    compiled = text_xpath(expr)
+    return _signed(lambda node: xtext(node, compiled), f"text({expr!r})")
+
+
+def first(expr: str) -> Extractor:
+    """İlk eşleşmenin metni; eşleşme yoksa None."""
+    compiled = etree.XPath(expr)
+
+    def extract(node):
+        res = compiled(node)
+        if not res:
+            return None
+        # res[0] element de olabilir string de
+        if hasattr(res[0], "text_content"):
+            return res[0].text_content().strip()
+        return str(res[0]).strip()
+
+    return _signed(extract, f"first({expr!r})")
+
+
+def link(expr: str, scheme: str) -> Extractor:
+    """İlk <a> eşleşmesinin şemasız href'i (tel:/mailto:) ya da metni."""
+    compiled = etree.XPath(expr)
+
+    def extract(node):
+        nodes = compiled(node)
+        return href_or_text(nodes[0], scheme) if nodes else ""
+
+    return _signed(extract, f"link({expr!r}, {scheme!r})")
+
+
+def mailto() -> Extractor:
+    return first_mailto
+
+
+def tel() -> Extractor:
+    return first_tel
+
+
+def regex(expr: str, pattern) -> Extractor:
+    """Regex'i sadece expr alt ağaç(lar)ında arar."""
+    compiled = etree.XPath(expr)
+    return _signed(lambda node: search_subtree(compiled(node), pattern), f"regex({expr!r}, {pattern.pattern!r})")
+
+
+def any_of(*extractors: Extractor) -> Extractor:
+    """Boş olmayan ilk sonucu döner."""
+
+    def extract(node):
+        value = None
+        for fn in extractors:
+            value = fn(node)
+            if value:
+                return value
+        return value
+
+    return _signed(extract, f"any_of({', '.join(signature(fn) for fn in extractors)})")
+
+
+# ---------------------------------------------------------------------------
+# Site tanımı
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SiteConfig:
+    """
+    name: istemci/önbellek/günlük adı ve çıktı dosyası öneki (<name>_<tarih>.csv).
+    list_url: "{page}" içeren listeleme adresi; first_page_url verilirse 1. sayfa için o kullanılır.
+    cards: listeleme sayfasındaki kart elemanlarının XPath'i; profile_link kart içinde relative.
+    rate_limit: başlangıç hızı (istek/sn) ve tavanı; limiter gecikme ve 429/503'e göre uyarlar.
+    concurrency: host başına paralel istek (listeleme ve detay için ortak bütçe); limiter'ın
+    max_concurrency'si olur, worker sayısı ne olursa olsun host'a bundan fazla istek gitmez.
+    cache_version: çıkarıcı tanımı aynı kalıp davranışı değişirse (ör. ortak yardımcı) artırılır;
+    profil önbelleğinin sürümüne katılır.
+    sort_by: nihai dosyanın sıralandığı kolonlar; sayfalar tamamlanma sırasıyla yazılır (bkz. RowSink).
+    """
+
+    name: str
+    base: str
+    list_url: str
+    cards: str
+    card_fields: Dict[str, Extractor] = field(default_factory=dict)
+    profile_fields: Dict[str, Extractor] = field(default_factory=dict)
+    profile_link: str = "@href"
+    first_page_url: Optional[str] = None
+    headers: Optional[dict] = None
+    timeout: float = 20
+    rate_limit: dict = field(default_factory=lambda: {"rate": 4.0, "max_rate": 20.0})
+    concurrency: int = 8
+    max_pages: int = 327
+    start_page: int = 1
+    columns: Optional[List[str]] = None
+    encoding: str = "utf-8"
+    cache_version: str = ""
+    sort_by: tuple = ("page",)
+
+    def __post_init__(self):
+        self._cards = etree.XPath(self.cards)
+        self._link = etree.XPath(self.profile_link)
+        if self.columns is None:
+            self.columns = ["page", *self.card_fields, *self.profile_fields, "profile_url", SCRAPED_AT]
+        # Profil sayfaları koşullu GET ile önbellekten doğrulanır
+        self.cache = ResponseCache(self.name, version=self.parser_version()) if self.profile_fields else None
+
+    def parser_version(self) -> str:
+        """profile_fields tanımı + PARSER_VERSION + cache_version özeti."""
+        spec = [PARSER_VERSION, self.cache_version, sorted((k, signature(fn)) for k, fn in self.profile_fields.items())]
+        return hashlib.sha1(json.dumps(spec).encode("utf-8")).hexdigest()[:12]
+
+    def page_url(self, page: int) -> str:
+        if page == 1 and self.first_page_url:
+            return self.first_page_url
+        return self.list_url.format(page=page)
+
+    def client(self, concurrency: int = None):
+        concurrency = concurrency or self.concurrency
+        return get_client(
+            self.name,
+            headers=self.headers,
+            pool_size=concurrency,
+            timeout=self.timeout,
+            rate_limit={**self.rate_limit, "max_concurrency": concurrency},
+        )
+
+
+# ---------------------------------------------------------------------------
+# Tarama
+# ---------------------------------------------------------------------------
+
+def fetch_listing(site: SiteConfig, client, page: int):
+    """Kartlardan {page, kart alanları, profile_url} satırları."""
+    r = client.get(site.page_url(page), timeout=site.timeout)
+    r.raise_for_status()
+    tree = parse_response(r)
+
+    listed = []
+    for card in site._cards(tree):
+        row = {"page": page}
+        for key, fn in site.card_fields.items():
+            row[key] = fn(card)
+        href = site._link(card)
+        row["profile_url"] = urljoin(site.base, href[0]) if href else None
+        listed.append(row)
+    return listed
+
+
+def parse_profile(site: SiteConfig, r):
+    tree = parse_response(r)
+    return {key: fn(tree) for key, fn in site.profile_fields.items()}
+
+
+def fetch_profile(site: SiteConfig, client, profile_url: str):
+    # Eski formatta ya da başka profile_fields ile yazılmış kayıtlar sürüm farkından yok sayılır
+    return site.cache.fetch(client, profile_url, partial(parse_profile, site), timeout=site.timeout)
+
+
+def make_row(listed: dict, fields: dict = None, scraped_at: str = None):
+    row = dict(listed)
+    if fields:
+        row.update(fields)
+    row[SCRAPED_AT] = scraped_at or today()
+    return row
+
+
+def scrape_page(site: SiteConfig, client, fetcher, dead, listed, snapshot=None, seen=None, failed=None):
+    """
+    Sayfadaki profilleri paralel çeker; hata verenler dead-letter'a gider
+    (failed listesi verilirse kart satırları oraya da eklenir, günlük için).
+    snapshot verilirse güncel kayıtlar önceki run'dan taşınır, sadece kalanlar çekilir.
+    seen: önceki sayfalarda görülen profile_url'ler; tekrarları yeniden çekilmez.
+    """
+    if not site.profile_fields:
+        return [make_row(row) for row in listed]
+
+    slots = [None] * len(listed)
+    todo = []
+    for i, row in enumerate(listed):
+        url = row["profile_url"]
+        if not url:
+            slots[i] = make_row(row)
+            continue
+        if seen is not None:
+            if url in seen:
+                continue
+            seen.add(url)
+        prev = snapshot.fresh(url) if snapshot else None
+        if prev is None:
+            todo.append(i)
+        else:
+            fields = {key: prev.get(key, "") for key in site.profile_fields}
+            slots[i] = make_row(row, fields, prev[SCRAPED_AT])
+
+    details = fetcher.map(
+        partial(fetch_profile, site, client), [listed[i]["profile_url"] for i in todo], return_exceptions=True
+    )
+    for i, detail in zip(todo, details):
+        row = listed[i]
+        if isinstance(detail, Exception):
+            dead.add(row["profile_url"], retry_profile, site, client, row, error=detail)
+            if failed is not None:
+                failed.append(row)
+            continue
+        slots[i] = make_row(row, detail)
+    return [row for row in slots if row is not None]
+
+
+def retry_profile(site: SiteConfig, client, listed: dict):
+    return [make_row(listed, fetch_profile(site, client, listed["profile_url"]))]
+
+
+def retry_page(site: SiteConfig, client, fetcher, dead, page, snapshot=None, seen=None):
+    listed = fetch_listing(site, client, page)
+    return scrape_page(site, client, fetcher, dead, listed, snapshot, seen)
+
+
+def run(site: SiteConfig, output_dir: str, detail_concurrency: int = None, incremental: bool = False,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS) -> str:
+    """
+    Siteyi tarar, output_dir içine <name>_<tarih>.csv kaydeder; özet mesaj döner.
+    detail_concurrency: host başına paralel istek (varsayılan site.concurrency).
+    Hata veren sayfa/profiller run sonunda bir kez daha denenir; kalanlar atlanır.
+    incremental=True: önceki çıktıda olan ve max_age_days'ten yeni profiller yeniden çekilmez.
+    İlerleme outputs/<tarih>/.state/ altındaki günlüğe yazılır; yarıda kalan run devam eder.
+    """
+    concurrency = detail_concurrency or site.concurrency
+    client = site.client(concurrency)
+    # İstemci ve önbellek süreç içinde paylaşılır; özetler bu run'ı göstersin
+    client.reset_stats()
+    if site.cache is not None:
+        site.cache.reset_stats()
+    dead = DeadLetter(site.name, hosts={urlsplit(site.base).netloc, urlsplit(site.list_url).netloc})
+    journal = RunJournal(output_dir, site.name)
+    snapshot = None
+    if incremental and site.profile_fields:
+        snapshot = Snapshot.load(output_dir, f"{site.name}_", max_age_days)
+
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    out_path = os.path.join(output_dir, f"{site.name}_{date_str}.csv")
+    sink = RowSink(out_path, columns=site.columns, encoding=site.encoding, postprocess=normalize_frame,
+                   sort_by=site.sort_by)
+    seen = set()
+
+    def save_page(page, page_rows, failed):
+        journal.page_done(page, page_rows, failed)
+        sink.extend(page_rows)
+
+    # İptal/hata olursa dosyalar kapanır; .partial ve günlük yerinde kalır, run devam ettirilebilir
+    try:
+        seen.update(row.get("profile_url") for row in journal.rows)
+        journal.replay(sink)
+        # Önceki run'da dead-letter'da kalan profiller (tekrar denenmeden kesilmiş) yeniden kuyruğa
+        for listed in journal.pending:
+            seen.add(listed["profile_url"])
+            dead.add(listed["profile_url"], retry_profile, site, client, listed, error="önceki run'da çekilemedi")
+
+        fetch = partial(fetch_listing, site, client)
+
+        with DetailFetcher(max_per_host=concurrency) as fetcher:
+            if journal.end_page is None:
+                try:
+                    last, probed = find_last_page(fetch, site.max_pages, start=site.start_page)
+                except Exception as exc:
+                    print(f"[discovery] son sayfa bulunamadı, üst sınır kullanılıyor: {exc}")
+                    last, probed = site.max_pages, {}
+                else:
+                    journal.mark_end(last + 1)
+            else:
+                last, probed = journal.end_page - 1, {}
+
+            # Listeleme sayfaları paralel çekilir; her sayfanın profilleri geldikçe işlenir
+            pages = [p for p in range(site.start_page, last + 1) if p not in journal.pages]
+            for page, listed, exc in iter_pages(fetch, pages, workers=concurrency, known=probed):
+                checkpoint()
+                if exc is not None:
+                    dead.add(("page", page), retry_page, site, client, fetcher, dead, page, snapshot, seen, error=exc)
+                    continue
+
+                print(f"page {page}: cards={len(listed or [])}")
+                if not listed:
+                    continue
+
+                failed = []
+                save_page(page, scrape_page(site, client, fetcher, dead, listed, snapshot, seen, failed), failed)
+
+            for extra in dead.retry():
+                journal.add_rows(extra)
+                sink.extend(extra)
+
+        print(client.summary())
+        if site.cache is not None:
+            site.cache.close()
+            print(site.cache.summary())
+        print(dead.summary())
+        if snapshot is not None:
+            print(snapshot.summary())
+        print(sink.summary())
+        sink.close()
+        journal.finish()
+    finally:
+        sink.abort()
+        journal.close()
+
+    return f"TOTAL: {len(sink)} satır, dosya: {os.path.basename(out_path)}"
@@ -0,0 +1,138 @@
+import re
+import threading
+
+from lxml import etree, html
+
+# Paylaşılan, önceden derlenmiş çıkarım katmanı.
+# - Gövde str'e çevrilmeden r.content (bytes) üzerinden parse edilir; karakter
+#   seti HTTP başlığında varsa parser'a verilir, yoksa lxml <meta charset>'a bakar.
+# - XPath ifadeleri modül yüklenirken bir kez etree.XPath ile derlenir.
+# - Regex yedekleri tüm belge yerine sadece ilgili alt ağaçta çalışır.
+
+_local = threading.local()
+
+XP_MAILTO = etree.XPath('//a[starts-with(@href,"mailto:")]/@href')
+XP_TEL = etree.XPath('//a[starts-with(@href,"tel:")]/@href')
+
+EMAIL_RE = re.compile(r"[\w.-]+@[\w.-]+\.\w+")
+
+# Bu modüldeki çıkarım kurallarının sürümü; davranış değişince artırılır.
+# Profil önbelleği parse sonucunu bu sürümle saklar (bkz. http_cache).
+PARSER_VERSION = "1"
+
+
+def _parser(encoding: str = None) -> html.HTMLParser:
+    # lxml parser nesneleri thread'ler arasında paylaşılmamalı
+    parsers = getattr(_local, "parsers", None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+    p = parsers.get(encoding)
+    if p is None:
+        p = parsers[encoding] = html.HTMLParser(encoding=encoding)
+    return p
+
+
+def response_encoding(r):
+    """Sadece Content-Type'ta açıkça belirtilen charset; requests'in ISO-8859-1 varsayılanı değil."""
+    if "charset" in (r.headers.get("Content-Type") or "").lower():
+        return r.encoding
+    return None
+
+
+def parse_bytes(content: bytes, encoding: str = None):
+    return html.document_fromstring(content, parser=_parser(encoding))
+
+
+def parse_response(r):
+    return parse_bytes(r.content, response_encoding(r))
+
+
+def text_xpath(expr: str) -> etree.XPath:
+    """string(expr) ifadesini derler; sonucu str döner."""
+    return etree.XPath(f"string({expr})")
+
+
+def xtext(tree, compiled: etree.XPath) -> str:
+    return (compiled(tree) or "").strip()
+
+
+def first_mailto(tree):
+    for h in XP_MAILTO(tree):
+        v = h.replace("mailto:", "").strip()
+        if "@" in v and not v.startswith("?"):
+            return v
+    return None
+
+
+def first_tel(tree):
+    for h in XP_TEL(tree):
+        v = h.replace("tel:", "").strip()
+        if v:
+            return v
+    return None
+
+
+def href_or_text(node, scheme: str) -> str:
+    """<a href="tel:..."> / "mailto:" ise şemasız href'i, değilse metni döner."""
+    href = (node.get("href") or "").strip()
+    if href.lower().startswith(scheme):
+        return href[len(scheme):].strip()
+    return (node.text_content() or "").strip()
+
+
+def search_subtree(nodes, pattern: re.Pattern):
+    """Regex'i verilen alt ağaç(lar)ın metni ve href'lerinde arar."""
+    for node in nodes:
+        # Metin düğümleri ayrı ayrı aranır; text_content() komşu düğümleri
+        # ayraçsız birleştirip "33ali@..." gibi sahte eşleşmeler üretir
+        texts = list(node.itertext())
+        texts.extend(a.get("href") or "" for a in node.iter("a"))
+        for t in texts:
+            m = pattern.search(t)
+            if m:
+                return m.group(0)
+    return None
+
+
+def _bench(n: int = 2000):
+    """Profil sayfası başına parse maliyetini eski ve yeni yöntemle ölçer."""
+    import timeit
+
+    cards = "".join(
+        f'<li><a href="/danismanlar/{i}"><h2>Danışman {i}</h2></a><span>0212 555 00 {i:02d}</span></li>'
+        for i in range(80)
+    )
+    page = (
+        '<html><head><meta charset="utf-8"><script>var x = 1;</script></head><body>'
+        f"<header><nav><ul>{cards}</ul></nav></header>"
+        '<section><aside><h3>Ayşe Yılmaz</h3><ul><li>Ofis</li>'
+        '<li><a href="tel:+905321112233"><span>0532 111 22 33</span></a></li>'
+        '<li><a href="mailto:ayse@ornek.com.tr">ayse@ornek.com.tr</a></li></ul></aside></section>'
+        f"<footer>{cards}</footer></body></html>"
+    )
+    body = page.encode("utf-8")
+
+    def old():
+        tree = html.fromstring(body.decode("utf-8"))
+        tree.xpath('//a[starts-with(@href,"mailto:")]/@href')
+        tree.xpath('//a[starts-with(@href,"tel:")]/@href')
+        tree.xpath("string(//aside//h3[1])")
+        re.search(r"[\w\.-]+@[\w\.-]+\.\w+", html.tostring(tree, encoding="unicode"))
+
+    aside = etree.XPath("//aside")
+    name = text_xpath("//aside//h3[1]")
+
+    def new():
+        tree = parse_bytes(body, "utf-8")
+        first_mailto(tree)
+        first_tel(tree)
+        xtext(tree, name)
+        search_subtree(aside(tree), EMAIL_RE)
+
+    for label, fn in (("eski", old), ("yeni", new)):
+        t = timeit.timeit(fn, number=n)
+        print(f"{label}: {t / n * 1e6:.1f} µs/sayfa")
+
+
+if __name__ == "__main__":
+    _bench()
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Profil sayfaları için diskte kalıcı cevap önbelleği.
+# URL başına bir JSON dosyası tutulur: ETag/Last-Modified, gövde hash'i ve
+# parse sonucu. Sonraki run'da koşullu GET gönderilir; 304 gelirse ya da
+# gövde hash'i aynıysa sayfa yeniden parse edilmez.
+# Kayıtlar ayrıştırıcı sürümüyle (version) saklanır; çıkarım kuralları değişince
+# sürüm de değişir ve eski sürümlü kayıtlar yok sayılır (koşulsuz GET + parse).
+
+CACHE_DIR = os.environ.get(
+    "SCRAPER_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "http"),
+)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+EVICT_EVERY = 500
+
+
+class ResponseCache:
+    """
+    Site başına önbellek. max_bytes aşıldığında en uzun süredir kullanılmayan
+    (mtime'ı en eski) kayıtlar silinir; her isabet dosyanın mtime'ını yeniler.
+    """
+
+    def __init__(self, name: str, root: str = None, max_bytes: int = DEFAULT_MAX_BYTES, version: str = ""):
+        self.name = name
+        self.version = version
+        self.dir = os.path.join(root or CACHE_DIR, name)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.not_modified = 0
+        self.same_body = 0
+        self.misses = 0
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str):
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url or entry.get("version", "") != self.version:
+            return None
+        return entry
+
+    def put(self, url: str, etag, last_modified, body_hash: str, result):
+        os.makedirs(self.dir, exist_ok=True)
+        path = self._path(url)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        entry = {
+            "url": url,
+            "version": self.version,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body_hash": body_hash,
+            "result": result,
+            "stored_at": time.time(),
+        }
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._puts += 1
+            evict = self._puts % EVICT_EVERY == 0
+        if evict:
+            self.evict()
+
+    def _touch(self, url: str):
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def discard(self, url: str):
+        """Kaydı siler; sonraki fetch koşulsuz GET yapar."""
+        try:
+            os.remove(self._path(url))
+        except OSError:
+            pass
+
+    def evict(self):
+        """Toplam boyut max_bytes altına inene kadar en eski kayıtları siler."""
+        try:
+            entries = [e for e in os.scandir(self.dir) if e.name.endswith(".json")]
+        except FileNotFoundError:
+            return
+        stats = []
+        for e in entries:
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            stats.append((st.st_mtime, st.st_size, e.path))
+        total = sum(s[1] for s in stats)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(stats):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def fetch(self, client, url: str, parse, **kwargs):
+        """
+        Koşullu GET yapar. parse(response) sonucu JSON'a çevrilebilir olmalı.
+        304 veya aynı gövde hash'inde önbellekteki parse sonucu döner.
+        """
+        entry = self.get(url)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        r = client.get(url, headers=headers, **kwargs)
+        if r.status_code == 304 and entry:
+            with self._lock:
+                self.not_modified += 1
+            self._touch(url)
+            return entry["result"]
+        r.raise_for_status()
+
+        body_hash = hashlib.sha1(r.content).hexdigest()
+        etag = r.headers.get("ETag")
+        last_modified = r.headers.get("Last-Modified")
+        if entry and entry.get("body_hash") == body_hash:
+            with self._lock:
+                self.same_body += 1
+            result = entry["result"]
+        else:
+            with self._lock:
+                self.misses += 1
+            result = parse(r)
+        self.put(url, etag, last_modified, body_hash, result)
+        return result
+
+    def reset_stats(self):
+        """Sayaçları sıfırlar; run başında çağrılır (önbellek nesnesi süreç boyunca yaşar)."""
+        with self._lock:
+            self.not_modified = self.same_body = self.misses = 0
+
+    def close(self):
+        self.evict()
+
+    def summary(self) -> str:
+        return (
+            f"[cache:{self.name}] 304={self.not_modified} | aynı-gövde={self.same_body} | "
+            f"yeni={self.misses}"
+        )
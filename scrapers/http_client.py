@@ -0,0 +1,217 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .ratelimit import get_limiter
+from .retry import TRANSIENT_STATUSES, CircuitOpenError, backoff_delay, get_breaker, is_transient
+
+# Tüm scraper'ların paylaştığı HTTP katmanı.
+# Site başına tek bir Session tutulur; adapter havuzu worker sayısına göre
+# boyutlanır, böylece thread'ler TCP+TLS bağlantılarını yeniden kullanır.
+# Her istek host'un uyarlanabilir limiter'ından (ratelimit.py) geçer;
+# geçici hatalar backoff ile tekrar denenir, host devresi retry.py'de tutulur.
+
+DEFAULT_TIMEOUT = 20
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+
+
+def _accept_encoding() -> str:
+    # urllib3 "br" içeriğini sadece brotli paketi kuruluysa açabilir
+    try:
+        import brotli  # noqa: F401
+        return "gzip, deflate, br"
+    except ImportError:
+        pass
+    try:
+        import brotlicffi  # noqa: F401
+        return "gzip, deflate, br"
+    except ImportError:
+        return "gzip, deflate"
+
+
+BASE_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": _accept_encoding(),
+    "Connection": "keep-alive",
+}
+
+
+class HttpClient:
+    """
+    Site başına havuzlu HTTP istemcisi.
+    pool_block=True olduğu için havuz dolduğunda yeni bağlantı açılmaz,
+    istek boş bağlantı bekler; bu beklemeler stats() içinde görünür.
+    """
+
+    def __init__(self, name: str, headers: dict = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: float = DEFAULT_TIMEOUT, rate_limit: dict = None):
+        self.name = name
+        self.timeout = timeout
+        self.rate_limit = dict(rate_limit or {})
+        self.pool_size = 0
+        self.session = requests.Session()
+        self.session.headers.update(BASE_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+
+        self._lock = threading.Lock()
+        self._limiters = {}
+        self._in_flight = {}
+        self._peak = {}
+        self._requests = 0
+        self._saturated = 0
+        self._elapsed = 0.0
+        self.resize(pool_size)
+
+    def resize(self, pool_size: int):
+        """Havuz boyutunu büyütür (küçültmez). Worker sayısı artınca çağrılır."""
+        pool_size = max(1, int(pool_size or DEFAULT_POOL_SIZE))
+        if pool_size <= self.pool_size:
+            return
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.pool_size = pool_size
+
+    def limiter(self, url: str):
+        host = urlsplit(url).netloc
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = get_limiter(host, **self.rate_limit)
+        return limiter
+
+    def set_rate_limit(self, rate_limit: dict):
+        """Yeni hız ayarını bu istemcinin kullandığı host limiter'larına da uygular."""
+        rate_limit = dict(rate_limit)
+        if rate_limit == self.rate_limit:
+            return
+        self.rate_limit = rate_limit
+        for limiter in list(self._limiters.values()):
+            limiter.configure(**rate_limit)
+
+    def get(self, url: str, retries: int = DEFAULT_RETRIES, **kwargs) -> requests.Response:
+        """
+        Geçici hatalarda (bağlantı, timeout, 429/5xx) retries kez üstel
+        backoff + jitter ile tekrar dener. Son cevap döner; raise_for_status
+        çağıranın işidir. Devre açıksa CircuitOpenError fırlatılır.
+        """
+        return self.request("GET", url, retries, **kwargs)
+
+    def post(self, url: str, retries: int = DEFAULT_RETRIES, **kwargs) -> requests.Response:
+        """get ile aynı retry/limiter kuralları; sadece yan etkisiz POST'lar için (ör. postback sayfalama)."""
+        return self.request("POST", url, retries, **kwargs)
+
+    def request(self, method: str, url: str, retries: int = DEFAULT_RETRIES, **kwargs) -> requests.Response:
+        breaker = get_breaker(urlsplit(url).netloc)
+        for attempt in range(retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"devre açık: {urlsplit(url).netloc}")
+            try:
+                r = self._send(method, url, **kwargs)
+            except requests.RequestException as exc:
+                breaker.record_failure()
+                if attempt >= retries or not is_transient(exc):
+                    raise
+            else:
+                if r.status_code not in TRANSIENT_STATUSES:
+                    breaker.record_success()
+                    return r
+                breaker.record_failure()
+                if attempt >= retries:
+                    return r
+            time.sleep(backoff_delay(attempt))
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        limiter = self.limiter(url)
+
+        with limiter.slot():
+            with self._lock:
+                n = self._in_flight.get(host, 0) + 1
+                self._in_flight[host] = n
+                self._peak[host] = max(self._peak.get(host, 0), n)
+                self._requests += 1
+                if n > self.pool_size:
+                    self._saturated += 1
+
+            t0 = time.monotonic()
+            try:
+                r = self.session.request(method, url, **kwargs)
+            except requests.RequestException:
+                limiter.feedback(None)
+                raise
+            finally:
+                latency = time.monotonic() - t0
+                with self._lock:
+                    self._in_flight[host] -= 1
+                    self._elapsed += latency
+
+            limiter.feedback(r.status_code, latency, r.headers.get("Retry-After"))
+            return r
+
+    def reset_stats(self):
+        """Sayaçları sıfırlar; run başında çağrılır (istemci süreç boyunca yaşar, özet run'a ait olsun)."""
+        with self._lock:
+            self._peak = {}
+            self._requests = 0
+            self._saturated = 0
+            self._elapsed = 0.0
+            limiters = list(self._limiters.values())
+        for limiter in limiters:
+            limiter.reset_stats()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "pool_size": self.pool_size,
+                "requests": self._requests,
+                "saturated": self._saturated,
+                "peak_in_flight": dict(self._peak),
+                "avg_latency": (self._elapsed / self._requests) if self._requests else 0.0,
+            }
+
+    def summary(self) -> str:
+        s = self.stats()
+        peak = max(s["peak_in_flight"].values(), default=0)
+        limits = " ; ".join(f"{h}: {get_limiter(h).summary()}" for h in s["peak_in_flight"])
+        return (
+            f"[http:{s['name']}] istek={s['requests']} | havuz={s['pool_size']} | "
+            f"tepe={peak} | havuz-dolu={s['saturated']} | ort={s['avg_latency']:.2f}s | {limits}"
+        )
+
+    def close(self):
+        self.session.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(name: str, headers: dict = None, pool_size: int = DEFAULT_POOL_SIZE,
+               timeout: float = DEFAULT_TIMEOUT, rate_limit: dict = None) -> HttpClient:
+    """
+    Site adına göre süreç içinde tekil istemci döndürür.
+    Streamlit aynı süreçte birden çok run yaptığında bağlantılar korunur.
+    rate_limit: sitenin hedef hızı, örn. {"rate": 4, "max_rate": 20, "max_concurrency": 8};
+    max_concurrency, worker sayısından bağımsız olarak host'a açık istek üst sınırıdır.
+    Önbellekteki istemcide değişirse host limiter'larına da uygulanır.
+    """
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            client = HttpClient(name, headers=headers, pool_size=pool_size, timeout=timeout,
+                                rate_limit=rate_limit)
+            _clients[name] = client
+        else:
+            client.resize(pool_size)
+            if headers:
+                client.session.headers.update(headers)
+            if rate_limit:
+                client.set_rate_limit(rate_limit)
+        return client
@@ -0,0 +1,84 @@
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# Artımlı (incremental) mod: önceki run'ın CSV'si profile_url ile indekslenir.
+# Listeleme sayfaları yine gezilir, ama detay sayfası sadece önceki snapshot'ta
+# olmayan ya da max_age_days'ten eski profiller için çekilir.
+
+DEFAULT_MAX_AGE_DAYS = 7
+SCRAPED_AT = "scraped_at"
+
+
+def today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def find_previous_snapshot(output_dir: str, prefix: str):
+    """
+    output_dir'in kardeş run klasörlerinde (outputs/<tarih>/) prefix ile başlayan
+    en yeni CSV'yi bulur. Aynı günün daha önceki çıktısı da aday sayılır.
+    """
+    base = os.path.dirname(os.path.abspath(output_dir))
+    if not os.path.isdir(base):
+        return None
+
+    candidates = []
+    for d in os.listdir(base):
+        run_dir = os.path.join(base, d)
+        if d.startswith(".") or not os.path.isdir(run_dir):
+            continue
+        for f in os.listdir(run_dir):
+            if f.startswith(prefix) and f.lower().endswith(".csv") and ".partial." not in f:
+                path = os.path.join(run_dir, f)
+                candidates.append((os.path.getmtime(path), path))
+
+    if not candidates:
+        return None
+    return max(candidates)[1]
+
+
+class Snapshot:
+    """Önceki run'ın satırları; fresh(url) yeniden çekmeye gerek yoksa satırı döner."""
+
+    def __init__(self, rows_by_url: dict = None, max_age_days: float = DEFAULT_MAX_AGE_DAYS, path: str = None):
+        self.rows = rows_by_url or {}
+        self.path = path
+        self.cutoff = None
+        if max_age_days is not None:
+            self.cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime("%Y-%m-%d")
+        self.reused = 0
+        self.fetched = 0
+
+    @classmethod
+    def load(cls, output_dir: str, prefix: str, max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        path = find_previous_snapshot(output_dir, prefix)
+        if not path:
+            print(f"[incremental] {prefix}: önceki snapshot yok, tam tarama")
+            return cls(max_age_days=max_age_days)
+
+        df = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+        if "profile_url" not in df.columns:
+            return cls(max_age_days=max_age_days)
+
+        if SCRAPED_AT not in df.columns:
+            # Eski formatta tarih kolonu yok; dosyanın tarihi kullanılır
+            stamp = datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d")
+            df[SCRAPED_AT] = stamp
+
+        df = df[df["profile_url"] != ""].drop_duplicates(subset=["profile_url"], keep="last")
+        rows = {r["profile_url"]: r for r in df.to_dict("records")}
+        print(f"[incremental] {prefix}: {len(rows)} satır yüklendi ({os.path.basename(path)})")
+        return cls(rows, max_age_days=max_age_days, path=path)
+
+    def fresh(self, profile_url: str):
+        row = self.rows.get(profile_url)
+        if row is None or (self.cutoff and (row.get(SCRAPED_AT) or "") < self.cutoff):
+            self.fetched += 1
+            return None
+        self.reused += 1
+        return row
+
+    def summary(self) -> str:
+        return f"[incremental] taşınan={self.reused} | yeniden çekilen={self.fetched}"
@@ -0,0 +1,191 @@
+import itertools
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from .cancel import Cancelled, RunContext, bind, current
+from .logbuffer import LogBuffer
+
+# Panelden bağımsız arka plan işleri.
+# Her iş kendi thread'inde çalışır; aynı anda en fazla MAX_JOBS iş koşar, fazlası
+# sırada bekler. İşin thread'inden yapılan print'ler (sys.stdout/stderr) işin
+# kendi log'una (sabit boyutlu LogBuffer) da yazılır; konsola yazım her
+# thread için olduğu gibi sürer.
+# İş bir cancel.RunContext'tir; iptal kooperatiftir: iş thread'i checkpoint()
+# çağırdığında (pipeline kuyruğa iş koyarken, RowSink satır yazarken, sayfa
+# döngülerinde) JobCancelled atılır.
+# Yarıda kalan run'ın günlüğü (.state) durur; aynı gün yeniden başlatılınca devam eder.
+
+MAX_JOBS = int(os.environ.get("SCRAPER_MAX_JOBS", "2"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+JobCancelled = Cancelled
+
+
+def current_job():
+    """Çağıran thread bir işin thread'iyse o iş, değilse None."""
+    ctx = current()
+    return ctx if isinstance(ctx, Job) else None
+
+
+class Job(RunContext):
+    def __init__(self, job_id: int, name: str, fn, args, kwargs):
+        super().__init__(name)
+        self.id = job_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.status = QUEUED
+        self.created_at = datetime.now()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.lines = LogBuffer()
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def active(self) -> bool:
+        return self.status not in FINISHED
+
+    def log(self, line: str):
+        stamp = datetime.now().strftime("%H:%M:%S")
+        self.lines.append(f"[{stamp}] {line}")
+
+    def write(self, text: str):
+        with self._lock:
+            self._buffer += text
+            if "\n" not in self._buffer:
+                return
+            *complete, self._buffer = self._buffer.split("\n")
+        for line in complete:
+            if line.strip():
+                self.log(line.rstrip())
+
+    def tail(self, n: int = 500):
+        return self.lines.tail(n)
+
+
+class _ThreadRouter:
+    """sys.stdout/stderr yerine geçer; iş thread'lerinin yazdıklarını asıl akışa ve işin log'una yazar."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        job = current_job()
+        if job is not None:
+            job.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _install_router():
+    if not isinstance(sys.stdout, _ThreadRouter):
+        sys.stdout = _ThreadRouter(sys.stdout)
+    if not isinstance(sys.stderr, _ThreadRouter):
+        sys.stderr = _ThreadRouter(sys.stderr)
+
+
+class JobManager:
+    def __init__(self, max_jobs: int = MAX_JOBS):
+        self._slots = threading.Semaphore(max(1, max_jobs))
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        _install_router()
+
+    def submit(self, name: str, fn, *args, **kwargs) -> Job:
+        """fn(*args, **kwargs)'ı arka planda çalıştırır; Job hemen döner."""
+        with self._lock:
+            job = Job(next(self._ids), name, fn, args, kwargs)
+            self._jobs[job.id] = job
+        threading.Thread(target=self._run, args=(job,), name=f"job-{job.id}-{name}", daemon=True).start()
+        return job
+
+    def _run(self, job: Job):
+        bind(job)
+        try:
+            with self._slots:
+                if job.cancel_requested.is_set():
+                    job.status = CANCELLED
+                    return
+                job.status = RUNNING
+                job.started = time.monotonic()
+                job.log(f"🚀 {job.name} çalışmaya başladı...")
+                try:
+                    job.result = job.fn(*job.args, **job.kwargs)
+                    job.status = DONE
+                    job.log(f"✓ {job.name} tamamlandı ({job.elapsed:.1f}s). {job.result or ''}")
+                except JobCancelled:
+                    # Scraper'lar dosyalarını finally'de kapatır; .partial dosyaları olduğu gibi kalır
+                    job.status = CANCELLED
+                    job.log(f"⏹ {job.name} iptal edildi ({job.elapsed:.1f}s), {job.rows} satır yazılmıştı")
+                except Exception:
+                    job.error = traceback.format_exc()
+                    job.status = FAILED
+                    job.log(f"❌ {job.name} hata oluştu ({job.elapsed:.1f}s):\n{job.error}")
+        finally:
+            job.finished = time.monotonic()
+            bind(None)
+
+    def jobs(self):
+        """Yeniden eskiye tüm işler."""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.id, reverse=True)
+
+    def get(self, job_id: int):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self, name: str = None):
+        return [j for j in self.jobs() if j.active and (name is None or j.name == name)]
+
+    def cancel(self, job_id: int):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def clear_finished(self):
+        with self._lock:
+            self._jobs = {k: j for k, j in self._jobs.items() if j.active}
+
+    def summary(self) -> str:
+        counts = {}
+        for j in self.jobs():
+            counts[j.status] = counts.get(j.status, 0) + 1
+        return "[jobs] " + (" | ".join(f"{k}={v}" for k, v in counts.items()) or "iş yok")
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_jobs() -> JobManager:
+    """Süreç içinde tekil JobManager."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
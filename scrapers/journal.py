@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+
+# Uzun taramalar için çökmeye dayanıklı, sadece-ekleme (append-only) günlük.
+# outputs/<tarih>/.state/<isim>.jsonl dosyasına her tamamlanan listeleme
+# sayfası satırlarıyla birlikte tek bir JSON satırı olarak yazılır.
+# Süreç ölür ya da Streamlit yeniden çalışırsa run() kaldığı yerden devam eder.
+
+STATE_DIR = ".state"
+
+
+class RunJournal:
+    """
+    Kayıt tipleri:
+      {"page": n, "rows": [...], "failed": [...]}
+                                  -> sayfa ve satırları tamamlandı; failed, profili
+                                     çekilemeyen (dead-letter'a giden) kart satırları
+      {"rows": [...]}             -> sayfadan bağımsız satırlar (dead-letter turu)
+      {"end": n}                  -> listeleme n. sayfada bitti
+      {"done": true}              -> CSV yazıldı, run kapandı
+    Yarım yazılmış son satır (çökme anı) yüklemede yok sayılır.
+    rows sadece diskten yüklenen (devam edilen) satırları tutar; yeni satırlar
+    bellekte biriktirilmez, çıktıya RowSink ile akar.
+    pending: önceki run'da başarısız olup sonradan satırı yazılmamış kart
+    satırları; devam eden run bunları yeniden kuyruğa koyar.
+    """
+
+    def __init__(self, output_dir: str, name: str):
+        self.dir = os.path.join(output_dir, STATE_DIR) if output_dir else None
+        self.path = os.path.join(self.dir, f"{name}.jsonl") if output_dir else None
+        self.pages = set()
+        self.rows = []
+        self.pending = []
+        self.end_page = None
+        self._lock = threading.Lock()
+        self._f = None
+        if self.path:
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            # Çökme anında yarım kalan son satır kesilir, yeni kayıtlar temiz satıra eklenir
+            cut = data.rfind(b"\n") + 1
+            if cut != len(data):
+                f.truncate(cut)
+                data = data[:cut]
+
+        records = []
+        for line in data.decode("utf-8").splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+
+        if records and records[-1].get("done"):
+            # Önceki run tamamlanmış; günlük arşivlenir, yeni run sıfırdan başlar
+            os.replace(self.path, f"{self.path}.{int(time.time())}.done")
+            return
+
+        pending = {}
+        for rec in records:
+            if "page" in rec:
+                self.pages.add(rec["page"])
+            if "end" in rec:
+                self.end_page = rec["end"]
+            for listed in rec.get("failed") or []:
+                pending[listed.get("profile_url")] = listed
+            for row in rec.get("rows") or []:
+                pending.pop(row.get("profile_url"), None)
+                self.rows.append(row)
+        self.pending = list(pending.values())
+
+        if self.pages or self.rows:
+            print(
+                f"[journal] devam ediliyor: {len(self.pages)} sayfa, {len(self.rows)} satır, "
+                f"yeniden denenecek {len(self.pending)} profil ({self.path})"
+            )
+
+    def _append(self, rec: dict):
+        if self.path is None:
+            return
+        with self._lock:
+            if self._f is None:
+                os.makedirs(self.dir, exist_ok=True)
+                self._f = open(self.path, "a", encoding="utf-8")
+            self._f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def page_done(self, page: int, rows, failed=()):
+        """failed: profili çekilemeyen kart satırları; satırları add_rows ile gelene kadar bekler."""
+        rec = {"page": page, "rows": list(rows)}
+        if failed:
+            rec["failed"] = list(failed)
+        self._append(rec)
+        self.pages.add(page)
+
+    def add_rows(self, rows):
+        rows = list(rows)
+        if rows:
+            self._append({"rows": rows})
+
+    def replay(self, sink):
+        """Devam edilen run'ın satırlarını çıktıya yazar ve bellekten bırakır."""
+        sink.extend(self.rows)
+        self.rows = []
+
+    def mark_end(self, page: int):
+        self._append({"end": page})
+        self.end_page = page
+
+    def finish(self):
+        self._append({"done": True})
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
@@ -0,0 +1,37 @@
+import os
+import threading
+from collections import deque
+from itertools import islice
+
+# İş log'ları için sabit boyutlu halka tampon.
+# Ekleme O(1); dolunca en eski satırlar düşer. toplam/düşen sayaçları panelde
+# gösterilir; total aynı zamanda sürüm numarasıdır (değişmediyse yeniden çizilmez).
+
+DEFAULT_MAXLEN = int(os.environ.get("SCRAPER_LOG_LINES", "5000"))
+
+
+class LogBuffer:
+    def __init__(self, maxlen: int = DEFAULT_MAXLEN):
+        self._lines = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def append(self, line: str):
+        with self._lock:
+            self._lines.append(line)
+            self.total += 1
+
+    @property
+    def dropped(self) -> int:
+        return self.total - len(self._lines)
+
+    def tail(self, n: int = 500):
+        """Son n satır (kopya)."""
+        with self._lock:
+            return list(islice(self._lines, max(0, len(self._lines) - n), None))
+
+    def __len__(self):
+        return len(self._lines)
+
+    def summary(self) -> str:
+        return f"[log] toplam={self.total} | tutulan={len(self)} | düşen={self.dropped}"
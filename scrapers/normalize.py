@@ -0,0 +1,106 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Telefon / e-posta normalizasyonu.
+# Skaler yardımcılar satır bazlı kodda (scraper içi seçim), normalize_frame ise
+# tüm çıktıya yazılmadan önce vektörel pandas string işlemleriyle uygulanır.
+# Telefonlar 0XXXXXXXXXX (11 hane) biçimine getirilir; 05 ile başlayanlar cep,
+# diğerleri sabit hat sayılır. Normalize edilemeyen değer olduğu gibi bırakılır,
+# türü boş kalır.
+
+PHONE_COLUMNS = ("phone", "personal_phone", "work_phone")
+EMAIL_COLUMNS = ("email",)
+PHONE_TYPE = "phone_type"
+
+NON_DIGIT_RE = re.compile(r"\D+")
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-zA-Z]{2,}")
+MAILTO_TRIM_RE = re.compile(r"^mailto:\s*|\?.*$")
+# Yurt içi numara ilk hanesi: 2/3/4 sabit hat, 5 cep, 8 (0850 vb.)
+LOCAL_FIRST_DIGITS = ("2", "3", "4", "5", "8")
+
+
+def normalize_tr_phone(raw: str) -> str:
+    """Tek numara için; normalize_phones ile aynı kurallar. Geçersizse girdi (trim'li) olduğu gibi döner."""
+    if not raw:
+        return ""
+    raw = raw.strip()
+    digits = NON_DIGIT_RE.sub("", raw)
+
+    # drop country code 90...
+    if digits.startswith("90") and len(digits) >= 12:
+        digits = digits[2:]
+
+    # 5xxxxxxxxx -> 05xxxxxxxxx, 212xxxxxxx -> 0212xxxxxxx
+    if len(digits) == 10 and digits.startswith(LOCAL_FIRST_DIGITS):
+        digits = "0" + digits
+
+    return digits if is_mobile_tr(digits) or is_landline_tr(digits) else raw
+
+
+def is_mobile_tr(d: str) -> bool:
+    return len(d) == 11 and d.isdigit() and d.startswith("05")
+
+
+def is_landline_tr(d: str) -> bool:
+    return len(d) == 11 and d.isdigit() and d.startswith("0") and not d.startswith(("05", "00"))
+
+
+def normalize_phones(s: pd.Series):
+    """(normalize edilmiş seri, tür serisi: "mobile" / "landline" / "")."""
+    raw = s.fillna("").astype(str).str.strip()
+    d = raw.str.replace(NON_DIGIT_RE, "", regex=True)
+
+    has_cc = d.str.startswith("90") & (d.str.len() >= 12)
+    d = d.mask(has_cc, d.str.slice(2))
+
+    local = (d.str.len() == 10) & d.str.slice(0, 1).isin(LOCAL_FIRST_DIGITS)
+    d = d.mask(local, "0" + d)
+
+    valid = (d.str.len() == 11) & d.str.startswith("0") & ~d.str.startswith("00")
+    mobile = valid & d.str.startswith("05")
+    kind = pd.Series(np.select([mobile, valid], ["mobile", "landline"], ""), index=s.index)
+    return d.where(valid, raw), kind
+
+
+def normalize_emails(s: pd.Series) -> pd.Series:
+    """Küçük harf, "mailto:" ve ?subject=... kırpılır; geçersizse orijinal (trim'li) kalır."""
+    raw = s.fillna("").astype(str).str.strip()
+    e = raw.str.lower().str.replace(MAILTO_TRIM_RE, "", regex=True)
+    return e.where(e.str.fullmatch(EMAIL_RE), raw)
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    PHONE_COLUMNS / EMAIL_COLUMNS içinden df'te olanları normalize eder.
+    "phone" kolonu varsa türü phone_type kolonuna yazılır.
+    """
+    df = df.copy()
+    for col in PHONE_COLUMNS:
+        if col in df.columns:
+            df[col], kind = normalize_phones(df[col])
+            if col == "phone":
+                df[PHONE_TYPE] = kind
+    for col in EMAIL_COLUMNS:
+        if col in df.columns:
+            df[col] = normalize_emails(df[col])
+    return df
+
+
+def _bench(n: int = 100_000):
+    import time
+
+    samples = ["+90 532 111 22 33", "0212 555 11 22", "tel:05321112233", "5321112233", "(0216) 444-55-66", "", "yok"]
+    mails = ["Ali@Ornek.com.tr", "mailto:ayse@x.com?subject=Merhaba", " veli@y.com ", "", "gecersiz@"]
+    df = pd.DataFrame({
+        "phone": [samples[i % len(samples)] for i in range(n)],
+        "email": [mails[i % len(mails)] for i in range(n)],
+    })
+    t0 = time.perf_counter()
+    normalize_frame(df)
+    print(f"{n} satır: {time.perf_counter() - t0:.3f} s")
+
+
+if __name__ == "__main__":
+    _bench()
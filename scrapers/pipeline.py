@@ -0,0 +1,96 @@
+import queue
+import threading
+
+from .cancel import Cancelled, checkpoint, propagate
+
+# Listeleme -> detay üretici/tüketici hattı.
+# Üretici (listeleme) çağıran thread'de çalışır ve bulduğu işleri sınırlı bir
+# kuyruğa koyar; detay worker'ları ilk link gelir gelmez çalışmaya başlar.
+# Kuyruk dolunca üretici bekler (backpressure).
+# Sonuç/hata callback'leri de çağıran thread'de çalışır; print ve log çağrıları
+# çağıran thread'den (panelde işin thread'i, bkz. jobs) çıkmaz.
+# Worker'lar çağıranın run bağlamını devralır (cancel.propagate).
+# Üretici döngüsü her işte cancel.checkpoint() çağırır; iptal ya da hata olursa
+# kuyrukta bekleyen işler atılır, worker'lar ellerindekini bitirip çıkar.
+# Worker'da atılan iptal on_error'a gitmez, çağıranda yeniden fırlatılır.
+
+_DONE = object()
+
+
+def run_pipeline(items, work, on_result, on_error=None, workers: int = 8, queue_size: int = None):
+    """
+    items: iterable/generator; çağıran thread'de tüketilir.
+    work(item) -> sonuç; worker thread'lerinde çağrılır.
+    on_result(item, sonuç) / on_error(item, hata): çağıran thread'de çağrılır.
+    """
+    workers = max(1, int(workers))
+    tasks = queue.Queue(maxsize=queue_size or workers * 4)
+    done = queue.Queue()
+
+    def worker():
+        while True:
+            item = tasks.get()
+            if item is _DONE:
+                done.put((_DONE, None, None))
+                return
+            try:
+                done.put((item, work(item), None))
+            except Exception as exc:
+                done.put((item, None, exc))
+
+    def handle(entry):
+        item, result, exc = entry
+        if item is _DONE:
+            return 1
+        if isinstance(exc, Cancelled):
+            raise exc
+        if exc is None:
+            on_result(item, result)
+        elif on_error is not None:
+            on_error(item, exc)
+        else:
+            print(f"[pipeline] işlenemedi {item}: {exc}")
+        return 0
+
+    def drain():
+        finished = 0
+        while True:
+            try:
+                finished += handle(done.get_nowait())
+            except queue.Empty:
+                return finished
+
+    threads = [
+        threading.Thread(target=propagate(worker), name=f"pipeline-worker-{i}", daemon=True)
+        for i in range(workers)
+    ]
+    for t in threads:
+        t.start()
+
+    finished = 0
+    aborted = False
+    try:
+        for item in items:
+            checkpoint()
+            tasks.put(item)
+            finished += drain()
+    except BaseException:
+        aborted = True
+        _discard(tasks)
+        raise
+    finally:
+        for _ in range(workers):
+            tasks.put(_DONE)
+        while finished < workers:
+            entry = done.get()
+            if aborted and entry[0] is not _DONE:
+                continue
+            finished += handle(entry)
+
+
+def _discard(q: queue.Queue):
+    while True:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            return
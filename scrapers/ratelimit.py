@@ -0,0 +1,149 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Host başına uyarlanabilir token-bucket.
+# Hız AIMD ile ayarlanır: başarılı ve hızlı cevaplarda toplamsal artış,
+# 429/503 veya yavaşlayan cevaplarda çarpımsal azalış. Retry-After başlığı
+# geldiğinde host o süre boyunca tamamen bekletilir.
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value) -> float:
+    """Retry-After değerini saniyeye çevirir (sayı veya HTTP tarihi)."""
+    if not value:
+        return 0.0
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveRateLimiter:
+    """
+    rate: başlangıç hızı (istek/sn). min_rate..max_rate aralığında uyarlanır.
+    max_concurrency: host'a aynı anda açık istek üst sınırı.
+    slow_latency: bu sürenin üstündeki cevaplar hızı düşürür.
+    """
+
+    def __init__(self, **settings):
+        self._tokens = 1.0
+        self._last = time.monotonic()
+        self._pause_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._slots = None
+        self.max_concurrency = None
+        self.settings = None
+        self.throttled = 0
+        self.configure(**settings)
+
+    def configure(self, rate: float = 2.0, min_rate: float = 0.2, max_rate: float = None,
+                  max_concurrency: int = 4, increase: float = 1.0, decrease: float = 0.5,
+                  slow_latency: float = 5.0):
+        """Ayarları uygular; aynı ayarlarla tekrar çağrı uyarlanmış hızı sıfırlamaz."""
+        settings = dict(rate=rate, min_rate=min_rate, max_rate=max_rate, max_concurrency=max_concurrency,
+                        increase=increase, decrease=decrease, slow_latency=slow_latency)
+        with self._lock:
+            if settings == self.settings:
+                return
+            self.settings = settings
+            self.rate = float(rate)
+            self.min_rate = float(min_rate)
+            self.max_rate = float(max_rate or rate * 4)
+            self.increase = increase
+            self.decrease = decrease
+            self.slow_latency = slow_latency
+            max_concurrency = max(1, int(max_concurrency))
+            if max_concurrency != self.max_concurrency:
+                # Açık istekler eski semaphore'u bırakır; yeni istekler yeni sınırla bekler
+                self._slots = threading.BoundedSemaphore(max_concurrency)
+                self.max_concurrency = max_concurrency
+
+    def _refill(self, now: float):
+        burst = max(1.0, self.rate)
+        self._tokens = min(burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """Bir token alınana kadar bekler."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._pause_until:
+                    wait = self._pause_until - now
+                elif self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                else:
+                    wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    @contextmanager
+    def slot(self):
+        """Eşzamanlılık sınırı + token; istek bu blok içinde yapılır."""
+        with self._slots:
+            self.acquire()
+            yield
+
+    def _slow_down(self, now: float):
+        # Aynı dalgadaki çok sayıda hata hızı sıfıra indirmesin diye
+        # azalış saniyede en fazla bir kez uygulanır.
+        if now - self._last_decrease >= 1.0:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._last_decrease = now
+
+    def feedback(self, status: int = None, latency: float = None, retry_after=None):
+        """Cevap sonrası çağrılır; hızı gözlenen duruma göre ayarlar."""
+        with self._lock:
+            now = time.monotonic()
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+                self._slow_down(now)
+                pause = parse_retry_after(retry_after)
+                if pause:
+                    self._pause_until = max(self._pause_until, now + pause)
+                    self._tokens = 0.0
+            elif status is None or (latency is not None and latency > self.slow_latency):
+                self._slow_down(now)
+            elif status < 400:
+                self.rate = min(self.max_rate, self.rate + self.increase / max(1.0, self.rate))
+
+    def reset_stats(self):
+        with self._lock:
+            self.throttled = 0
+
+    def summary(self) -> str:
+        return f"hız={self.rate:.2f}/sn | eşzamanlı<={self.max_concurrency} | 429/503={self.throttled}"
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(host: str, **settings) -> AdaptiveRateLimiter:
+    """
+    Host başına süreç içinde tekil limiter döndürür.
+    Ayar verilirse mevcut limiter'a da uygulanır (değişmedikçe etkisiz).
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(**settings)
+            _limiters[host] = limiter
+            return limiter
+    if settings:
+        limiter.configure(**settings)
+    return limiter
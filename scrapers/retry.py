@@ -0,0 +1,166 @@
+import random
+import threading
+import time
+
+import requests
+
+from .cancel import checkpoint
+
+# Geçici hatalar için yeniden deneme, host başına devre kesici (circuit breaker)
+# ve run sonunda bir kez daha denenen dead-letter listesi.
+
+TRANSIENT_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Host'un devresi açıkken istek hiç gönderilmeden fırlatılır."""
+
+
+def is_transient(exc: Exception) -> bool:
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code in TRANSIENT_STATUSES
+    return False
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Üstel geri çekilme + full jitter: 0..min(cap, base*2^attempt)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Ardışık threshold hatadan sonra devre açılır ve cooldown saniye boyunca
+    istekler anında reddedilir. Süre dolunca tek bir deneme isteğine izin
+    verilir (half-open); başarılı olursa devre kapanır.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+        self.trips = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.threshold:
+                if self._opened_at is None or self._trial:
+                    self.trips += 1
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+    def remaining(self) -> float:
+        """Açık devrenin deneme isteğine izin vermesine kalan süre."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker()
+            _breakers[host] = breaker
+        return breaker
+
+
+def wait_for_breakers(hosts=None, step: float = 0.5):
+    """
+    Verilen host'ların (None: tümü) açık devrelerinin cooldown süresi dolana
+    kadar bekler. Bekleme küçük adımlarla yapılır; run iptal edilirse
+    checkpoint() Cancelled atar.
+    """
+    with _breakers_lock:
+        breakers = [b for h, b in _breakers.items() if hosts is None or h in hosts]
+    wait = max((b.remaining() for b in breakers), default=0.0)
+    if not wait:
+        return
+    print(f"[circuit] açık devre var, {wait:.0f}s bekleniyor")
+    deadline = time.monotonic() + wait
+    while True:
+        checkpoint()
+        left = deadline - time.monotonic()
+        if left <= 0:
+            break
+        time.sleep(min(step, left))
+
+
+class DeadLetter:
+    """
+    Başarısız işleri (anahtar + tekrar çalıştırılacak fonksiyon) toplar.
+    retry() run sonunda her işi bir kez daha dener; yine başarısız olanlar
+    failed listesinde kalır ve çıktı başarılı satırlarla yazılır.
+    hosts: retry() öncesi devresi beklenecek host'lar (None: tümü).
+    """
+
+    def __init__(self, name: str = "", hosts=None):
+        self.name = name
+        self.hosts = set(hosts) if hosts is not None else None
+        self.items = []
+        self.failed = []
+        self._lock = threading.Lock()
+
+    def add(self, key, fn, *args, error=None):
+        with self._lock:
+            self.items.append((key, fn, args))
+        print(f"[dead-letter{':' + self.name if self.name else ''}] {key} | {error}")
+
+    def __len__(self):
+        return len(self.items)
+
+    def retry(self):
+        """Bekleyen işleri bir kez çalıştırır, başarılı sonuçların listesini döner."""
+        results = []
+        seen = set()
+        if self.items:
+            wait_for_breakers(self.hosts)
+        # Tekrar deneme sırasında eklenen işler (örn. yeniden çekilen sayfanın
+        # profilleri) de aynı turda bir kez denenir; aynı anahtar iki kez denenmez.
+        while True:
+            with self._lock:
+                items, self.items = self.items, []
+            if not items:
+                break
+            print(f"[dead-letter{':' + self.name if self.name else ''}] tekrar deneniyor: {len(items)}")
+            for key, fn, args in items:
+                if key in seen:
+                    self.failed.append((key, None))
+                    continue
+                seen.add(key)
+                try:
+                    results.append(fn(*args))
+                except Exception as exc:
+                    self.failed.append((key, exc))
+                    print(f"[dead-letter] vazgeçildi {key}: {exc}")
+        return results
+
+    def summary(self) -> str:
+        return f"başarısız kalan: {len(self.failed)}"
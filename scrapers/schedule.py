@@ -0,0 +1,189 @@
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+# Komut satırı için basit zamanlayıcı ve run kilidi.
+# CronSpec: standart 5 alanlı cron ifadesi (dakika saat gün ay haftanın-günü);
+# "*", "a-b", "a,b", "*/n" ve "a-b/n" desteklenir, haftanın günü 0/7 = Pazar.
+# RunLock: pid ve başlangıç zamanı önce geçici dosyaya yazılır, sonra os.link
+# ile kilit adına atomik olarak bağlanır; kilit dosyası hiçbir an boş görünmez.
+# Sahibi ölmüş (pid yaşamıyor) kilit bayat sayılıp devralınır. Okunamayan kilit
+# (eski sürüm / yarım yazım) LOCK_GRACE_SECS'ten yeniyse tutuluyor sayılır.
+
+FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+ALIASES = {"@daily": "0 0 * * *", "@hourly": "0 * * * *", "@weekly": "0 0 * * 0"}
+
+LOCK_GRACE_SECS = 60
+
+
+def _parse_field(expr: str, lo: int, hi: int) -> frozenset:
+    values = set()
+    for part in expr.split(","):
+        rng, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if rng == "*":
+            start, end = lo, hi
+        elif "-" in rng:
+            a, b = rng.split("-", 1)
+            start, end = int(a), int(b)
+        else:
+            start = int(rng)
+            end = hi if step > 1 else start
+        if not (lo <= start <= end <= hi) or step < 1:
+            raise ValueError(f"geçersiz cron alanı: {part!r} ({lo}-{hi})")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSpec:
+    """5 alanlı cron ifadesi; next_after() bir sonraki tetikleme dakikasını verir."""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        parts = ALIASES.get(spec.strip(), spec).split()
+        if len(parts) != len(FIELDS):
+            raise ValueError(f"cron ifadesi 5 alan olmalı: {spec!r}")
+        for (name, lo, hi), expr in zip(FIELDS, parts):
+            setattr(self, name, _parse_field(expr, lo, hi))
+        if 7 in self.weekday:
+            self.weekday = self.weekday | {0}
+        # cron kuralı: gün ve haftanın günü ikisi de kısıtlıysa biri tutması yeter
+        self._day_any = parts[2] == "*"
+        self._weekday_any = parts[4] == "*"
+
+    def _day_matches(self, t: datetime) -> bool:
+        if t.month not in self.month:
+            return False
+        dom = t.day in self.day
+        dow = (t.isoweekday() % 7) in self.weekday
+        if self._day_any or self._weekday_any:
+            return dom and dow
+        return dom or dow
+
+    def next_after(self, t: datetime) -> datetime:
+        t = t.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if t.hour not in self.hour:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+                continue
+            if t.minute not in self.minute:
+                t += timedelta(minutes=1)
+                continue
+            return t
+        raise ValueError(f"cron ifadesi hiç tetiklenmiyor: {self.spec!r}")
+
+
+class LockHeld(RuntimeError):
+    pass
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+def _read_owner(path: str):
+    """Kilit dosyasındaki {"pid", "started_at"}; yoksa ya da okunamıyorsa None."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            owner = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return owner if isinstance(owner, dict) else None
+
+
+class RunLock:
+    """Çakışan run'ları engelleyen kilit dosyası (context manager)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._held = False
+
+    def owner(self):
+        return _read_owner(self.path)
+
+    def _stale(self, owner) -> bool:
+        if owner is None:
+            try:
+                age = time.time() - os.path.getmtime(self.path)
+            except FileNotFoundError:
+                return True
+            return age > LOCK_GRACE_SECS
+        pid = owner.get("pid")
+        return not (isinstance(pid, int) and _pid_alive(pid))
+
+    def _remove_stale(self, owner) -> bool:
+        """Bayat kilidi kaldırır; bu arada başkası kilidi almışsa dokunmaz (False)."""
+        moved = f"{self.path}.{os.getpid()}.stale"
+        try:
+            os.replace(self.path, moved)
+        except FileNotFoundError:
+            return True
+        if _read_owner(moved) == owner:
+            os.remove(moved)
+            return True
+        # İncelediğimiz kilit değil (yeni sahip yazmış): geri koy
+        try:
+            os.link(moved, self.path)
+        except FileExistsError:
+            pass
+        os.remove(moved)
+        return False
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "started_at": datetime.now().isoformat(timespec="seconds")}, f)
+        try:
+            for _ in range(2):
+                try:
+                    os.link(tmp, self.path)
+                except FileExistsError:
+                    owner = self.owner()
+                    if not self._stale(owner):
+                        pid = (owner or {}).get("pid", "?")
+                        started = (owner or {}).get("started_at")
+                        raise LockHeld(f"başka bir run çalışıyor (pid={pid}, başlangıç={started})")
+                    # Bayat kilit: sahibi yok, bir kez devralmayı dene
+                    if not self._remove_stale(owner):
+                        raise LockHeld(f"kilit başka bir süreç tarafından alındı: {self.path}")
+                    continue
+                self._held = True
+                return self
+        finally:
+            os.remove(tmp)
+        raise LockHeld(f"kilit alınamadı: {self.path}")
+
+    def release(self):
+        if self._held:
+            self._held = False
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def sleep_until(when: datetime, poll: float = 30.0):
+    """Saat değişimi / uyku modu sonrasında kaymamak için kısa aralıklarla bekler."""
+    while True:
+        remaining = (when - datetime.now()).total_seconds()
+        if remaining <= 0:
+            return
+        time.sleep(min(poll, remaining))
@@ -0,0 +1,237 @@
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from .cancel import checkpoint, track_sink
+from .columnar import HAVE_PARQUET, arrow_table, parquet_path, parquet_writer, write_parquet
+
+# Satırları üretildikçe diske yazan akış (streaming) çıktısı.
+# Run sürerken <isim>.partial.csv dosyası büyür ("Çıktıları Görüntüle" sekmesi
+# bunu gösterebilir); close() ile dosya atomik olarak <isim>.csv adına taşınır.
+# profile_url üzerinden tekilleştirme bellekteki anahtar kümesiyle yapılır.
+# Satırlar partiler halinde (flush_every satır ya da flush_secs saniye) yazılır;
+# postprocess verilirse her parti yazılmadan önce DataFrame olarak vektörel son
+# işlemden (ör. normalize.normalize_frame) geçer. Bellekte en fazla bir parti durur.
+# "parquet" formatında aynı partiler ayrıca <isim>.parquet'e eklenir
+# (bkz. columnar; pyarrow yoksa atlanır).
+# Satırlar tamamlanma sırasıyla yazılır; sort_by verilirse close() yazılmış
+# CSV'yi bir kez okuyup bu kolonlara göre (sayısal kolonlar sayı olarak, kararlı)
+# sıralar ve çıktıları o sırayla yeniden yazar. Parquet o durumda sonda yazılır.
+
+PARTIAL_SUFFIX = ".partial"
+
+
+class RowSink:
+    """
+    path: nihai dosya yolu (.csv). formats: "csv" ile birlikte "jsonl" ve/veya "parquet".
+    columns verilmezse ilk satırın anahtarları başlık olur.
+    key: tekilleştirme kolonu; boş değerli satırlar her zaman yazılır.
+    postprocess: DataFrame -> DataFrame; her partiye ayrı uygulanır, satır bazlı olmalı.
+    Eklediği kolonlar (ör. phone_type) başlığın sonuna gelir.
+    sort_by: nihai dosyanın sıralanacağı kolonlar (ör. ("page", "name")); None ise yazım sırası.
+    """
+
+    def __init__(self, path: str, columns=None, key: str = "profile_url", formats=("csv", "parquet"),
+                 encoding: str = "utf-8", flush_every: int = 100, flush_secs: float = 5.0,
+                 postprocess=None, sort_by=None):
+        self.path = path
+        self.columns = list(columns) if columns else None
+        self.key = key
+        self.formats = tuple(formats)
+        self.encoding = encoding
+        self.flush_every = flush_every
+        self.flush_secs = flush_secs
+        self.postprocess = postprocess
+        self.sort_by = list(sort_by) if sort_by else None
+
+        self.count = 0
+        self.duplicates = 0
+        self._keys = set()
+        self._lock = threading.Lock()
+        self._batch = []
+        self._header = None
+        self._last_flush = time.monotonic()
+        self._csv_file = None
+        self._jsonl_file = None
+        self._parquet = None
+        self._parquet_on = "parquet" in self.formats and HAVE_PARQUET
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        track_sink(self)
+        if "jsonl" in self.formats:
+            self._jsonl_file = open(self._partial(self._jsonl_path()), "w", encoding="utf-8")
+
+    def _jsonl_path(self) -> str:
+        return os.path.splitext(self.path)[0] + ".jsonl"
+
+    def _parquet_tmp(self) -> str:
+        # .partial.parquet değil: yarım Parquet okunamaz, görüntüleyici onu aramasın
+        return parquet_path(self.path) + ".tmp"
+
+    @staticmethod
+    def _partial(path: str) -> str:
+        base, ext = os.path.splitext(path)
+        return f"{base}{PARTIAL_SUFFIX}{ext}"
+
+    def write(self, row: dict) -> bool:
+        """Satırı yazar; anahtarı daha önce görülmüşse atlar ve False döner."""
+        checkpoint()
+        with self._lock:
+            k = row.get(self.key) if self.key else None
+            if k:
+                if k in self._keys:
+                    self.duplicates += 1
+                    return False
+                self._keys.add(k)
+
+            if self.columns is None:
+                self.columns = list(row.keys())
+            self._batch.append(row)
+            self.count += 1
+            if len(self._batch) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_secs:
+                self._flush()
+            return True
+
+    def extend(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def _frame(self, rows) -> pd.DataFrame:
+        # object dtype: eksik hücreli int kolonlar (page) float'a dönmez
+        df = pd.DataFrame(rows, columns=self.columns, dtype=object).fillna("")
+        if self.postprocess is not None:
+            df = self.postprocess(df)
+        if self._header is None:
+            self._header = list(df.columns)
+        return df.reindex(columns=self._header, fill_value="")
+
+    def _write_frame(self, df: pd.DataFrame):
+        if "csv" in self.formats:
+            first = self._csv_file is None
+            if first:
+                self._csv_file = open(self._partial(self.path), "w", encoding=self.encoding, newline="")
+            df.to_csv(self._csv_file, header=first, index=False)
+        if self._jsonl_file is not None:
+            for rec in df.to_dict("records"):
+                self._jsonl_file.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+        if self._parquet_on and not self.sort_by:
+            try:
+                if self._parquet is None:
+                    self._parquet = parquet_writer(self._parquet_tmp(), self._header)
+                self._parquet.write_table(arrow_table(df))
+            except Exception as exc:
+                # Parquet ek çıktı; yazılamazsa CSV yine de teslim edilir
+                print(f"[sink] parquet yazılamadı ({os.path.basename(self.path)}): {exc}")
+                self._drop_parquet()
+
+    def _flush(self):
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self._write_frame(self._frame(batch))
+        for f in (self._csv_file, self._jsonl_file):
+            if f is not None:
+                f.flush()
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _drop_parquet(self):
+        self._parquet_on = False
+        if self._parquet is not None:
+            try:
+                self._parquet.close()
+            except Exception:
+                pass
+            self._parquet = None
+        if os.path.exists(self._parquet_tmp()):
+            os.remove(self._parquet_tmp())
+
+    def abort(self):
+        """Partiyi yazıp dosyaları kapatır; .partial dosyaları olduğu gibi kalır. close() sonrası etkisiz."""
+        with self._lock:
+            try:
+                self._flush()
+            finally:
+                for f in (self._csv_file, self._jsonl_file):
+                    if f is not None:
+                        f.close()
+                self._csv_file = self._jsonl_file = None
+                self._drop_parquet()
+
+    def __len__(self):
+        return self.count
+
+    def close(self) -> str:
+        """Kalan partiyi yazar, dosyaları kapatır ve .partial'dan nihai ada atomik olarak taşır."""
+        with self._lock:
+            self._flush()
+            if self._header is None and self.columns:
+                # Hiç satır yoksa da başlıklı bir dosya bırakılır
+                self._write_frame(self._frame([]))
+            elif "csv" in self.formats and self._csv_file is None:
+                self._csv_file = open(self._partial(self.path), "w", encoding=self.encoding, newline="")
+            finals = []
+            if self._csv_file is not None:
+                self._csv_file.close()
+                finals.append(self.path)
+            if self._jsonl_file is not None:
+                self._jsonl_file.close()
+                finals.append(self._jsonl_path())
+            self._csv_file = self._jsonl_file = None
+            ordered = self._sort_outputs() if self.sort_by and self._header is not None and self.path in finals else None
+            for final in finals:
+                _fsync_path(self._partial(final))
+                os.replace(self._partial(final), final)
+            if ordered is not None and self._parquet_on:
+                try:
+                    write_parquet(ordered, parquet_path(self.path))
+                except Exception as exc:
+                    print(f"[sink] parquet yazılamadı ({os.path.basename(self.path)}): {exc}")
+            if self._parquet is not None:
+                # CSV'den sonra kapanır; mtime'ı CSV'ninkinden eski olmaz (bkz. columnar.parquet_for)
+                self._parquet.close()
+                self._parquet = None
+                os.replace(self._parquet_tmp(), parquet_path(self.path))
+            self._parquet_on = False
+        return self.path
+
+    def _sort_outputs(self):
+        """Kapalı .partial CSV'yi sort_by'a göre sıralayıp yeniden yazar; JSONL aynı sırayla. Sıralı tabloyu döner."""
+        partial = self._partial(self.path)
+        df = pd.read_csv(partial, dtype=str, keep_default_na=False, encoding=self.encoding)
+        by = [c for c in self.sort_by if c in df.columns]
+        if not by:
+            return df
+        df = df.sort_values(by, key=_sort_key, kind="stable", na_position="last")
+        with open(partial, "w", encoding=self.encoding, newline="") as f:
+            df.to_csv(f, index=False)
+        if "jsonl" in self.formats:
+            # JSONL satırları CSV satırlarıyla bire bir aynı sırada yazıldı
+            jsonl = self._partial(self._jsonl_path())
+            with open(jsonl, encoding="utf-8") as f:
+                lines = f.readlines()
+            with open(jsonl, "w", encoding="utf-8") as f:
+                f.writelines(lines[i] for i in df.index)
+        return df.reset_index(drop=True)
+
+    def summary(self) -> str:
+        return f"[sink] {os.path.basename(self.path)}: {self.count} satır | tekrar atlanan={self.duplicates}"
+
+
+def _sort_key(s: pd.Series) -> pd.Series:
+    """Tüm dolu değerleri sayı olan kolon sayı olarak sıralanır (page: 2 < 10); boşlar sona."""
+    filled = s != ""
+    nums = pd.to_numeric(s.where(filled), errors="coerce")
+    if nums[filled].notna().all():
+        return nums
+    return s.where(filled)
+
+
+def _fsync_path(path: str):
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
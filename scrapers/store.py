@@ -0,0 +1,207 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from .columnar import read_table
+from .consolidate import CANONICAL_COLUMNS, load_run_files, to_canonical
+from .normalize import normalize_emails, normalize_tr_phone
+
+# Run geçmişi için yerel SQLite deposu (stdlib sqlite3, WAL).
+# Her run klasöründeki firma çıktıları kanonik şemaya çevrilip tek transaction
+# içinde executemany ile eklenir. Aynı dosya (yol + mtime) ikinci kez
+# eklenmez; dosya değişmişse eski kaydı silinip yeniden eklenir.
+# "Bu danışman ilk ne zaman göründü" gibi sorular indeksli sorgularla
+# CSV okumadan cevaplanır.
+
+DB_PATH = os.environ.get(
+    "SCRAPER_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs", "runs.sqlite"),
+)
+
+# runs: her satır bir firma çıktı dosyası (run klasörü + dosya)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    company TEXT NOT NULL,
+    run_folder TEXT NOT NULL,
+    source_file TEXT NOT NULL,
+    file_mtime REAL NOT NULL,
+    row_count INTEGER NOT NULL,
+    first_scraped_at TEXT,
+    last_scraped_at TEXT,
+    ingested_at TEXT NOT NULL,
+    UNIQUE (run_folder, source_file)
+);
+CREATE TABLE IF NOT EXISTS agents (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    company TEXT NOT NULL,
+    name TEXT,
+    role TEXT,
+    email TEXT,
+    phone TEXT,
+    phone_type TEXT,
+    work_phone TEXT,
+    profile_url TEXT,
+    scraped_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_agents_company_url ON agents (company, profile_url);
+CREATE INDEX IF NOT EXISTS ix_agents_email ON agents (email);
+CREATE INDEX IF NOT EXISTS ix_agents_phone ON agents (phone);
+CREATE INDEX IF NOT EXISTS ix_agents_run ON agents (run_id);
+"""
+
+AGENT_COLUMNS = [c for c in CANONICAL_COLUMNS if c != "source_file"]
+_INSERT_AGENT = (
+    f"INSERT INTO agents (run_id, {', '.join(AGENT_COLUMNS)}) "
+    f"VALUES (?, {', '.join('?' for _ in AGENT_COLUMNS)})"
+)
+
+
+class RunStore:
+    """
+    Tek bağlantı, kilitle seri erişim (Streamlit yeniden çalıştırmaları farklı
+    thread'lerden gelir). WAL sayesinde yazma sırasında okumalar beklemez.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self.ingested_files = 0
+        self.ingested_rows = 0
+        self.skipped_files = 0
+
+    def ingest_run(self, run_dir: str) -> int:
+        """run_dir'deki firma çıktılarını ekler; eklenen satır sayısını döner."""
+        run_folder = os.path.basename(os.path.normpath(run_dir))
+        total = 0
+        for path, company in load_run_files(run_dir):
+            total += self.ingest_file(path, company, run_folder)
+        return total
+
+    def ingest_file(self, path: str, company: str, run_folder: str) -> int:
+        source_file = os.path.basename(path)
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_mtime FROM runs WHERE run_folder = ? AND source_file = ?",
+                (run_folder, source_file),
+            ).fetchone()
+        if row is not None and row[0] == mtime:
+            self.skipped_files += 1
+            return 0
+
+        df = to_canonical(read_table(path), company, source_file)
+        scraped = df[df["scraped_at"] != ""]["scraped_at"]
+        records = df[AGENT_COLUMNS].itertuples(index=False, name=None)
+
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                # Aynı dosyanın eski hali (ON DELETE CASCADE ile satırları) silinir
+                cur.execute(
+                    "DELETE FROM runs WHERE run_folder = ? AND source_file = ?",
+                    (run_folder, source_file),
+                )
+                cur.execute(
+                    "INSERT INTO runs (company, run_folder, source_file, file_mtime, row_count,"
+                    " first_scraped_at, last_scraped_at, ingested_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        company, run_folder, source_file, mtime, len(df),
+                        scraped.min() if len(scraped) else None,
+                        scraped.max() if len(scraped) else None,
+                        datetime.now().isoformat(timespec="seconds"),
+                    ),
+                )
+                run_id = cur.lastrowid
+                cur.executemany(_INSERT_AGENT, ((run_id, *r) for r in records))
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+        self.ingested_files += 1
+        self.ingested_rows += len(df)
+        print(f"[store] {company}: {len(df)} satır eklendi ({run_folder}/{source_file})")
+        return len(df)
+
+    def query(self, sql: str, params=()) -> pd.DataFrame:
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def runs(self) -> pd.DataFrame:
+        return self.query(
+            "SELECT run_folder, company, source_file, row_count, first_scraped_at,"
+            " last_scraped_at, ingested_at FROM runs ORDER BY run_folder DESC, company"
+        )
+
+    def companies(self):
+        """İçe aktarılmış firmalar (alfabetik)."""
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT DISTINCT company FROM runs ORDER BY company")]
+
+    def lookup(self, email: str = "", phone: str = "", profile_url: str = "", company: str = "") -> pd.DataFrame:
+        """
+        Verilen e-posta / telefon / profil linkine uyan kayıtlar, firma ve link
+        bazında ilk/son görüldüğü run ile (girdiler kayıtlarla aynı normalize edilir).
+        Profil linki firma ile birlikte aranır ((company, profile_url) indeksi).
+        """
+        conds, params = [], []
+        if email:
+            conds.append("a.email = ?")
+            params.append(normalize_emails(pd.Series([email])).iloc[0])
+        if phone:
+            conds.append("a.phone = ?")
+            params.append(normalize_tr_phone(phone))
+        if profile_url:
+            if not company:
+                raise ValueError("profil linki araması için firma gerekli")
+            conds.append("(a.company = ? AND a.profile_url = ?)")
+            params.extend([company, profile_url.strip()])
+        if not conds:
+            return pd.DataFrame()
+        return self.query(
+            "SELECT a.company, a.profile_url, MAX(a.name) AS name, MAX(a.email) AS email,"
+            " MAX(a.phone) AS phone, MIN(r.run_folder) AS first_seen, MAX(r.run_folder) AS last_seen,"
+            " COUNT(DISTINCT r.run_folder) AS runs"
+            " FROM agents a JOIN runs r ON r.id = a.run_id"
+            f" WHERE {' OR '.join(conds)}"
+            " GROUP BY a.company, a.profile_url ORDER BY first_seen",
+            params,
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def summary(self) -> str:
+        return (
+            f"[store] eklenen dosya={self.ingested_files} | satır={self.ingested_rows} "
+            f"| değişmediği için atlanan={self.skipped_files}"
+        )
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> RunStore:
+    """Süreç içinde tekil RunStore."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RunStore()
+        return _store
+
+
+def run(output_dir: str) -> str:
+    n = get_store().ingest_run(output_dir)
+    return f"geçmişe eklenen: {n} satır"
@@ -0,0 +1,82 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from scrapers import http_cache
+from scrapers.engine import SiteConfig, mailto, tel, text
+
+
+class MockSite:
+    """
+    Sayfalı danışman listesi sunan yerel HTTP sunucusu.
+    /danismanlar?pager_p=n: n <= pages ise per_page kart, sonrası boş.
+    /danismanlar/<n>-<i>: mailto + tel içeren profil; broken'daki anahtarlar 404 döner.
+    """
+
+    def __init__(self, pages: int = 5, per_page: int = 3):
+        self.pages = pages
+        self.per_page = per_page
+        self.broken = set()
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/danismanlar":
+                    page = int(parse_qs(url.query)["pager_p"][0])
+                    cards = "" if page > site.pages else "".join(
+                        f'<a href="/danismanlar/{page}-{i}"><h2>Ad {page}-{i}</h2></a>'
+                        for i in range(site.per_page)
+                    )
+                    body = f"<html><body>{cards}</body></html>"
+                else:
+                    key = url.path.rsplit("/", 1)[1]
+                    if key in site.broken:
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+                    body = f'<html><body><a href="mailto:{key}@x.com">m</a><a href="tel:0532{key}">t</a></body></html>'
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def total(self) -> int:
+        return self.pages * self.per_page
+
+    def config(self, name: str) -> SiteConfig:
+        return SiteConfig(
+            name=name,
+            base=self.base,
+            list_url=self.base + "/danismanlar?pager_p={page}",
+            cards='//a[starts-with(@href,"/danismanlar/") and .//h2]',
+            card_fields={"name": text(".//h2")},
+            profile_fields={"email": mailto(), "phone": tel()},
+            rate_limit={"rate": 200.0, "max_rate": 500.0},
+            concurrency=4,
+            max_pages=20,
+        )
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def mock_site(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    site = MockSite()
+    yield site
+    site.close()
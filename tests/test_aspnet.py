@@ -0,0 +1,95 @@
+from lxml import html
+
+from scrapers.aspnet import PostbackForm, page_number_actions, postback_action
+
+PAGE = """
+<html><body>
+<form method="post" action="./Danismanlar.aspx?x=1">
+  <input type="hidden" name="__VIEWSTATE" value="vs1">
+  <input type="hidden" name="__EVENTVALIDATION" value="ev1">
+  <input type="text" name="q" value="">
+  <input type="checkbox" name="on" value="1" checked>
+  <input type="checkbox" name="off" value="1">
+  <input type="submit" name="ara" value="Ara">
+  <select name="sehir"><option value="34">İstanbul</option><option value="6" selected>Ankara</option></select>
+  <textarea name="not">merhaba</textarea>
+  <div class="pager">
+    <a href="javascript:__doPostBack('ctl00$Pager','1')">1</a>
+    <a href="javascript:__doPostBack('ctl00$Pager','2')">2</a>
+    <a onclick="WebForm_DoPostBackWithOptions(new WebForm_PostBackOptions(&quot;ctl00$Pager3&quot;, &quot;&quot;, true))">3</a>
+    <a href="javascript:__doPostBack('ctl00$Pager','Next')">Sonraki</a>
+    <a href="/Danismanlar.aspx?p=4">4</a>
+  </div>
+  <button name="ileri" value="2">İleri</button>
+</form>
+</body></html>
+"""
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+    content = b"<html><body><p>sayfa</p></body></html>"
+    encoding = "utf-8"
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeClient:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, data=None, **kwargs):
+        self.posts.append((url, data, kwargs))
+        return FakeResponse()
+
+
+def _tree():
+    return html.document_fromstring(PAGE)
+
+
+def test_form_fields_are_replayed():
+    form = PostbackForm.from_tree(_tree(), "https://site.test/Danismanlar.aspx")
+    assert form.action == "https://site.test/Danismanlar.aspx?x=1"
+    assert form.has_viewstate
+    assert form.fields == {
+        "__VIEWSTATE": "vs1",
+        "__EVENTVALIDATION": "ev1",
+        "q": "",
+        "on": "1",
+        "sehir": "6",
+        "not": "merhaba",
+    }
+
+
+def test_postback_action_variants():
+    tree = _tree()
+    links = tree.xpath("//div[@class='pager']/a")
+    assert postback_action(links[1]) == ("ctl00$Pager", "2", {})
+    assert postback_action(links[2]) == ("ctl00$Pager3", "", {})
+    assert postback_action(links[4]) is None
+    assert postback_action(tree.xpath("//button")[0]) == ("", "", {"ileri": "2"})
+    assert postback_action(None) is None
+
+
+def test_page_number_actions_keeps_numbered_postbacks():
+    links = _tree().xpath("//div[@class='pager']/a")
+    actions = page_number_actions(links)
+    assert sorted(actions) == [1, 2, 3]
+    assert actions[2] == ("ctl00$Pager", "2", {})
+
+
+def test_post_sends_form_state_with_event():
+    form = PostbackForm.from_tree(_tree(), "https://site.test/Danismanlar.aspx")
+    client = FakeClient()
+    tree = form.post(client, ("ctl00$Pager", "2", {}), timeout=5)
+
+    url, data, kwargs = client.posts[0]
+    assert url == form.action
+    assert data["__VIEWSTATE"] == "vs1"
+    assert (data["__EVENTTARGET"], data["__EVENTARGUMENT"]) == ("ctl00$Pager", "2")
+    assert kwargs == {"timeout": 5}
+    assert tree.xpath("string(//p)") == "sayfa"
+    # Aynı form durumu bir sonraki postback için değişmeden kalır
+    assert "__EVENTTARGET" not in form.fields
@@ -0,0 +1,14 @@
+import pytest
+
+from scrapers.columnar import read_csv_tolerant, read_table
+
+
+def test_tolerant_read_skips_truncated_row(tmp_path):
+    # Yazılmakta olan .partial.csv: son satır kapanmamış tırnakla kesilmiş
+    path = tmp_path / "site_2026-01-01.partial.csv"
+    path.write_text('page,name,email\n1,a,a@x.com\n2,b,"b@x', encoding="utf-8")
+
+    with pytest.raises(Exception):
+        read_table(str(path), ["page", "name"])
+    df = read_csv_tolerant(str(path), ["page", "name"])
+    assert df.to_dict("records") == [{"page": "1", "name": "a"}]
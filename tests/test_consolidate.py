@@ -0,0 +1,68 @@
+import pandas as pd
+
+from scrapers.consolidate import CANONICAL_COLUMNS, cluster_ids, consolidate, dedupe, source_of, to_canonical
+
+
+def _frame(rows):
+    df = pd.DataFrame([{c: "" for c in CANONICAL_COLUMNS} | r for r in rows])
+    return df[CANONICAL_COLUMNS]
+
+
+def test_cluster_ids_chain_email_and_mobile():
+    # A~B e-posta, B~C cep telefonu: üçü aynı kişi; D'nin sabit hattı C ile aynı ama anahtar değil
+    df = _frame([
+        {"email": "a@x.com", "phone": "05320000001", "phone_type": "mobile"},
+        {"email": "a@x.com", "phone": "05320000002", "phone_type": "mobile"},
+        {"email": "c@x.com", "phone": "05320000002", "phone_type": "mobile"},
+        {"email": "", "phone": "02120000000", "phone_type": "landline"},
+        {"email": "", "phone": "02120000000", "phone_type": "landline"},
+    ])
+    assert cluster_ids(df).tolist() == [0, 0, 0, 3, 4]
+
+
+def test_dedupe_merges_companies_and_fills_fields():
+    df = _frame([
+        {"company": "ERA", "name": "Ali", "email": "ali@x.com", "source_file": "era_1.csv"},
+        {"company": "Remax", "name": "", "email": "ali@x.com", "phone": "05321112233",
+         "phone_type": "mobile", "source_file": "remax_1.csv"},
+        {"company": "ERA", "name": "Veli", "email": "veli@x.com", "source_file": "era_1.csv"},
+    ])
+    merged = dedupe(df)
+    assert len(merged) == 2
+    ali = merged[merged["email"] == "ali@x.com"].iloc[0]
+    assert ali["name"] == "Ali"
+    assert ali["phone"] == "05321112233"
+    assert ali["companies"] == "ERA; Remax"
+    assert ali["sources"] == 2
+
+
+def test_to_canonical_renames_and_normalizes():
+    raw = pd.DataFrame({"name_alt": ["Ayşe"], "personal_phone": [""], "work_phone": ["0212 555 11 22"],
+                        "email": ["AYSE@X.COM"]})
+    out = to_canonical(raw, "Dialog", "dialog_latest.csv")
+    assert list(out.columns) == CANONICAL_COLUMNS
+    row = out.iloc[0]
+    assert (row["name"], row["phone"], row["email"]) == ("Ayşe", "02125551122", "ayse@x.com")
+    assert (row["company"], row["source_file"]) == ("Dialog", "dialog_latest.csv")
+
+
+def test_source_of_skips_partial_and_consolidated():
+    assert source_of("era_2026-01-01.csv") == "ERA"
+    assert source_of("era_2026-01-01.partial.csv") is None
+    assert source_of("consolidated_2026-01-01.csv") is None
+    assert source_of("notes.csv") is None
+
+
+def test_consolidate_writes_run_file(tmp_path):
+    run_dir = tmp_path / "2026-01-01"
+    run_dir.mkdir()
+    pd.DataFrame({"name": ["Ali", "Veli"], "email": ["ali@x.com", "veli@x.com"], "phone": ["", ""]}).to_csv(
+        run_dir / "era_2026-01-01.csv", index=False)
+    pd.DataFrame({"name": ["Ali"], "email": ["Ali@X.com"], "phone": ["5321112233"]}).to_csv(
+        run_dir / "rookz_2026-01-01.csv", index=False)
+
+    out_path = consolidate(str(run_dir))
+    assert out_path.endswith("consolidated_2026-01-01.csv")
+    merged = pd.read_csv(out_path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    assert len(merged) == 2
+    assert merged.loc[merged["email"] == "ali@x.com", "companies"].item() == "ERA; Rozky"
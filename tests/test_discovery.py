@@ -0,0 +1,62 @@
+import pytest
+
+from scrapers.discovery import find_last_page, iter_pages
+
+
+def _site(last):
+    calls = []
+
+    def fetch(page):
+        calls.append(page)
+        return [f"{page}-{i}" for i in range(3)] if page <= last else []
+
+    return fetch, calls
+
+
+@pytest.mark.parametrize("last", [1, 2, 3, 7, 8, 9, 100, 326])
+def test_find_last_page(last):
+    fetch, calls = _site(last)
+    found, probed = find_last_page(fetch, max_page=327)
+    assert found == last
+    assert len(calls) == len(set(calls))
+    assert len(calls) <= 2 * last.bit_length() + 2
+    assert probed[last] == fetch(last)
+
+
+def test_find_last_page_empty_and_full():
+    fetch, _ = _site(0)
+    assert find_last_page(fetch, max_page=50)[0] == 0
+
+    fetch, calls = _site(1000)
+    assert find_last_page(fetch, max_page=50)[0] == 50
+    assert max(calls) == 50
+
+
+def test_find_last_page_from_start():
+    fetch, calls = _site(12)
+    found, _ = find_last_page(fetch, max_page=100, start=5)
+    assert found == 12
+    assert min(calls) == 5
+
+
+def test_iter_pages_reuses_probed_pages():
+    fetch, calls = _site(6)
+    last, probed = find_last_page(fetch, max_page=100)
+    probe_calls = len(calls)
+
+    results = {page: (result, exc) for page, result, exc in iter_pages(fetch, range(1, last + 1), known=probed)}
+    fetched = calls[probe_calls:]
+    assert sorted(results) == [1, 2, 3, 4, 5, 6]
+    assert all(exc is None and result[0] == f"{page}-0" for page, (result, exc) in results.items())
+    assert sorted(fetched) == sorted(set(range(1, 7)) - set(probed))
+
+
+def test_iter_pages_reports_errors():
+    def fetch(page):
+        if page == 2:
+            raise ValueError("bozuk")
+        return [page]
+
+    results = {page: (result, exc) for page, result, exc in iter_pages(fetch, [1, 2, 3], workers=2)}
+    assert results[1] == ([1], None)
+    assert isinstance(results[2][1], ValueError)
@@ -0,0 +1,97 @@
+import csv
+import os
+import uuid
+
+import pytest
+
+from scrapers import engine
+from scrapers.journal import STATE_DIR
+from scrapers.retry import DeadLetter
+
+
+class Killed(BaseException):
+    """Süreç ölümü yerine; engine'deki except Exception blokları yakalamaz."""
+
+
+def _read_output(out_dir, name):
+    files = [f for f in os.listdir(out_dir) if f.startswith(name) and f.endswith(".csv") and ".partial." not in f]
+    assert len(files) == 1, files
+    with open(os.path.join(out_dir, files[0]), encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _name():
+    # İstemci ve limiter süreç içinde ada göre paylaşılır; testler birbirini etkilemesin
+    return f"t{uuid.uuid4().hex[:8]}"
+
+
+def test_run_writes_all_profiles(mock_site, tmp_path):
+    name = _name()
+    out = str(tmp_path / "2026-01-01")
+    result = engine.run(mock_site.config(name), out)
+
+    rows = _read_output(out, name)
+    assert result.startswith(f"TOTAL: {mock_site.total} satır")
+    assert len(rows) == mock_site.total
+    assert len({r["profile_url"] for r in rows}) == mock_site.total
+    row = next(r for r in rows if r["profile_url"].endswith("/2-1"))
+    assert row["email"] == "2-1@x.com"
+    assert row["page"] == "2"
+
+
+def test_resume_requeues_dead_lettered_profiles(mock_site, tmp_path, monkeypatch):
+    # Sayfa günlüğe tamamlandı diye yazılır, profili dead-letter'dadır; süreç
+    # tekrar denemeden önce ölürse devam eden run o profili yine çekmelidir.
+    name = _name()
+    out = str(tmp_path / "2026-01-01")
+    site = mock_site.config(name)
+    mock_site.broken.add("3-1")
+
+    def killed(self):
+        raise Killed()
+
+    with monkeypatch.context() as m:
+        m.setattr(DeadLetter, "retry", killed)
+        with pytest.raises(Killed):
+            engine.run(site, out)
+
+    assert os.path.exists(os.path.join(out, STATE_DIR, f"{name}.jsonl"))
+    mock_site.broken.clear()
+    engine.run(site, out)
+
+    rows = _read_output(out, name)
+    assert len(rows) == mock_site.total
+    assert any(r["profile_url"].endswith("/3-1") and r["email"] == "3-1@x.com" for r in rows)
+
+
+def test_still_failing_profile_is_skipped(mock_site, tmp_path):
+    name = _name()
+    out = str(tmp_path / "2026-01-01")
+    mock_site.broken.add("1-0")
+    engine.run(mock_site.config(name), out)
+
+    rows = _read_output(out, name)
+    assert len(rows) == mock_site.total - 1
+    assert not any(r["profile_url"].endswith("/1-0") for r in rows)
+
+
+def test_parser_version_follows_profile_fields(mock_site):
+    site = mock_site.config(_name())
+    same = mock_site.config(site.name)
+    changed = mock_site.config(site.name)
+    changed.profile_fields = {"email": engine.any_of(engine.mailto(), engine.text("//footer")), "phone": engine.tel()}
+    assert site.parser_version() == same.parser_version()
+    assert site.parser_version() != changed.parser_version()
+    assert site.cache.version == site.parser_version()
+
+
+def test_summary_counters_are_per_run(mock_site, tmp_path):
+    # İstemci ve önbellek aynı süreçte ikinci run'da da kullanılır; özet yalnızca o run'ı saymalı
+    site = mock_site.config(_name())
+    engine.run(site, str(tmp_path / "2026-01-01"))
+    first = site.client().stats()["requests"]
+    engine.run(site, str(tmp_path / "2026-01-02"))
+
+    assert site.client().stats()["requests"] == first
+    assert site.cache.misses == 0
+    assert site.cache.not_modified + site.cache.same_body == mock_site.total
@@ -0,0 +1,77 @@
+import pytest
+
+from scrapers.http_cache import ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeClient:
+    """Sıradaki cevabı döner, gönderilen koşullu başlıkları kaydeder."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+def _parse(calls):
+    def parse(r):
+        calls.append(r.content)
+        return {"body": r.content.decode()}
+    return parse
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache("t", root=str(tmp_path), version="v1")
+
+
+def test_not_modified_returns_cached_result(cache):
+    calls = []
+    client = FakeClient(FakeResponse(200, b"a", {"ETag": '"e1"'}), FakeResponse(304))
+    assert cache.fetch(client, "u", _parse(calls)) == {"body": "a"}
+    assert cache.fetch(client, "u", _parse(calls)) == {"body": "a"}
+    assert client.sent[1]["If-None-Match"] == '"e1"'
+    assert calls == [b"a"]
+    assert (cache.misses, cache.not_modified) == (1, 1)
+
+
+def test_same_body_is_not_reparsed(cache):
+    calls = []
+    client = FakeClient(FakeResponse(200, b"a"), FakeResponse(200, b"a"), FakeResponse(200, b"b"))
+    for _ in range(3):
+        cache.fetch(client, "u", _parse(calls))
+    assert calls == [b"a", b"b"]
+    assert (cache.misses, cache.same_body) == (2, 1)
+
+
+def test_other_parser_version_is_a_miss(cache, tmp_path):
+    client = FakeClient(FakeResponse(200, b"a", {"ETag": '"e1"'}))
+    cache.fetch(client, "u", _parse([]))
+
+    # Çıkarım kuralları değişti: eski sonuç 304 / aynı gövdede bile dönmemeli
+    calls = []
+    newer = ResponseCache("t", root=str(tmp_path), version="v2")
+    client = FakeClient(FakeResponse(200, b"a", {"ETag": '"e1"'}))
+    assert newer.fetch(client, "u", _parse(calls)) == {"body": "a"}
+    assert "If-None-Match" not in client.sent[0]
+    assert calls == [b"a"]
+
+
+def test_error_status_is_raised_and_not_cached(cache):
+    client = FakeClient(FakeResponse(500, b"x"))
+    with pytest.raises(RuntimeError):
+        cache.fetch(client, "u", _parse([]))
+    assert cache.get("u") is None
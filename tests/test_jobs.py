@@ -0,0 +1,73 @@
+import threading
+import time
+
+from scrapers.cancel import checkpoint
+from scrapers.jobs import CANCELLED, DONE, FAILED, JobManager
+
+
+def _wait(job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while job.finished is None:
+        assert time.monotonic() < deadline, f"{job.name} bitmedi"
+        time.sleep(0.01)
+
+
+def test_cancel_stops_running_job():
+    started = threading.Event()
+
+    def work():
+        started.set()
+        while True:
+            checkpoint()
+            time.sleep(0.01)
+
+    jobs = JobManager(max_jobs=1)
+    job = jobs.submit("sonsuz", work)
+    assert started.wait(5)
+    jobs.cancel(job.id)
+    _wait(job)
+
+    assert job.status == CANCELLED
+    assert "iptal edildi" in job.tail()[-1]
+
+
+def test_queued_job_cancelled_before_start():
+    release = threading.Event()
+    ran = []
+    jobs = JobManager(max_jobs=1)
+    first = jobs.submit("ilk", release.wait, 5)
+    second = jobs.submit("ikinci", ran.append, 1)
+    jobs.cancel(second.id)
+    release.set()
+    _wait(first)
+    _wait(second)
+
+    assert first.status == DONE
+    assert second.status == CANCELLED
+    assert ran == []
+
+
+def test_job_output_goes_to_its_log_and_console(capsys):
+    jobs = JobManager(max_jobs=2)
+    job = jobs.submit("yazan", print, "merhaba")
+    _wait(job)
+    print("panel")
+
+    out = capsys.readouterr().out
+    assert "merhaba" in out and "panel" in out
+    lines = job.tail()
+    assert any(line.endswith("merhaba") for line in lines)
+    assert not any("panel" in line for line in lines)
+
+
+def test_failed_job_keeps_traceback():
+    def boom():
+        raise ValueError("bozuk")
+
+    jobs = JobManager()
+    job = jobs.submit("hatalı", boom)
+    _wait(job)
+
+    assert job.status == FAILED
+    assert "ValueError: bozuk" in job.error
+    assert jobs.summary().startswith("[jobs]")
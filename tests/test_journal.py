@@ -0,0 +1,58 @@
+import json
+
+from scrapers.journal import STATE_DIR, RunJournal
+
+
+def _rows(*keys):
+    return [{"profile_url": k, "name": k} for k in keys]
+
+
+def test_resume_restores_pages_and_rows(tmp_path):
+    j = RunJournal(str(tmp_path), "site")
+    j.mark_end(4)
+    j.page_done(1, _rows("a", "b"))
+    j.page_done(2, _rows("c"))
+    j.close()
+
+    resumed = RunJournal(str(tmp_path), "site")
+    assert resumed.pages == {1, 2}
+    assert resumed.end_page == 4
+    assert [r["profile_url"] for r in resumed.rows] == ["a", "b", "c"]
+    assert resumed.pending == []
+
+
+def test_failed_profiles_pending_until_rows_arrive(tmp_path):
+    j = RunJournal(str(tmp_path), "site")
+    j.page_done(1, _rows("a"), failed=_rows("x", "y"))
+    j.add_rows(_rows("x"))
+    j.close()
+
+    resumed = RunJournal(str(tmp_path), "site")
+    assert [r["profile_url"] for r in resumed.pending] == ["y"]
+    assert {r["profile_url"] for r in resumed.rows} == {"a", "x"}
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    j = RunJournal(str(tmp_path), "site")
+    j.page_done(1, _rows("a"))
+    j.close()
+    with open(j.path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"page": 2, "rows": _rows("b")})[:15])
+
+    resumed = RunJournal(str(tmp_path), "site")
+    assert resumed.pages == {1}
+    # Yeni kayıt kesilen satırın yerine temiz satıra eklenir
+    resumed.page_done(2, _rows("b"))
+    resumed.close()
+    assert RunJournal(str(tmp_path), "site").pages == {1, 2}
+
+
+def test_finished_journal_is_archived(tmp_path):
+    j = RunJournal(str(tmp_path), "site")
+    j.page_done(1, _rows("a"))
+    j.finish()
+
+    fresh = RunJournal(str(tmp_path), "site")
+    assert fresh.pages == set() and fresh.rows == []
+    archived = [p.name for p in (tmp_path / STATE_DIR).iterdir()]
+    assert any(name.startswith("site.jsonl.") and name.endswith(".done") for name in archived)
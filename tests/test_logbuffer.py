@@ -0,0 +1,41 @@
+import threading
+
+from scrapers.logbuffer import LogBuffer
+
+
+def test_ring_keeps_last_lines_and_counts_dropped():
+    buf = LogBuffer(maxlen=3)
+    for i in range(5):
+        buf.append(f"satır {i}")
+
+    assert buf.tail() == ["satır 2", "satır 3", "satır 4"]
+    assert buf.tail(2) == ["satır 3", "satır 4"]
+    assert buf.tail(0) == []
+    assert (len(buf), buf.total, buf.dropped) == (3, 5, 2)
+    assert buf.summary() == "[log] toplam=5 | tutulan=3 | düşen=2"
+
+
+def test_tail_is_a_copy():
+    buf = LogBuffer(maxlen=10)
+    buf.append("a")
+    lines = buf.tail()
+    buf.append("b")
+    assert lines == ["a"]
+
+
+def test_concurrent_appends_are_counted():
+    buf = LogBuffer(maxlen=100)
+
+    def writer(k):
+        for i in range(1000):
+            buf.append(f"{k}-{i}")
+
+    threads = [threading.Thread(target=writer, args=(k,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert buf.total == 4000
+    assert len(buf) == 100
+    assert buf.dropped == 3900
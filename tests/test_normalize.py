@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from scrapers.normalize import PHONE_TYPE, normalize_emails, normalize_frame, normalize_phones, normalize_tr_phone
+
+
+@pytest.mark.parametrize("raw, expected, kind", [
+    ("+90 532 111 22 33", "05321112233", "mobile"),
+    ("tel:05321112233", "05321112233", "mobile"),
+    ("5321112233", "05321112233", "mobile"),
+    ("(0216) 444-55-66", "02164445566", "landline"),
+    ("0212 555 11 22", "02125551122", "landline"),
+    ("yok", "yok", ""),
+    ("", "", ""),
+])
+def test_normalize_phones(raw, expected, kind):
+    phones, kinds = normalize_phones(pd.Series([raw]))
+    assert phones.iloc[0] == expected
+    assert kinds.iloc[0] == kind
+
+
+@pytest.mark.parametrize("raw", [
+    "+90 532 111 22 33", "5321112233", "0212 555 11 22", "(0216) 444-55-66",
+    # Geçersizler: ikisi de girdiyi (trim'li) bırakır, RunStore.lookup kayıtlarla eşleşir
+    " yok ", "0212 55 112", "123", "0090 532 111 22 33",
+])
+def test_scalar_matches_vectorized(raw):
+    assert normalize_tr_phone(raw) == normalize_phones(pd.Series([raw]))[0].iloc[0]
+
+
+def test_normalize_emails():
+    s = pd.Series(["Ali@Ornek.com.tr", "mailto:ayse@x.com?subject=Merhaba", " veli@y.com ", "gecersiz@", None])
+    assert normalize_emails(s).tolist() == ["ali@ornek.com.tr", "ayse@x.com", "veli@y.com", "gecersiz@", ""]
+
+
+def test_normalize_frame_adds_phone_type_and_keeps_input():
+    df = pd.DataFrame({"name": ["A"], "phone": ["5321112233"], "work_phone": ["212 555 11 22"], "email": ["A@X.COM"]})
+    out = normalize_frame(df)
+    assert out.loc[0, "phone"] == "05321112233"
+    assert out.loc[0, PHONE_TYPE] == "mobile"
+    assert out.loc[0, "work_phone"] == "02125551122"
+    assert out.loc[0, "email"] == "a@x.com"
+    assert df.loc[0, "phone"] == "5321112233"
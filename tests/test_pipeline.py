@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from scrapers.cancel import Cancelled, RunContext, bind, checkpoint, current
+from scrapers.pipeline import run_pipeline
+
+
+def test_results_and_errors_go_to_callbacks_on_caller_thread():
+    caller = threading.current_thread()
+    results, errors, threads = {}, {}, set()
+
+    def work(n):
+        if n % 5 == 0:
+            raise ValueError(n)
+        return n * n
+
+    def on_result(n, r):
+        threads.add(threading.current_thread())
+        results[n] = r
+
+    def on_error(n, exc):
+        threads.add(threading.current_thread())
+        errors[n] = exc
+
+    run_pipeline(range(1, 21), work, on_result, on_error, workers=4)
+    assert results == {n: n * n for n in range(1, 21) if n % 5}
+    assert sorted(errors) == [5, 10, 15, 20]
+    assert threads == {caller}
+
+
+def test_producer_waits_when_queue_is_full():
+    # Worker'lar bloklanınca üretici en fazla queue_size + workers iş üretebilir
+    release = threading.Event()
+    produced = []
+
+    def items():
+        for n in range(50):
+            produced.append(n)
+            yield n
+
+    t = threading.Thread(target=run_pipeline, args=(items(), lambda n: release.wait(5), lambda n, r: None),
+                         kwargs={"workers": 2, "queue_size": 3}, daemon=True)
+    t.start()
+    t.join(0.3)
+    assert t.is_alive()
+    assert len(produced) <= 3 + 2 + 1
+    release.set()
+    t.join(5)
+    assert len(produced) == 50
+
+
+def test_cancel_stops_producer_and_discards_queued_items():
+    ctx = RunContext("test")
+    prev = bind(ctx)
+    done = []
+
+    def items():
+        for n in range(1000):
+            if n == 20:
+                ctx.cancel()
+            yield n
+
+    try:
+        with pytest.raises(Cancelled):
+            run_pipeline(items(), lambda n: n, lambda n, r: done.append(n), workers=2, queue_size=4)
+    finally:
+        bind(prev)
+    assert len(done) <= 20
+
+
+def test_cancel_raised_in_worker_reaches_caller():
+    ctx = RunContext("test")
+    prev = bind(ctx)
+    seen_ctx = []
+    errors = []
+
+    def work(n):
+        seen_ctx.append(current())
+        if n == 3:
+            ctx.cancel()
+        checkpoint()
+        return n
+
+    try:
+        with pytest.raises(Cancelled):
+            run_pipeline(range(100), work, lambda n, r: None, lambda n, e: errors.append(e), workers=2)
+    finally:
+        bind(prev)
+    assert errors == []
+    assert set(seen_ctx) == {ctx}
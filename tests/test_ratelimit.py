@@ -0,0 +1,97 @@
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from scrapers import ratelimit
+from scrapers.ratelimit import AdaptiveRateLimiter, get_limiter, parse_retry_after
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, 0.0),
+    ("", 0.0),
+    ("7", 7.0),
+    (" 2.5 ", 2.5),
+    ("-3", 0.0),
+    ("yarın", 0.0),
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(when, usegmt=True)) <= 30
+    past = datetime.now(timezone.utc) - timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+
+def test_aimd_increases_additively_and_caps():
+    limiter = AdaptiveRateLimiter(rate=2.0, max_rate=3.0, increase=1.0)
+    limiter.feedback(200, 0.1)
+    assert limiter.rate == pytest.approx(2.5)
+    for _ in range(10):
+        limiter.feedback(200, 0.1)
+    assert limiter.rate == 3.0
+
+
+def test_aimd_decreases_once_per_second(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    limiter = AdaptiveRateLimiter(rate=8.0, min_rate=1.0, decrease=0.5)
+
+    # Aynı dalgadaki hatalar hızı bir kez düşürür
+    limiter.feedback(503)
+    limiter.feedback(None)
+    limiter.feedback(200, latency=limiter.slow_latency + 1)
+    assert limiter.rate == 4.0
+    assert limiter.throttled == 1
+
+    for _ in range(5):
+        now[0] += 1.0
+        limiter.feedback(429)
+    assert limiter.rate == 1.0  # min_rate
+    assert limiter.throttled == 6
+    limiter.reset_stats()
+    assert limiter.throttled == 0
+
+
+def test_retry_after_pauses_host(monkeypatch):
+    now = [100.0]
+    slept = []
+
+    def sleep(s):
+        slept.append(s)
+        now[0] += s
+
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(ratelimit.time, "sleep", sleep)
+    limiter = AdaptiveRateLimiter(rate=10.0)
+    limiter.feedback(429, retry_after="3")
+    limiter.acquire()
+
+    assert slept[0] == pytest.approx(3.0)
+    assert now[0] >= 103.0
+
+
+def test_acquire_spaces_requests_by_rate(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(ratelimit.time, "sleep", lambda s: now.__setitem__(0, now[0] + s))
+    limiter = AdaptiveRateLimiter(rate=2.0)
+    for _ in range(5):
+        limiter.acquire()
+    # İlk istek hazır token'ı kullanır, sonrakiler 1/rate aralıkla
+    assert now[0] - 100.0 == pytest.approx(2.0)
+
+
+def test_configure_keeps_adapted_rate_for_same_settings():
+    host = f"{time.monotonic_ns()}.test"
+    limiter = get_limiter(host, rate=2.0, max_concurrency=3)
+    limiter.feedback(200, 0.1)
+    adapted = limiter.rate
+    assert get_limiter(host, rate=2.0, max_concurrency=3) is limiter
+    assert limiter.rate == adapted
+    get_limiter(host, rate=1.0, max_concurrency=5)
+    assert (limiter.rate, limiter.max_concurrency) == (1.0, 5)
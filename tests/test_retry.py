@@ -0,0 +1,116 @@
+import time
+import uuid
+
+import pytest
+import requests
+
+from scrapers import retry
+from scrapers.cancel import Cancelled, RunContext, bind
+from scrapers.retry import CircuitBreaker, CircuitOpenError, DeadLetter, get_breaker, is_transient, wait_for_breakers
+
+
+def _host():
+    # Devre kesiciler süreç içinde host'a göre paylaşılır; testler birbirini etkilemesin
+    return f"{uuid.uuid4().hex[:8]}.test"
+
+
+def _http_error(status):
+    r = requests.Response()
+    r.status_code = status
+    return requests.HTTPError(response=r)
+
+
+def test_is_transient():
+    assert is_transient(requests.ConnectionError())
+    assert is_transient(requests.Timeout())
+    assert is_transient(_http_error(503))
+    assert not is_transient(_http_error(404))
+    assert not is_transient(CircuitOpenError("devre açık"))
+    assert not is_transient(ValueError())
+
+
+def test_breaker_opens_after_threshold_and_half_opens_once():
+    b = CircuitBreaker(threshold=3, cooldown=0.05)
+    for _ in range(2):
+        b.record_failure()
+    assert b.allow()
+    b.record_failure()
+    assert not b.allow()
+    assert b.trips == 1
+
+    time.sleep(0.06)
+    assert b.allow()  # half-open: tek deneme isteği
+    assert not b.allow()
+    b.record_success()
+    assert b.allow()
+    assert b.remaining() == 0.0
+
+
+def test_failed_trial_reopens_breaker():
+    b = CircuitBreaker(threshold=1, cooldown=0.05)
+    b.record_failure()
+    time.sleep(0.06)
+    assert b.allow()
+    b.record_failure()
+    assert not b.allow()
+    assert b.trips == 2
+    assert b.remaining() > 0
+
+
+def test_wait_for_breakers_only_waits_for_given_hosts():
+    other = get_breaker(_host())
+    other.threshold, other.cooldown = 1, 30
+    other.record_failure()
+    mine = _host()
+    get_breaker(mine)
+
+    t0 = time.monotonic()
+    try:
+        wait_for_breakers({mine})
+    finally:
+        other.record_success()
+    assert time.monotonic() - t0 < 1
+
+
+def test_wait_for_breakers_stops_on_cancel(monkeypatch):
+    host = _host()
+    b = get_breaker(host)
+    b.threshold, b.cooldown = 1, 30
+    b.record_failure()
+    ctx = RunContext("test")
+    prev = bind(ctx)
+    sleeps = []
+
+    def sleep(s):
+        sleeps.append(s)
+        ctx.cancel()
+
+    monkeypatch.setattr(retry.time, "sleep", sleep)
+    try:
+        with pytest.raises(Cancelled):
+            wait_for_breakers({host}, step=0.5)
+    finally:
+        bind(prev)
+        b.record_success()
+    assert sleeps == [0.5]
+
+
+def test_dead_letter_retries_each_key_once():
+    calls = []
+
+    def work(key, fail):
+        calls.append(key)
+        if fail:
+            raise ValueError(key)
+        return key
+
+    dead = DeadLetter("test", hosts=[])
+    dead.add("a", work, "a", False)
+    dead.add("b", work, "b", True)
+    dead.add("a", work, "a", False)
+    assert len(dead) == 3
+
+    assert dead.retry() == ["a"]
+    assert calls == ["a", "b"]
+    assert [k for k, _ in dead.failed] == ["b", "a"]
+    assert dead.summary() == "başarısız kalan: 2"
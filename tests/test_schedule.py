@@ -0,0 +1,76 @@
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from scrapers.schedule import LOCK_GRACE_SECS, CronSpec, LockHeld, RunLock
+
+
+@pytest.mark.parametrize("spec, now, expected", [
+    ("0 3 * * *", datetime(2026, 1, 1, 2, 59, 30), datetime(2026, 1, 1, 3, 0)),
+    ("0 3 * * *", datetime(2026, 1, 1, 3, 0), datetime(2026, 1, 2, 3, 0)),
+    ("*/15 * * * *", datetime(2026, 1, 1, 10, 7), datetime(2026, 1, 1, 10, 15)),
+    ("30 9 * * 1-5", datetime(2026, 1, 2, 10, 0), datetime(2026, 1, 5, 9, 30)),  # Cuma -> Pazartesi
+    ("0 0 * * 7", datetime(2026, 1, 1, 0, 0), datetime(2026, 1, 4, 0, 0)),  # 7 = Pazar
+    ("0 0 1 * *", datetime(2026, 1, 31, 12, 0), datetime(2026, 2, 1, 0, 0)),
+    ("0 0 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29, 0, 0)),
+    ("@hourly", datetime(2026, 1, 1, 23, 59), datetime(2026, 1, 2, 0, 0)),
+])
+def test_next_after(spec, now, expected):
+    assert CronSpec(spec).next_after(now) == expected
+
+
+def test_day_or_weekday_when_both_restricted():
+    # Gün ve haftanın günü ikisi de verilmişse biri tutması yeter (ayın 15'i ya da Pazartesi)
+    spec = CronSpec("0 0 15 * 1")
+    assert spec.next_after(datetime(2026, 1, 6)) == datetime(2026, 1, 12)
+    assert spec.next_after(datetime(2026, 1, 13)) == datetime(2026, 1, 15)
+
+
+@pytest.mark.parametrize("spec", ["0 3 * *", "60 * * * *", "0 0 0 * *", "*/0 * * * *", "a * * * *"])
+def test_invalid_spec(spec):
+    with pytest.raises(ValueError):
+        CronSpec(spec)
+
+
+def test_run_lock_blocks_second_holder(tmp_path):
+    path = str(tmp_path / ".run.lock")
+    with RunLock(path):
+        with pytest.raises(LockHeld):
+            RunLock(path).acquire()
+    assert not os.path.exists(path)
+
+
+def test_stale_lock_is_taken_over(tmp_path):
+    path = tmp_path / ".run.lock"
+    path.write_text('{"pid": 999999999, "started_at": "2026-01-01T00:00:00"}', encoding="utf-8")
+    with RunLock(str(path)) as lock:
+        assert lock.owner()["pid"] == os.getpid()
+
+
+def test_empty_lock_file_is_held_within_grace(tmp_path):
+    # Başka bir süreç kilidi oluşturmuş ama pid'i henüz yazmamış gibi
+    path = tmp_path / ".run.lock"
+    path.write_text("", encoding="utf-8")
+    with pytest.raises(LockHeld):
+        RunLock(str(path)).acquire()
+    assert path.exists() and path.read_text(encoding="utf-8") == ""
+
+
+def test_old_unreadable_lock_is_taken_over(tmp_path):
+    path = tmp_path / ".run.lock"
+    path.write_text("{", encoding="utf-8")
+    old = time.time() - LOCK_GRACE_SECS - 5
+    os.utime(path, (old, old))
+    with RunLock(str(path)) as lock:
+        assert lock.owner()["pid"] == os.getpid()
+    assert not path.exists()
+
+
+def test_acquire_leaves_no_temp_files(tmp_path):
+    path = tmp_path / ".run.lock"
+    with RunLock(str(path)):
+        with pytest.raises(LockHeld):
+            RunLock(str(path)).acquire()
+        assert sorted(p.name for p in tmp_path.iterdir()) == [".run.lock"]
@@ -0,0 +1,60 @@
+import pandas as pd
+
+from scrapers.normalize import normalize_frame
+from scrapers.sink import RowSink
+
+COLUMNS = ["page", "name", "phone", "profile_url"]
+
+
+def _read(path):
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def test_rows_are_deduped_and_normalized_per_batch(tmp_path):
+    path = str(tmp_path / "x.csv")
+    sink = RowSink(path, columns=COLUMNS, formats=("csv",), flush_every=2, postprocess=normalize_frame)
+    assert sink.write({"page": 1, "name": "A", "phone": "5321112233", "profile_url": "u1"})
+    assert not sink.write({"page": 1, "name": "A", "phone": "", "profile_url": "u1"})
+    sink.write({"name": "B", "phone": "0212 555 11 22", "profile_url": "u2"})
+    sink.write({"page": 2, "name": "C", "phone": "", "profile_url": "u3"})
+    # İlk parti yazıldı, son satır tamponda; .partial dosyası okunabilir durumda
+    assert len(_read(str(tmp_path / "x.partial.csv"))) == 2
+    sink.close()
+
+    df = _read(path)
+    assert list(df.columns) == COLUMNS + ["phone_type"]
+    assert df["phone"].tolist() == ["05321112233", "02125551122", ""]
+    assert df["phone_type"].tolist() == ["mobile", "landline", ""]
+    assert df["page"].tolist() == ["1", "", "2"]
+    assert (len(sink), sink.duplicates) == (3, 1)
+
+
+def test_empty_sink_leaves_header(tmp_path):
+    path = str(tmp_path / "x.csv")
+    RowSink(path, columns=COLUMNS, formats=("csv",), postprocess=normalize_frame).close()
+    assert list(_read(path).columns) == COLUMNS + ["phone_type"]
+
+
+def test_abort_keeps_partial_file(tmp_path):
+    sink = RowSink(str(tmp_path / "x.csv"), columns=COLUMNS, formats=("csv",))
+    sink.write({"page": 1, "name": "A", "profile_url": "u1"})
+    sink.abort()
+    assert not (tmp_path / "x.csv").exists()
+    assert _read(str(tmp_path / "x.partial.csv"))["name"].tolist() == ["A"]
+
+
+def test_sort_by_orders_final_outputs(tmp_path):
+    # Sayfalar tamamlanma sırasıyla gelir; nihai dosya sayfa (sayı olarak) ve ada göre dizilir
+    path = str(tmp_path / "x.csv")
+    sink = RowSink(path, columns=COLUMNS, formats=("csv", "jsonl"), flush_every=2, sort_by=("page", "name"))
+    sink.write({"page": 10, "name": "B", "profile_url": "u1"})
+    sink.write({"page": 2, "name": "Z", "profile_url": "u2"})
+    sink.write({"page": "", "name": "C", "profile_url": "u3"})
+    sink.write({"page": 10, "name": "A", "profile_url": "u4"})
+    sink.write({"page": 2, "name": "Y", "profile_url": "u5"})
+    sink.close()
+
+    df = _read(path)
+    assert df["profile_url"].tolist() == ["u5", "u2", "u4", "u1", "u3"]
+    jsonl = pd.read_json(str(tmp_path / "x.jsonl"), lines=True, dtype=False)
+    assert jsonl["profile_url"].tolist() == df["profile_url"].tolist()
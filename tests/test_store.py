@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+import pytest
+
+from scrapers.store import RunStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = RunStore(str(tmp_path / "runs.sqlite"))
+    yield s
+    s.close()
+
+
+def _write_run(root, folder, rows):
+    run_dir = root / folder
+    run_dir.mkdir()
+    pd.DataFrame(rows).to_csv(run_dir / f"era_{folder}.csv", index=False)
+    return str(run_dir)
+
+
+def test_lookup_first_and_last_seen(store, tmp_path):
+    ali = {"name": "Ali", "email": "ali@x.com", "phone": "5321112233", "profile_url": "https://era/ali"}
+    veli = {"name": "Veli", "email": "veli@x.com", "phone": "", "profile_url": "https://era/veli"}
+    store.ingest_run(_write_run(tmp_path, "2026-01-01", [ali]))
+    store.ingest_run(_write_run(tmp_path, "2026-01-02", [ali, veli]))
+
+    # Girdi kayıtlarla aynı normalize edilir
+    found = store.lookup(email="ALI@x.com")
+    assert len(found) == 1
+    row = found.iloc[0]
+    assert (row["first_seen"], row["last_seen"], row["runs"]) == ("2026-01-01", "2026-01-02", 2)
+
+    assert store.lookup(phone="0532 111 22 33")["name"].tolist() == ["Ali"]
+    assert store.lookup(profile_url="https://era/veli", company="ERA")["name"].tolist() == ["Veli"]
+    assert store.lookup(profile_url="https://era/veli", company="Remax").empty
+    assert store.companies() == ["ERA"]
+
+
+def test_profile_lookup_requires_company(store):
+    with pytest.raises(ValueError):
+        store.lookup(profile_url="https://era/ali")
+
+
+def test_unchanged_file_is_skipped_and_changed_file_replaced(store, tmp_path):
+    run_dir = _write_run(tmp_path, "2026-01-01", [{"name": "Ali", "email": "ali@x.com", "profile_url": "u1"}])
+    assert store.ingest_run(run_dir) == 1
+    assert store.ingest_run(run_dir) == 0
+    assert store.skipped_files == 1
+
+    path = os.path.join(run_dir, "era_2026-01-01.csv")
+    pd.DataFrame([{"name": "Ali", "email": "ali@x.com", "profile_url": "u1"},
+                  {"name": "Can", "email": "can@x.com", "profile_url": "u2"}]).to_csv(path, index=False)
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert store.ingest_run(run_dir) == 2
+    assert store.runs()["row_count"].tolist() == [2]
+    assert store.query("SELECT COUNT(*) AS n FROM agents")["n"].item() == 2